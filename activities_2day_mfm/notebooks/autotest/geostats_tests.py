@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+
+def _geostruct():
+    import pyemu
+    v1 = pyemu.geostats.ExpVario(contribution=1.0, a=200., anisotropy=2.0,
+                                 bearing=30.)
+    v2 = pyemu.geostats.SphVario(contribution=0.5, a=500.)
+    return pyemu.geostats.GeoStruct(nugget=0.25, variograms=[v1, v2])
+
+
+def geostruct_covariance_matrix_test():
+    import numpy as np
+    import pyemu
+    x = np.array([0., 100., 250., 400., 420.])
+    y = np.array([0., 50., -30., 200., 210.])
+    names = ["p{0}".format(i) for i in range(x.shape[0])]
+    # values from the original (looping) implementation
+    baseline = np.array(
+        [[1.75, 0.796839611585, 0.247960048265, 0.053524707265, 0.041670847292],
+         [0.796839611585, 1.75, 0.437641353954, 0.170802891, 0.139286113564],
+         [0.247960048265, 0.437641353954, 1.75, 0.381350946052, 0.335242552836],
+         [0.053524707265, 0.170802891, 0.381350946052, 1.75, 1.323284995628],
+         [0.041670847292, 0.139286113564, 0.335242552836, 1.323284995628, 1.75]])
+    gs = _geostruct()
+    cov = gs.covariance_matrix(x, y, names=names)
+    assert np.allclose(cov.x, baseline, rtol=0.0, atol=1.0e-10)
+
+    # contributions are added to a cov that is passed in
+    cov = pyemu.Cov(x=np.zeros((x.shape[0], x.shape[0])), names=names)
+    gs.covariance_matrix(x, y, cov=cov)
+    assert np.allclose(cov.x, baseline, rtol=0.0, atol=1.0e-10)
+
+
+def ok_calc_factors_vectorized_test():
+    import numpy as np
+    import pandas as pd
+    import pyemu
+    rng = np.random.RandomState(0)
+    npts = 40
+    pp_df = pd.DataFrame({"name": ["pp{0}".format(i) for i in range(npts)],
+                          "x": rng.uniform(0., 1000., npts),
+                          "y": rng.uniform(0., 800., npts),
+                          "parval1": 1.0})
+    x, y = np.meshgrid(np.arange(-50., 1050., 37.), np.arange(-50., 850., 41.))
+    x, y = x.ravel(), y.ravel()
+    # nan points are skipped
+    x[:3] = np.NaN
+    ok = pyemu.geostats.OrdinaryKrige(_geostruct(), pp_df)
+    kwargs = {"minpts_interp": 3, "maxpts_interp": 12, "search_radius": 300.}
+    df_loop = ok.calc_factors(x, y, **kwargs)
+    df_vec = ok.calc_factors_vectorized(x, y, chunk_size=50, **kwargs)
+
+    # the search radius leaves some points with too few neighbors
+    skip_loop = np.array([len(n) == 0 for n in df_loop.inames])
+    skip_vec = np.array([len(n) == 0 for n in df_vec.inames])
+    assert skip_loop.sum() > 3 and not skip_loop.all()
+    assert np.array_equal(skip_loop, skip_vec)
+    ev_loop = df_loop.err_var.values.astype(float)
+    ev_vec = df_vec.err_var.values.astype(float)
+    assert np.array_equal(np.isnan(ev_loop), np.isnan(ev_vec))
+    assert np.allclose(ev_loop[~np.isnan(ev_loop)], ev_vec[~np.isnan(ev_vec)],
+                       rtol=1.0e-8, atol=1.0e-10)
+    nn = set()
+    for n_loop, f_loop, n_vec, f_vec in zip(df_loop.inames, df_loop.ifacts,
+                                            df_vec.inames, df_vec.ifacts):
+        assert list(n_loop) == list(n_vec)
+        assert np.allclose(f_loop, f_vec, rtol=1.0e-8, atol=1.0e-10)
+        nn.add(len(n_loop))
+    # several neighbor counts means several stacked solves
+    assert len(nn) > 2
+
+
+if __name__ == "__main__":
+    geostruct_covariance_matrix_test()
+    ok_calc_factors_vectorized_test()
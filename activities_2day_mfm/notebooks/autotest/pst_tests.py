@@ -0,0 +1,35 @@
+import os
+import tempfile
+
+
+def ins_primary_marker_after_advance_test():
+    import numpy as np
+    import pyemu
+    ws = tempfile.mkdtemp()
+    out_file = os.path.join(ws, "model.out")
+    with open(out_file, 'w') as f:
+        f.write("header\n")
+        f.write("junk line\n")
+        f.write("more junk\n")
+        f.write("still junk\n")
+        f.write("X= 1.5 2.5\n")
+        f.write("Y= 3.5\n")
+    ins_file = out_file + ".ins"
+    with open(ins_file, 'w') as f:
+        f.write("pif ~\n")
+        f.write("l1 ~X=~ !o1! !o2!\n")
+        f.write("l1 ~Y=~ !o3!\n")
+    obs_names, obs_vals = pyemu.pst_utils.process_ins_file(ins_file, out_file)
+    assert obs_names == ["o1", "o2", "o3"]
+    assert np.allclose(obs_vals, [1.5, 2.5, 3.5])
+
+    # the marker is also found on the line the advance moves to
+    with open(ins_file, 'w') as f:
+        f.write("pif ~\n")
+        f.write("l5 ~X=~ !o1!\n")
+    obs_names, obs_vals = pyemu.pst_utils.process_ins_file(ins_file, out_file)
+    assert np.allclose(obs_vals, [1.5])
+
+
+if __name__ == "__main__":
+    ins_primary_marker_after_advance_test()
@@ -0,0 +1,90 @@
+"""benchmark Modflow.load() of a large MODFLOW-NWT model with internal
+fixed-width arrays, and Util2d.load_txt() of a single large array in
+FREE and fixed-width formats.
+
+usage: python util2d_load_benchmark.py [nlay nrow ncol [package_dir]]
+
+the model defaults to 10 layers of 400 x 500 cells.  package_dir is the
+directory holding the flopy package to time, so that an older checkout
+can be timed with the same script.  It defaults to the parent of this
+directory.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime
+import numpy as np
+
+if len(sys.argv) > 4:
+    sys.path.insert(0, os.path.abspath(sys.argv[4]))
+else:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    ".."))
+import flopy
+
+
+def write_model(model_ws, nlay, nrow, ncol):
+    rng = np.random.RandomState(0)
+    shape = (nlay, nrow, ncol)
+    m = flopy.modflow.Modflow("big", version="mfnwt", model_ws=model_ws)
+    botm = -10. * np.arange(1, nlay + 1)[:, None, None] * np.ones(shape)
+    flopy.modflow.ModflowDis(m, nlay, nrow, ncol, nper=1, botm=botm,
+                             top=rng.uniform(size=(nrow, ncol)) + 1.)
+    flopy.modflow.ModflowBas(m, ibound=rng.randint(0, 2, shape),
+                             strt=rng.uniform(size=shape))
+    flopy.modflow.ModflowUpw(m, hk=10. * rng.uniform(size=shape),
+                             vka=rng.uniform(size=shape),
+                             ss=1.0e-5 * rng.uniform(size=shape),
+                             sy=0.2 * rng.uniform(size=shape))
+    flopy.modflow.ModflowNwt(m)
+    m.write_input()
+    return m
+
+
+def write_array(filename, nrow, ncol, fmt):
+    a = np.random.RandomState(1).uniform(size=(nrow, ncol))
+    if fmt == "free":
+        np.savetxt(filename, a, fmt="%15.6E")
+    else:
+        # 10E15.6: ten values per line, each row starting on a new line
+        with open(filename, 'w') as f:
+            for row in a:
+                for i0 in range(0, ncol, 10):
+                    f.write("".join("{0:15.6E}".format(v)
+                                    for v in row[i0:i0 + 10]) + "\n")
+
+
+def _timed(label, func):
+    start = datetime.now()
+    result = func()
+    td = (datetime.now() - start).total_seconds()
+    print("{0:40s} {1:10.3f} sec".format(label, td))
+    return result
+
+
+def run(nlay=10, nrow=400, ncol=500):
+    model_ws = tempfile.mkdtemp()
+    write_model(model_ws, nlay, nrow, ncol)
+    mb = sum(os.path.getsize(os.path.join(model_ws, f))
+             for f in os.listdir(model_ws)) / 1.0e6
+    print("\nflopy from {0}".format(os.path.dirname(flopy.__file__)))
+    print("{0} layers, {1} x {2}, {3:.0f} MB of model files\n".format(
+        nlay, nrow, ncol, mb))
+    _timed("Modflow.load()",
+           lambda: flopy.modflow.Modflow.load("big.nam", version="mfnwt",
+                                              model_ws=model_ws, check=False,
+                                              forgive=False))
+
+    # a single 2,000,000 value array
+    anrow, ancol = 2000, 1000
+    for fmt, fmtin in [("free", "(FREE)"), ("fixed", "(10E15.6)")]:
+        filename = os.path.join(model_ws, "array_{0}.dat".format(fmt))
+        write_array(filename, anrow, ancol, fmt)
+        with open(filename, 'r') as f:
+            _timed("Util2d.load_txt() {0} {1}".format(anrow * ancol, fmtin),
+                   lambda: flopy.utils.Util2d.load_txt((anrow, ancol), f,
+                                                       np.float32, fmtin))
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:4]])
@@ -0,0 +1,96 @@
+"""benchmark ZoneBudget on a synthetic 100-layer, 1000-step budget file.
+
+usage: python zonbud_benchmark.py [nstp [package_dir]]
+
+nstp is the number of time steps of the budget file to process (all
+1000 by default).  package_dir is the directory holding the flopy
+package to time, so that an older checkout can be timed with the same
+script.  It defaults to the parent of this directory.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime
+import numpy as np
+
+if len(sys.argv) > 2:
+    sys.path.insert(0, os.path.abspath(sys.argv[2]))
+else:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    ".."))
+import flopy
+
+nlay, nrow, ncol, nper = 100, 10, 10, 1000
+_header1 = np.dtype([("kstp", np.int32), ("kper", np.int32), ("text", "S16"),
+                     ("ncol", np.int32), ("nrow", np.int32),
+                     ("nlay", np.int32)])
+
+
+def _write_header(f, kper, text, imeth, totim):
+    h = np.array([(1, kper, text.rjust(16).encode(), ncol, nrow, -nlay)],
+                 dtype=_header1)
+    f.write(h.tobytes())
+    f.write(np.array([imeth], np.int32).tobytes())
+    f.write(np.array([1., totim, totim], np.float32).tobytes())
+
+
+def write_budget_file(filename):
+    """ write a compact budget file with face flows, storage, a list
+    (imeth 2) term and layer-indicator (imeth 3) and single layer
+    (imeth 4) recharge and et terms for each stress period
+    """
+    rng = np.random.RandomState(0)
+    ncell = nlay * nrow * ncol
+    list_dtype = np.dtype([("node", np.int32), ("q", np.float32)])
+    chd_nodes = np.arange(1, ncell + 1, ncol)
+    with open(filename, 'wb') as f:
+        for kper in range(1, nper + 1):
+            totim = float(kper)
+            _write_header(f, kper, "CONSTANT HEAD", 2, totim)
+            chd = np.zeros(chd_nodes.shape[0], list_dtype)
+            chd["node"] = chd_nodes
+            chd["q"] = rng.standard_normal(chd.shape[0])
+            f.write(np.array([chd.shape[0]], np.int32).tobytes())
+            f.write(chd.tobytes())
+            for text in ["FLOW RIGHT FACE", "FLOW FRONT FACE",
+                         "FLOW LOWER FACE", "STORAGE"]:
+                _write_header(f, kper, text, 1, totim)
+                f.write(rng.standard_normal(ncell).astype(np.float32).tobytes())
+            wel = np.zeros(ncell // 20, list_dtype)
+            wel["node"] = rng.randint(1, ncell + 1, wel.shape[0])
+            wel["q"] = -rng.uniform(size=wel.shape[0])
+            _write_header(f, kper, "WELLS", 2, totim)
+            f.write(np.array([wel.shape[0]], np.int32).tobytes())
+            f.write(wel.tobytes())
+            _write_header(f, kper, "RECHARGE", 3, totim)
+            f.write(rng.randint(1, nlay + 1, nrow * ncol).astype(np.int32).tobytes())
+            f.write(rng.uniform(size=nrow * ncol).astype(np.float32).tobytes())
+            _write_header(f, kper, "ET", 4, totim)
+            f.write((-rng.uniform(size=nrow * ncol)).astype(np.float32).tobytes())
+
+
+def run(nstp=nper):
+    filename = os.path.join(tempfile.mkdtemp(), "zonbud_benchmark.cbc")
+    write_budget_file(filename)
+    zon = np.ones((nlay, nrow, ncol), dtype=int)
+    zon[:, :, 5:] = 2
+    zon[nlay // 2:] += 2
+    zon[:, :, 8:] = 5
+    print("\nflopy from {0}".format(os.path.dirname(flopy.__file__)))
+    print("{0} layers, {1} x {2}, {3} of {4} time steps, 5 zones\n".format(
+        nlay, nrow, ncol, nstp, nper))
+
+    start = datetime.now()
+    cbc = flopy.utils.CellBudgetFile(filename)
+    td = (datetime.now() - start).total_seconds()
+    print("{0:30s} {1:10.3f} sec".format("CellBudgetFile()", td))
+    kstpkper = cbc.get_kstpkper()[:nstp]
+    start = datetime.now()
+    zb = flopy.utils.ZoneBudget(cbc, zon, kstpkper=kstpkper)
+    td = (datetime.now() - start).total_seconds()
+    print("{0:30s} {1:10.3f} sec".format("ZoneBudget()", td))
+    print("{0:30s} {1:10.4f} sec".format("per time step", td / nstp))
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:2]])
@@ -2,6 +2,7 @@ import numpy as np
 import copy, os
 import warnings
 from ..utils import geometry
+from ..utils.gridindex import UniformGridIndex
 
 
 class CachedData(object):
@@ -13,6 +14,10 @@ class CachedData(object):
     def data(self):
         return copy.deepcopy(self._data)
 
+    @property
+    def data_nocopy(self):
+        return self._data
+
     def update_data(self, data):
         self._data = data
         self.out_of_date = False
@@ -99,6 +104,20 @@ class Grid(object):
         information. otherwise the cell centers are based on a 0,0 location
         for the upper left corner of the model grid. returns a list of three
         ndarrays for the x, y, and z coordinates
+    cell_vertices : ndarray
+        returns the x and y coordinates of the vertices of all model cells
+        in a single array, with a shape of (nrow, ncol, nvert, 2) for
+        structured grids and (ncpl, nvert, 2) for vertex grids
+    cell_centroids : ndarray
+        returns the x and y coordinates of the centroids of all model cells
+    cell_areas : ndarray
+        returns the areas of all model cells
+    cell_bboxes : ndarray
+        returns the xmin, ymin, xmax and ymax of all model cells
+    spatial_index : StructuredGridIndex or UniformGridIndex
+        returns a spatial index of the model cells for locating points
+        in cells, finding the nearest cells and the cells within a distance
+        of points.  The index is built when it is first used.
 
     Methods
     ----------
@@ -114,7 +133,8 @@ class Grid(object):
         (single layer) in C-style (row-major) order
         (same as np.ravel())
     intersect(x, y, local)
-        returns the row and column of the grid that the x, y point is in
+        returns the row and column of the grid that the x, y point is in,
+        or the cell number for vertex and unstructured grids
 
     See Also
     --------
@@ -288,6 +308,30 @@ class Grid(object):
             'must define xyzgrid in child '
             'class to use this base class')
 
+    @property
+    def cell_vertices(self):
+        return self._cached_array('cellvertices',
+                                  self._build_cell_vertices).copy()
+
+    @property
+    def cell_centroids(self):
+        return self._cached_array('cellcentroids',
+                                  self._build_cell_centroids).copy()
+
+    @property
+    def cell_areas(self):
+        return self._cached_array('cellareas',
+                                  self._build_cell_areas).copy()
+
+    @property
+    def cell_bboxes(self):
+        return self._cached_array('cellbboxes',
+                                  self._build_cell_bboxes).copy()
+
+    @property
+    def spatial_index(self):
+        return self._cached_array('spatialindex', self._build_spatial_index)
+
     #@property
     #def indices(self):
     #    raise NotImplementedError(
@@ -423,6 +467,7 @@ class Grid(object):
                     start_datetime = item.split(':')[1].strip()
                 except:
                     pass
+        self._require_cache_updates()
         return True
 
     def read_usgs_model_reference_file(self, reffile='usgs.model.reference'):
@@ -460,6 +505,7 @@ class Grid(object):
                                     self._proj4 = data
                                 elif info[0] == 'start_date':
                                     start_datetime = data
+            self._require_cache_updates()
             return True
         else:
             return False
@@ -487,6 +533,45 @@ class Grid(object):
         self._proj4 = sr.proj4_str
         self._require_cache_updates()
 
+    def _cached_array(self, cache_index, build):
+        """Get an array from the cache without copying it, building it
+        first if it is not in the cache or is out of date."""
+        if cache_index not in self._cache_dict or \
+                self._cache_dict[cache_index].out_of_date:
+            self._cache_dict[cache_index] = CachedData(build())
+        return self._cache_dict[cache_index].data_nocopy
+
+    def _build_cell_vertices(self):
+        raise NotImplementedError(
+            'must define _build_cell_vertices in child '
+            'class to use this base class')
+
+    def _shoelace(self):
+        """Get the signed area and the area-weighted x and y sums of each
+        cell polygon from the cell vertices."""
+        xy = self._cached_array('cellvertices', self._build_cell_vertices)
+        x, y = xy[..., 0], xy[..., 1]
+        x1, y1 = np.roll(x, -1, axis=-1), np.roll(y, -1, axis=-1)
+        cross = x * y1 - x1 * y
+        area = 0.5 * cross.sum(axis=-1)
+        return area, ((x + x1) * cross).sum(axis=-1), \
+               ((y + y1) * cross).sum(axis=-1)
+
+    def _build_cell_areas(self):
+        return np.abs(self._shoelace()[0])
+
+    def _build_cell_centroids(self):
+        area, xsum, ysum = self._shoelace()
+        return np.stack((xsum / (6. * area), ysum / (6. * area)), axis=-1)
+
+    def _build_cell_bboxes(self):
+        xy = self._cached_array('cellvertices', self._build_cell_vertices)
+        return np.concatenate((xy.min(axis=-2), xy.max(axis=-2)), axis=-1)
+
+    def _build_spatial_index(self):
+        xy = self._cached_array('cellvertices', self._build_cell_vertices)
+        return UniformGridIndex(xy, self.xcellcenters, self.ycellcenters)
+
     def _require_cache_updates(self):
         for cache_data in self._cache_dict.values():
             cache_data.out_of_date = True
@@ -1,5 +1,6 @@
 import numpy as np
 from .grid import Grid, CachedData
+from ..utils.gridindex import StructuredGridIndex
 
 
 class StructuredGrid(Grid):
@@ -32,7 +33,10 @@ class StructuredGrid(Grid):
     Methods
     ----------
     get_cell_vertices(i, j)
-        returns vertices for a single cell at row, column i, j.
+        returns vertices for a single cell at row, column i, j, or for
+        arrays of rows and columns.
+    intersect(x, y, local)
+        returns the row and column of a point or of arrays of points
     """
     def __init__(self, delc, delr, top=None, botm=None, idomain=None,
                  lenuni=None, epsg=None, proj4=None, prj=None, xoff=0.0,
@@ -203,27 +207,32 @@ class StructuredGrid(Grid):
     ### Methods ###
     ###############
     def intersect(self, x, y, local=True):
-        x, y = super(StructuredGrid, self).intersect(x, y, local)
+        """
+        Get the row and column of a point or of arrays of points
 
-        if x < 0 or y < 0:
-            raise Exception('x, y point given is outside of the model area')
-        # find row
-        y_bound = 0
-        row = None
-        for index, row_width in enumerate(self.__delc):
-            y_bound += row_width
-            if y <= y_bound:
-                row = index
-        # find column
-        x_bound = 0
-        col = None
-        for index, col_width in enumerate(self.__delr):
-            x_bound += col_width
-            if x <= x_bound:
-                col = index
-        # determine success
-        if col is None or row is None:
+        Parameters
+        ----------
+        x : float or array of floats
+            x coordinates of the points
+        y : float or array of floats
+            y coordinates of the points
+        local : bool
+            If True, x and y are in model coordinates, otherwise they are
+            in the spatial reference coordinate system (default is True)
+
+        Returns
+        -------
+        row, col : int or arrays of ints
+            zero-based row and column of the points.  A point on the edge
+            of two cells is in the cell with the lower row or column.
+
+        """
+        x, y = super(StructuredGrid, self).intersect(x, y, local)
+        row, col = self.spatial_index.locate_rowcol(x, y, local=True)
+        if np.any(row < 0):
             raise Exception('x, y point given is outside of the model area')
+        if np.isscalar(x):
+            return int(row), int(col)
         return row, col
 
     def _cell_vert_list(self, i, j):
@@ -245,14 +254,31 @@ class StructuredGrid(Grid):
         """
         Method to get a set of cell vertices for a single cell
             used in the Shapefile export utilities
-        :param i: (int) cell row number
-        :param j: (int) cell column number
-        :return: list of x,y cell vertices
+        :param i: (int) cell row number, or array of row numbers
+        :param j: (int) cell column number, or array of column numbers
+        :return: list of x,y cell vertices, or an array of shape
+            (len(i), 4, 2) if i and j are arrays
         """
-        return [(self.xvertices[i, j], self.yvertices[i, j]),
-                (self.xvertices[i, j+1], self.yvertices[i, j+1]),
-                (self.xvertices[i+1, j+1], self.yvertices[i+1, j+1]),
-                (self.xvertices[i+1, j], self.yvertices[i+1, j]),]
+        verts = self._cached_array('cellvertices',
+                                   self._build_cell_vertices)[i, j]
+        if verts.ndim == 2:
+            return [tuple(v) for v in verts.tolist()]
+        return verts
+
+    def _build_cell_vertices(self):
+        """Build the (nrow, ncol, 4, 2) array of the vertices of all cells
+        in the order of get_cell_vertices."""
+        xgrid, ygrid = self.xvertices, self.yvertices
+        verts = np.empty((self.__nrow, self.__ncol, 4, 2))
+        for n, (di, dj) in enumerate([(0, 0), (0, 1), (1, 1), (1, 0)]):
+            verts[:, :, n, 0] = xgrid[di:di + self.__nrow, dj:dj + self.__ncol]
+            verts[:, :, n, 1] = ygrid[di:di + self.__nrow, dj:dj + self.__ncol]
+        return verts
+
+    def _build_spatial_index(self):
+        xedge, yedge = self.xyedges
+        return StructuredGridIndex(xedge, yedge, self._xoff, self._yoff,
+                                   self._angrot)
 
     def plot(self, **kwargs):
         """
@@ -937,22 +937,28 @@ class NetCdf(object):
             self.initialize_file()
 
         # check that the requested dimension exists and
-        # build up the chuck sizes
-        #chunks = []
-        #for dimension in dimensions:
-        #    assert self.nc.dimensions.get(dimension) is not None, \
-        #        "netcdf.create_variable() dimension not found:" + dimension
-        #    chunk = self.chunks[dimension]
-        #    assert chunk is not None, \
-        #        "netcdf.create_variable() chunk size of {0} is None in self.chunks". \
-        #            format(dimension)
-        #    chunks.append(chunk)
+        # build up the chunk sizes: gridded variables that vary in time are
+        # chunked by time and layer, so that they can be written and read
+        # one time and layer at a time.  Other variables, like the time
+        # coordinate itself, keep the default chunking
+        chunks = None
+        if "time" in dimensions and \
+                len(set(dimensions) - {"time", "layer"}) > 0:
+            chunks = []
+            for dimension in dimensions:
+                assert self.nc.dimensions.get(dimension) is not None, \
+                    "netcdf.create_variable() dimension not found:" + dimension
+                if dimension in ("time", "layer"):
+                    chunks.append(1)
+                else:
+                    chunks.append(len(self.nc.dimensions[dimension]))
+            chunks = tuple(chunks)
 
         self.var_attr_dict[name] = attributes
 
         var = self.nc.createVariable(name, precision_str, dimensions,
-                                     fill_value=self.fillvalue, zlib=True)  # ,
-        # chunksizes=tuple(chunks))
+                                     fill_value=self.fillvalue, zlib=True,
+                                     chunksizes=chunks)
         for k, v in attributes.items():
             try:
                 var.setncattr(k, v)
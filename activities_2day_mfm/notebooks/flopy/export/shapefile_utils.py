@@ -1,12 +1,13 @@
 """
 Module for exporting and importing flopy model attributes
 """
-import copy
 import shutil
 import json
 import numpy as np
 import os
+import struct
 import sys
+import time
 import warnings
 from ..datbase import DataType, DataInterface, DataListInterface
 from ..utils import Util2d, Util3d, Transient2d, MfList, SpatialReference
@@ -95,76 +96,39 @@ def write_grid_shapefile(filename, mg, array_dict, nan_val=None):#-1.0e9):
 
     """
 
-    shapefile = import_shapefile()
-    sfv = shapefile_version(shapefile)
-    if sfv < 2:
-        wr = shapefile.Writer(shapeType=shapefile.POLYGON)
-    else:
-        wr = shapefile.Writer(filename, shapeType=shapefile.POLYGON)
     if isinstance(mg, SpatialReference):
         warnings.warn("SpatialReference has been deprecated. Use StructuredGrid"
                       " instead.",
                       category=DeprecationWarning)
-        wr.field("row", "N", 10, 0)
-        wr.field("column", "N", 10, 0)
-    elif mg.grid_type == 'structured':
-        wr.field("row", "N", 10, 0)
-        wr.field("column", "N", 10, 0)
-    elif mg.grid_type == 'vertex':
-        wr.field("node", "N", 10, 0)
+        grid_type = 'structured'
+    else:
+        grid_type = mg.grid_type
+    if grid_type == 'structured':
+        shape = (mg.nrow, mg.ncol)
+        i, j = np.indices(shape)
+        fields = [("row", "N", 10, 0), ("column", "N", 10, 0)]
+        arrays = [i.ravel() + 1, j.ravel() + 1]
+    elif grid_type == 'vertex':
+        shape = (mg.ncpl,)
+        fields = [("node", "N", 10, 0)]
+        arrays = [np.arange(1, mg.ncpl + 1)]
     else:
         raise Exception('Grid type {} not supported.'.format(mg.grid_type))
 
-    arrays = []
     names = list(array_dict.keys())
     names.sort()
-    # for name,array in array_dict.items():
     for name in names:
         array = array_dict[name]
         if array.ndim == 3:
             assert array.shape[0] == 1
             array = array[0, :, :]
-        assert array.shape == (mg.nrow, mg.ncol)
-        if array.dtype in [np.float, np.float32, np.float64]:
-            array[np.where(np.isnan(array))] = nan_val
-        else:
-            j=2
-        #if array.dtype in [np.int, np.int32, np.int64]:
-        #    wr.field(name, "N", 18, 0)
-        #else:
-        #    wr.field(name, "F", 18, 12)
-        wr.field(name, *get_pyshp_field_info(array.dtype.name))
-        arrays.append(array)
-
-    if isinstance(mg, SpatialReference) or mg.grid_type == 'structured':
-        for i in range(mg.nrow):
-            for j in range(mg.ncol):
-                try:
-                    pts = mg.get_cell_vertices(i, j)
-                except AttributeError:
-                    # support old style SR object
-                    pts = mg.get_vertices(i, j)
-
-                wr.poly([pts])
-                rec = [i + 1, j + 1]
-                for array in arrays:
-                    rec.append(array[i, j])
-                wr.record(*rec)
-    elif mg.grid_type == 'vertex':
-        for i in range(mg.ncpl):
-            pts = mg.get_cell_vertices(i)
-
-            wr.poly([pts])
-            rec = [i + 1]
-            for array in arrays:
-                rec.append(array[i])
-            wr.record(*rec)
+        assert array.shape == shape
+        if array.dtype.kind == 'f' and nan_val is not None:
+            array = np.where(np.isnan(array), nan_val, array)
+        fields.append((name,) + get_pyshp_field_info(array.dtype.name))
+        arrays.append(array.ravel())
 
-    # close or write the file
-    if sfv < 2:
-        wr.save(filename)
-    else:
-        wr.close()
+    write_polygon_shapefile(filename, get_grid_polygons(mg), fields, arrays)
     print('wrote {}'.format(filename))
     return
 
@@ -172,84 +136,232 @@ def write_grid_shapefile(filename, mg, array_dict, nan_val=None):#-1.0e9):
 def write_grid_shapefile2(filename, mg, array_dict, nan_val=np.nan,#-1.0e9,
                           epsg=None, prj=None):
 
-    shapefile = import_shapefile()
-    sfv = shapefile_version(shapefile)
-    if sfv < 2:
-        w = shapefile.Writer(shapeType=shapefile.POLYGON)
-    else:
-        w = shapefile.Writer(filename, shapeType=shapefile.POLYGON)
-    w.autoBalance = 1
-
     if isinstance(mg, SpatialReference):
-        verts = copy.deepcopy(mg.vertices)
         warnings.warn("SpatialReference has been deprecated. Use StructuredGrid"
                       " instead.",
                       category=DeprecationWarning)
-    elif mg.grid_type == 'structured':
-        verts = [mg.get_cell_vertices(i, j)
-                 for i in range(mg.nrow)
-                 for j in range(mg.ncol)]
-    elif mg.grid_type == 'vertex':
-        verts = [mg.get_cell_vertices(cellid)
-                 for cellid in range(mg.ncpl)]
+        grid_type = 'structured'
     else:
-        raise Exception('Grid type {} not supported.'.format(mg.grid_type))
-
+        grid_type = mg.grid_type
 
     # set up the attribute fields
-    if isinstance(mg, SpatialReference) or mg.grid_type == 'structured':
+    if grid_type == 'structured':
+        i, j = np.indices((mg.nrow, mg.ncol))
         names = ['node', 'row', 'column'] + list(array_dict.keys())
-        names = enforce_10ch_limit(names)
-        dtypes = [('node', np.dtype('int')),
-                  ('row', np.dtype('int')),
-                  ('column', np.dtype('int'))] + \
-                 [(enforce_10ch_limit([name])[0], arr.dtype)
-                  for name, arr in array_dict.items()]
-    elif mg.grid_type == 'vertex':
+        arrays = [np.arange(1, mg.nrow * mg.ncol + 1),
+                  i.ravel() + 1, j.ravel() + 1]
+    elif grid_type == 'vertex':
         names = ['node'] + list(array_dict.keys())
-        names = enforce_10ch_limit(names)
-        dtypes = [('node', np.dtype('int'))] + \
-                 [(enforce_10ch_limit([name])[0], arr.dtype)
-                  for name, arr in array_dict.items()]
+        arrays = [np.arange(1, mg.ncpl + 1)]
+    else:
+        raise Exception('Grid type {} not supported.'.format(mg.grid_type))
+    names = enforce_10ch_limit(names)
 
-    fieldinfo = {name: get_pyshp_field_info(dtype.name) for name, dtype in dtypes}
-    for n in names:
-        w.field(n, *fieldinfo[n])
+    for arr in array_dict.values():
+        arr = np.asarray(arr).ravel()
+        if arr.dtype.kind == 'f':
+            arr = np.where(np.isnan(arr), nan_val, arr)
+        arrays.append(arr)
+    fields = [(name,) + get_pyshp_field_info(arr.dtype.name)
+              for name, arr in zip(names, arrays)]
 
-    if isinstance(mg, SpatialReference) or mg.grid_type == 'structured':
-        # set-up array of attributes of shape ncells x nattributes
-        node = list(range(1, mg.ncol * mg.nrow + 1))
-        col = list(range(1, mg.ncol + 1)) * mg.nrow
-        row = sorted(list(range(1, mg.nrow + 1)) * mg.ncol)
-        at = np.vstack(
-            [node, row, col] +
-            [arr.ravel() for arr in array_dict.values()]).transpose()
-        if at.dtype in [np.float, np.float32, np.float64]:
-            at[np.isnan(at)] = nan_val
-    elif mg.grid_type == 'vertex':
-        # set-up array of attributes of shape ncells x nattributes
-        node = list(range(1, mg.ncpl + 1))
-        at = np.vstack(
-            [node] +
-            [arr.ravel() for arr in array_dict.values()]).transpose()
-    if at.dtype in [np.float, np.float32, np.float64]:
-        at[np.isnan(at)] = nan_val
-
-    for i, r in enumerate(at):
-        w.poly([verts[i]])
-        w.record(*r)
-
-    # close
-    if sfv < 2:
-        w.save(filename)
-    else:
-        w.close()
+    write_polygon_shapefile(filename, get_grid_polygons(mg), fields, arrays)
     print('wrote {}'.format(filename))
     # write the projection file
     write_prj(filename, mg, epsg, prj)
     return
 
 
+def get_grid_polygons(mg):
+    """
+    Get the polygons of all of the cells of a model grid.
+
+    Parameters
+    ----------
+    mg : model grid instance
+        structured or vertex model grid, or SpatialReference
+
+    Returns
+    -------
+    polygons : list of (cells, xy) tuples
+        cells is an array of the node numbers (zero-based) of cells
+        that have the same number of polygon points and xy is an array
+        of shape (len(cells), npoints, 2) of the closed polygons of the
+        cells.
+
+    """
+    if isinstance(mg, SpatialReference) or mg.grid_type == 'structured':
+        # corners in the order of SpatialReference.get_vertices or
+        # StructuredGrid.get_cell_vertices, with the first corner repeated
+        # to close the polygon
+        verts = mg.cell_vertices
+        verts = np.concatenate((verts, verts[:, :, :1]), axis=2)
+        return [(np.arange(mg.nrow * mg.ncol), verts.reshape(-1, 5, 2))]
+    elif mg.grid_type == 'vertex':
+        xvertices, yvertices = mg.xvertices, mg.yvertices
+        npoints = np.array([len(x) for x in xvertices])
+        polygons = []
+        for n in np.unique(npoints):
+            cells = np.where(npoints == n)[0]
+            xy = np.empty((len(cells), n + 1, 2))
+            xy[:, :n, 0] = [xvertices[c] for c in cells]
+            xy[:, :n, 1] = [yvertices[c] for c in cells]
+            xy[:, n] = xy[:, 0]
+            # keep polygons that are already closed as they are
+            closed = np.all(xy[:, n - 1] == xy[:, 0], axis=1)
+            if closed.any():
+                polygons.append((cells[closed], xy[closed, :n]))
+            if not closed.all():
+                polygons.append((cells[~closed], xy[~closed]))
+        return polygons
+    else:
+        raise Exception('Grid type {} not supported.'.format(mg.grid_type))
+
+
+def write_polygon_shapefile(filename, polygons, fields, arrays):
+    """
+    Write the .shp, .shx and .dbf files of a polygon shapefile from
+    arrays of the polygons and attributes of all of the records at once,
+    instead of record by record with pyshp.
+
+    Parameters
+    ----------
+    filename : string
+        name of the shapefile to write
+    polygons : list of (records, xy) tuples
+        records is an array of the (zero-based) record numbers of polygons
+        that have the same number of points and xy is an array of shape
+        (len(records), npoints, 2) of the polygons, as returned by
+        get_grid_polygons().
+    fields : list of tuples
+        (name, type, size, decimal) of each attribute field, as in
+        get_pyshp_field_info()
+    arrays : list of 1D arrays
+        values of each attribute field for all of the records
+
+    Returns
+    -------
+    None
+
+    """
+    shpname = os.path.splitext(filename)[0]
+    pth = os.path.split(shpname)[0]
+    if pth and not os.path.exists(pth):
+        os.makedirs(pth)
+    nrec = sum([len(records) for records, xy in polygons])
+
+    # build the shape records of each number of points, and the size in
+    # bytes of each record
+    shapes = []
+    size = np.zeros(nrec, dtype=np.int64)
+    bbox = None
+    for records, xy in polygons:
+        npoints = xy.shape[1]
+        dtype = np.dtype([('number', '>i4'), ('length', '>i4'),
+                          ('type', '<i4'), ('bbox', '<f8', 4),
+                          ('nparts', '<i4'), ('npoints', '<i4'),
+                          ('parts', '<i4'), ('points', '<f8', (npoints, 2))])
+        shp = np.zeros(len(records), dtype=dtype)
+        shp['number'] = records + 1
+        shp['length'] = (dtype.itemsize - 8) // 2
+        shp['type'] = 5
+        xmin, ymin = xy.min(axis=1).T
+        xmax, ymax = xy.max(axis=1).T
+        shp['bbox'] = np.column_stack((xmin, ymin, xmax, ymax))
+        shp['nparts'] = 1
+        shp['npoints'] = npoints
+        shp['points'] = xy
+        shapes.append((records, shp))
+        size[records] = dtype.itemsize
+        b = [xmin.min(), ymin.min(), xmax.max(), ymax.max()]
+        if bbox is None:
+            bbox = b
+        else:
+            bbox = [min(bbox[0], b[0]), min(bbox[1], b[1]),
+                    max(bbox[2], b[2]), max(bbox[3], b[3])]
+    if bbox is None:
+        bbox = [0., 0., 0., 0.]
+    offset = 100 + np.concatenate(([0], np.cumsum(size)[:-1]))
+
+    # shp file
+    f = open(shpname + '.shp', 'wb')
+    f.write(_shapefile_header(100 + size.sum(), bbox))
+    if len(shapes) == 1 and \
+            np.array_equal(shapes[0][0], np.arange(nrec)):
+        f.write(shapes[0][1].tobytes())
+    else:
+        # put the records of the different sizes in order
+        shp = [None] * nrec
+        for records, s in shapes:
+            b = s.tobytes()
+            n = s.dtype.itemsize
+            for i, irec in enumerate(records):
+                shp[irec] = b[i * n:(i + 1) * n]
+        f.write(b''.join(shp))
+    f.close()
+
+    # shx file
+    shx = np.zeros(nrec, dtype=[('offset', '>i4'), ('length', '>i4')])
+    shx['offset'] = offset // 2
+    shx['length'] = (size - 8) // 2
+    f = open(shpname + '.shx', 'wb')
+    f.write(_shapefile_header(100 + 8 * nrec, bbox))
+    f.write(shx.tobytes())
+    f.close()
+
+    # dbf file
+    dtype = [('deleted', 'S1')] + \
+            [('f{}'.format(i), 'S{}'.format(field[2]))
+             for i, field in enumerate(fields)]
+    dbf = np.zeros(nrec, dtype=dtype)
+    dbf['deleted'] = b' '
+    for i, (field, a) in enumerate(zip(fields, arrays)):
+        dbf['f{}'.format(i)] = _dbf_field_values(np.asarray(a), *field[1:])
+    year, month, day = time.localtime()[:3]
+    f = open(shpname + '.dbf', 'wb')
+    f.write(struct.pack('<BBBBLHH20x', 3, year - 1900, month, day, nrec,
+                        len(fields) * 32 + 33, dbf.dtype.itemsize))
+    for field in fields:
+        name, fieldtype, fieldsize = field[:3]
+        decimal = field[3] if len(field) > 3 else 0
+        name = name.encode('utf-8').replace(b' ', b'_')
+        f.write(struct.pack('<11sc4xBB14x', name, fieldtype.encode('ascii'),
+                            int(fieldsize), decimal))
+    f.write(b'\r')
+    f.write(dbf.tobytes())
+    f.close()
+    return
+
+
+def _shapefile_header(length, bbox):
+    """Get the 100 byte header of a polygon .shp or .shx file of length
+    bytes."""
+    return struct.pack('>6i', 9994, 0, 0, 0, 0, 0) + \
+           struct.pack('>i', length // 2) + \
+           struct.pack('<2i', 1000, 5) + \
+           struct.pack('<4d', *bbox) + struct.pack('<4d', 0, 0, 0, 0)
+
+
+def _dbf_field_values(a, fieldtype, size, decimal=0):
+    """Format an array of values as the fixed width bytes of a dbf field,
+    in the same way as pyshp."""
+    size = int(size)
+    fieldtype = fieldtype.upper()
+    if fieldtype in ('N', 'F'):
+        if not decimal:
+            s = np.char.mod('%d', a.astype(np.int64))
+        else:
+            s = np.char.mod('%.{}f'.format(decimal), a.astype(np.float64))
+        return np.char.rjust(s, size).astype('S{}'.format(size))
+    elif fieldtype == 'L':
+        s = np.full(a.shape, b' ', dtype='S1')
+        s[a == 1] = b'T'
+        s[a == 0] = b'F'
+        return s
+    s = np.char.encode(a.astype(str), 'utf-8').astype('S{}'.format(size))
+    return np.char.ljust(s, size)
+
+
 def model_attributes_to_shapefile(filename, ml, package_names=None,
                                   array_dict=None,
                                   **kwargs):
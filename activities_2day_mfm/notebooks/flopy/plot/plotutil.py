@@ -2327,7 +2327,8 @@ def findrowcolumn(pt, xedge, yedge):
     Parameters
     ----------
     pt : list or tuple
-        A list or tuple containing a x- and y- coordinate
+        A list or tuple containing a x- and y- coordinate, or arrays of
+        x- and y- coordinates
     xedge : numpy.ndarray
         x-coordinate of the edge of each MODFLOW column. xedge is dimensioned
         to NCOL + 1. If xedge is not a numpy.ndarray it is converted to a
@@ -2339,8 +2340,10 @@ def findrowcolumn(pt, xedge, yedge):
 
     Returns
     -------
-    irow, jcol : int
+    irow, jcol : int or numpy.ndarray
         Row and column location containing x- and y- point passed to function.
+        Points left of or above the grid are in column or row -1, and points
+        right of or below the grid are in column or row -100.
 
     Examples
     --------
@@ -2354,20 +2357,18 @@ def findrowcolumn(pt, xedge, yedge):
         xedge = np.array(xedge)
     if not isinstance(yedge, np.ndarray):
         yedge = np.array(yedge)
-
-    # find column
-    jcol = -100
-    for jdx, xmf in enumerate(xedge):
-        if xmf > pt[0]:
-            jcol = jdx - 1
-            break
-
-    # find row
-    irow = -100
-    for jdx, ymf in enumerate(yedge):
-        if ymf < pt[1]:
-            irow = jdx - 1
-            break
+    x = np.asarray(pt[0], dtype=float)
+    y = np.asarray(pt[1], dtype=float)
+
+    # find column from the first edge right of x
+    jcol = np.searchsorted(xedge, x, side='right')
+    jcol = np.where(jcol < len(xedge), jcol - 1, -100)
+
+    # find row from the first edge below y
+    irow = len(yedge) - np.searchsorted(yedge[::-1], y, side='left')
+    irow = np.where((irow < len(yedge)) & ~np.isnan(y), irow - 1, -100)
+    if irow.ndim == 0 and jcol.ndim == 0:
+        return int(irow), int(jcol)
     return irow, jcol
 
 
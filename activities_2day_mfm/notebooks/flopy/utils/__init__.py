@@ -37,7 +37,8 @@ from .mflistfile import MfListBudget, MfusgListBudget, SwtListBudget, \
 from .check import check, get_neighbors
 from .utils_def import FlopyBinaryData, totim_to_datetime
 from .flopy_io import read_fixed_var, write_fixed_var
-from .zonbud import ZoneBudget, read_zbarray, write_zbarray
+from .zonbud import ZoneBudget, read_zbarray, write_zbarray, \
+    get_zone_budgets
 from .mfgrdfile import MfGrdFile
 from .postprocessing import get_transmissivities
 from .sfroutputfile import SfrFile
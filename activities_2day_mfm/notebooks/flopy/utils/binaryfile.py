@@ -9,6 +9,7 @@ important classes that can be accessed by the user.
 
 """
 from __future__ import print_function
+import os
 import numpy as np
 import warnings
 from collections import OrderedDict
@@ -162,6 +163,19 @@ def binaryread(file, vartype, shape=(1,), charlen=16):
     return result
 
 
+def _first_indices(a):
+    """
+    Get the indices of the first occurrence of each unique value of a, or
+    each unique row if a is two dimensional, in the order they occur.
+
+    """
+    if a.ndim > 1:
+        idx = np.unique(a, axis=0, return_index=True)[1]
+    else:
+        idx = np.unique(a, return_index=True)[1]
+    return np.sort(idx)
+
+
 def join_struct_arrays(arrays):
     """
     Simple function that can join two numpy structured arrays.
@@ -249,7 +263,11 @@ class BinaryLayerFile(LayerFile):
 
     """
 
-    def __init__(self, filename, precision, verbose, kwargs):
+    def __init__(self, filename, precision, verbose, kwargs, memmap=False):
+        self.memmap = memmap
+        self._mmap = None
+        self._records = None
+        self._data4d = None
         super(BinaryLayerFile, self).__init__(filename, precision, verbose,
                                               kwargs)
         return
@@ -272,6 +290,8 @@ class BinaryLayerFile(LayerFile):
         self.file.seek(0, 2)
         self.totalbytes = self.file.tell()
         self.file.seek(0, 0)
+        if self.memmap and self._build_index_memmap():
+            return
         ipos = 0
         while ipos < self.totalbytes:
             header = self._get_header()
@@ -300,6 +320,138 @@ class BinaryLayerFile(LayerFile):
         self.nlay = np.max(self.recordarray['ilay'])
         return
 
+    def _build_index_memmap(self):
+        """
+        Build the recordarray and iposarray from a memory map of the file.
+        All records share the same size when every record has the first
+        record's nrow and ncol, so the file can be viewed as an array of
+        (header, data) records and the headers read as strided fields of
+        that array.  If the records also run layer by layer through
+        every time, the data are exposed as a (ntimes, nlay, nrow, ncol)
+        read-only view that get_data() and get_alldata() slice from.
+
+        Returns
+        -------
+        success : bool
+            False if the file can not be viewed as fixed size records, in
+            which case nothing is set.
+
+        """
+        hdr_dtype = np.dtype(self.header_dtype)
+        databytes = int(self.get_databytes({'nrow': self.nrow,
+                                            'ncol': self.ncol}))
+        recbytes = hdr_dtype.itemsize + databytes
+        if self.totalbytes % recbytes != 0:
+            return False
+        nrec = self.totalbytes // recbytes
+        names = list(hdr_dtype.names)
+        rec_dtype = np.dtype({'names': names + ['data'],
+                              'formats': [hdr_dtype.fields[n][0]
+                                          for n in names] +
+                                         [(self.realtype,
+                                           (self.nrow, self.ncol))],
+                              'offsets': [hdr_dtype.fields[n][1]
+                                          for n in names] +
+                                         [hdr_dtype.itemsize],
+                              'itemsize': recbytes})
+        records = np.memmap(self.filename, dtype=rec_dtype, mode='r',
+                            shape=(nrec,))
+        recordarray = np.empty(nrec, dtype=hdr_dtype)
+        for name in names:
+            recordarray[name] = records[name]
+        if np.any(recordarray['nrow'] != self.nrow) or \
+                np.any(recordarray['ncol'] != self.ncol) or \
+                np.any(np.char.find(recordarray['text'],
+                                    self.text.upper()) < 0):
+            return False
+
+        # a new time starts wherever totim changes
+        totim = recordarray['totim']
+        inew = np.ones(nrec, dtype=bool)
+        inew[1:] = totim[1:] != totim[:-1]
+        self.times = list(totim[inew])
+        self.kstpkper = list(zip(recordarray['kstp'][inew],
+                                 recordarray['kper'][inew]))
+        self.recordarray = recordarray
+        self.iposarray = np.arange(nrec, dtype=np.int64) * recbytes + \
+                         hdr_dtype.itemsize
+        self.nlay = np.max(self.recordarray['ilay'])
+        self._records = records
+
+        ntimes = len(self.times)
+        if nrec == ntimes * self.nlay and \
+                np.array_equal(recordarray['ilay'],
+                               np.tile(np.arange(1, self.nlay + 1), ntimes)) \
+                and np.all(inew[::self.nlay]):
+            self._data4d = records['data'].reshape(ntimes, self.nlay,
+                                                   self.nrow, self.ncol)
+        return True
+
+    def _get_data_array(self, totim=0.):
+        """
+        Get the three dimensional data array for the specified totim
+        value.  Returns a read-only view of the memory-mapped file when
+        the file was opened with memmap=True.
+
+        """
+        if self._data4d is None:
+            return super(BinaryLayerFile, self)._get_data_array(totim)
+        if totim >= 0.:
+            keyindices = np.where((self.recordarray['totim'] == totim))[0]
+            if len(keyindices) == 0:
+                msg = 'totim value ({}) not found in file...'.format(totim)
+                raise Exception(msg)
+        else:
+            raise Exception('Data not found...')
+        return self._data4d[keyindices[0] // self.nlay]
+
+    def get_alldata(self, mflay=None, nodata=-9999):
+        """
+        Get all of the data from the file.
+
+        Parameters
+        ----------
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+
+        nodata : float
+           The nodata value in the data array.  All array values that have the
+           nodata value will be assigned np.nan.  If None, no values are
+           replaced.
+
+        Returns
+        ----------
+        data : numpy array
+            Array has size (ntimes, nlay, nrow, ncol) if mflay is None or it
+            has size (ntimes, nrow, ncol) if mlay is specified.
+
+        See Also
+        --------
+
+        Notes
+        -----
+        If the file was opened with memmap=True and nodata is None, a
+        read-only view of the memory-mapped file is returned and nothing
+        is copied.
+
+        Examples
+        --------
+
+        """
+        if self._data4d is None:
+            return super(BinaryLayerFile, self).get_alldata(mflay=mflay,
+                                                            nodata=nodata)
+        if mflay is None:
+            rv = self._data4d
+        else:
+            rv = self._data4d[:, mflay, :, :]
+        if nodata is None:
+            return rv
+        rv = np.array(rv)
+        rv[rv == nodata] = np.nan
+        return rv
+
     def get_databytes(self, header):
         """
 
@@ -365,27 +517,60 @@ class BinaryLayerFile(LayerFile):
 
         # Initialize result array and put times in first column
         result = self._init_result(nstation)
-
-        istat = 1
-        for k, i, j in kijlist:
-            ioffset = (i * self.ncol + j) * self.realtype(1).nbytes
-            for irec, header in enumerate(self.recordarray):
-                ilay = header[
-                           'ilay'] - 1  # change ilay from header to zero-based
-                if ilay != k:
-                    continue
-                ipos = np.long(self.iposarray[irec])
-
-                # Calculate offset necessary to reach intended cell
-                self.file.seek(ipos + np.long(ioffset), 0)
-
-                # Find the time index and then put value into result in the
-                # correct location.
-                itim = np.where(result[:, 0] == header['totim'])[0]
-                result[itim, istat] = binaryread(self.file, self.realtype)
-            istat += 1
+        if len(self.recordarray) == 0:
+            return result
+
+        # byte offset of every station within a record and the row of
+        # result that every record belongs to
+        kij = np.array(kijlist, dtype=np.int64).reshape(-1, 3)
+        cell_offset = (kij[:, 1] * self.ncol + kij[:, 2]) * \
+                      self.realtype(1).nbytes
+        itimes = {}
+        for itim, totim in enumerate(result[:, 0]):
+            itimes.setdefault(totim, itim)
+        rec_itim = np.array([itimes.get(totim, -1) for totim in
+                             self.recordarray['totim'].astype(self.realtype)])
+        rec_lay = self.recordarray['ilay'] - 1
+        ipos = self.iposarray.astype(np.int64)
+
+        # gather all the stations of a layer for all of its records
+        # in a single pass over the memory-mapped file
+        values = self._get_value_view()
+        for k in np.unique(kij[:, 0]):
+            irecs = np.where((rec_lay == k) & (rec_itim >= 0))[0]
+            if irecs.shape[0] == 0:
+                continue
+            istats = np.where(kij[:, 0] == k)[0]
+            offsets = ipos[irecs][:, None] + cell_offset[istats][None, :]
+            result[np.ix_(rec_itim[irecs], istats + 1)] = values[offsets]
         return result
 
+    def _get_value_view(self):
+        """
+        Get a read-only view of the file as values of realtype, where
+        element n is the value that starts at byte n of the file.  The
+        view is backed by a memory map of the file, so indexing it with
+        byte offsets reads only the values that are needed.
+
+        """
+        if self._mmap is None:
+            self._mmap = np.memmap(self.filename, dtype=np.uint8, mode='r')
+        nbytes = self.realtype(1).nbytes
+        return np.ndarray(shape=(self._mmap.shape[0] - nbytes + 1,),
+                          dtype=self.realtype, buffer=self._mmap,
+                          offset=0, strides=(1,))
+
+    def close(self):
+        """
+        Close the file handle and release the memory map of the file.
+
+        """
+        self._mmap = None
+        self._records = None
+        self._data4d = None
+        super(BinaryLayerFile, self).close()
+        return
+
 
 class HeadFile(BinaryLayerFile):
     """
@@ -401,6 +586,12 @@ class HeadFile(BinaryLayerFile):
         'auto', 'single' or 'double'.  Default is 'auto'.
     verbose : bool
         Write information to the screen.  Default is False.
+    memmap : bool
+        Memory-map the file instead of reading records through the file
+        handle.  When every record has the same shape and the records
+        run layer by layer through every time, get_data() and
+        get_alldata(nodata=None) return read-only views into the file
+        without copying.  Default is False.
 
     Attributes
     ----------
@@ -439,7 +630,7 @@ class HeadFile(BinaryLayerFile):
     """
 
     def __init__(self, filename, text='head', precision='auto',
-                 verbose=False, **kwargs):
+                 verbose=False, memmap=False, **kwargs):
         self.text = text.encode()
         if precision == 'auto':
             precision = get_headfile_precision(filename)
@@ -450,7 +641,8 @@ class HeadFile(BinaryLayerFile):
                 raise Exception()
         self.header_dtype = BinaryHeader.set_dtype(bintype='Head',
                                                    precision=precision)
-        super(HeadFile, self).__init__(filename, precision, verbose, kwargs)
+        super(HeadFile, self).__init__(filename, precision, verbose, kwargs,
+                                       memmap=memmap)
         return
 
 
@@ -468,6 +660,12 @@ class UcnFile(BinaryLayerFile):
         'auto', 'single' or 'double'.  Default is 'auto'.
     verbose : bool
         Write information to the screen.  Default is False.
+    memmap : bool
+        Memory-map the file instead of reading records through the file
+        handle.  When every record has the same shape and the records
+        run layer by layer through every time, get_data() and
+        get_alldata(nodata=None) return read-only views into the file
+        without copying.  Default is False.
 
     Attributes
     ----------
@@ -501,7 +699,7 @@ class UcnFile(BinaryLayerFile):
     """
 
     def __init__(self, filename, text='concentration', precision='auto',
-                 verbose=False, **kwargs):
+                 verbose=False, memmap=False, **kwargs):
         self.text = text.encode()
         if precision == 'auto':
             precision = get_headfile_precision(filename)
@@ -512,7 +710,8 @@ class UcnFile(BinaryLayerFile):
             raise Exception()
         self.header_dtype = BinaryHeader.set_dtype(bintype='Ucn',
                                                    precision=precision)
-        super(UcnFile, self).__init__(filename, precision, verbose, kwargs)
+        super(UcnFile, self).__init__(filename, precision, verbose, kwargs,
+                                      memmap=memmap)
         return
 
 
@@ -528,6 +727,11 @@ class CellBudgetFile(object):
         'single' or 'double'.  Default is 'single'.
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_index : bool
+        If True, the record index is written to filename + '.idx.npz'
+        after the headers are read and is reused by later CellBudgetFile
+        objects for the file, as long as the modification time and size
+        of the budget file have not changed.  Default is False.
 
     Attributes
     ----------
@@ -540,6 +744,9 @@ class CellBudgetFile(object):
 
     Notes
     -----
+    The record headers and the data used by get_alldata() and get_ts()
+    are read from a memory map of the file, so only the records that are
+    requested are read.
 
     Examples
     --------
@@ -551,10 +758,15 @@ class CellBudgetFile(object):
 
     """
 
-    def __init__(self, filename, precision='single', verbose=False, **kwargs):
+    def __init__(self, filename, precision='single', verbose=False,
+                 cache_index=False, **kwargs):
         self.filename = filename
         self.precision = precision
         self.verbose = verbose
+        self.cache_index = cache_index
+        self.index_filename = filename + '.idx.npz'
+        self._mmap = None
+        self._record_lookup = None
         self.file = open(self.filename, 'rb')
         # Get filesize to ensure this is not an empty file
         self.file.seek(0, 2)
@@ -646,7 +858,9 @@ class CellBudgetFile(object):
     def _build_index(self):
         """
         Build the ordered dictionary, which maps the header information
-        to the position in the binary file.
+        to the position in the binary file.  If cache_index is True, the
+        index is read from the index file when it was written for the
+        current version of the budget file and is written to it otherwise.
         """
         header = self._get_header()
         self.nrow = header["nrow"]
@@ -660,114 +874,221 @@ class CellBudgetFile(object):
         self.file.seek(0, 2)
         self.totalbytes = self.file.tell()
         self.file.seek(0, 0)
-        self.recorddict = OrderedDict()
+        if not (self.cache_index and self._load_index()):
+            self._scan_index()
+            if self.cache_index:
+                self._save_index()
+        self._finalize_index()
+        return
+
+    def _scan_index(self):
+        """
+        Read the header of every record from a memory map of the file and
+        store the headers in recordarray and the positions of the headers
+        and data in iposheader and iposarray.  Only the headers and the
+        list sizes are read, the data are stepped over.
+
+        """
+        h1view = self._get_byte_view(self.header1_dtype)
+        h2view = self._get_byte_view(self.header2_dtype0)
+        i4view = self._get_byte_view(np.int32)
+        s16view = self._get_byte_view('a16')
+        h1size = self.header1_dtype.itemsize
+        h2size = self.header2_dtype0.itemsize
+        isize = np.int32(1).nbytes
+        rsize = self.realtype(1).nbytes
+        recordlist = []
+        iposheader = []
+        iposarray = []
         ipos = 0
         while ipos < self.totalbytes:
-            self.iposheader.append(ipos)
-            header = self._get_header()
-            self.nrecords += 1
-            totim = header['totim']
-            if totim == 0:
-                totim = self._totim_from_kstpkper(
-                    (header["kstp"] - 1, header["kper"] - 1))
-                header["totim"] = totim
-            if totim >= 0 and totim not in self.times:
-                self.times.append(totim)
-            kstpkper = (header['kstp'], header['kper'])
-            if kstpkper not in self.kstpkper:
-                self.kstpkper.append(kstpkper)
-            if header['text'] not in self.textlist:
-                self.textlist.append(header['text'])
-                self.imethlist.append(header['imeth'])
-            if header['paknam'] not in self.paknamlist:
-                self.paknamlist.append(header['paknam'])
-            ipos = self.file.tell()
+            iposheader.append(ipos)
+            header1 = h1view[ipos].item()
+            kstp, kper, text, ncol, nrow, nlay = header1
+            ipos += h1size
+            if nlay < 0:
+                # header2 holds imeth, delt, pertim and totim followed by
+                # the model and package names if imeth = 6
+                header2 = h2view[ipos].item()
+                ipos += h2size
+                if header2[0] == 6:
+                    header2 += tuple(s16view[ipos + 16 * i]
+                                     for i in range(4))
+                    ipos += 4 * 16
+                else:
+                    header2 += (b'', b'', b'', b'')
+            else:
+                header2 = (0, 0., 0., 0., b'', b'', b'', b'')
+            header = header1 + header2
+            recordlist.append(header)
+            iposarray.append(ipos)  # store the position right after header2
 
             if self.verbose:
-                for itxt in ['kstp', 'kper', 'text', 'ncol', 'nrow', 'nlay',
-                             'imeth', 'delt', 'pertim', 'totim', 'modelnam',
-                             'paknam', 'modelnam2', 'paknam2']:
-                    s = header[itxt]
+                for itxt, s in zip(self.header_dtype.names, header):
                     if isinstance(s, bytes):
                         s = s.decode()
                     print(itxt + ': ' + str(s))
                 print('file position: ', ipos)
-                if int(header['imeth']) != 5 and \
-                        int(header['imeth']) != 6 and \
-                        int(header['imeth']) != 7:
+                if header2[0] not in (5, 6, 7):
                     print('')
 
-            # store record and byte position mapping
-            self.recorddict[
-                tuple(header)] = ipos  # store the position right after header2
-            self.recordarray.append(header)
-            self.iposarray.append(
-                ipos)  # store the position right after header2
-
-            # skip over the data to the next record and set ipos
-            self._skip_record(header)
-            ipos = self.file.tell()
+            # skip over the data to the next record
+            imeth = header2[0]
+            nlay = abs(nlay)
+            if imeth == 0 or imeth == 1:
+                nbytes = nrow * ncol * nlay * rsize
+            elif imeth == 2:
+                nlist = int(i4view[ipos])
+                nbytes = isize + nlist * (isize + rsize)
+            elif imeth == 3:
+                nbytes = nrow * ncol * (rsize + isize)
+            elif imeth == 4:
+                nbytes = nrow * ncol * rsize
+            elif imeth == 5 or imeth == 6:
+                naux = int(i4view[ipos]) - 1
+                nlist = int(i4view[ipos + isize + naux * 16])
+                if self.verbose:
+                    print('naux: ', naux)
+                    print('nlist: ', nlist)
+                    print('')
+                # imeth 6 lists have a second node number
+                nnode = 1 if imeth == 5 else 2
+                nbytes = 2 * isize + naux * 16 + \
+                         nlist * (nnode * isize + rsize + naux * rsize)
+            else:
+                raise Exception('invalid method code ' + str(imeth))
+            ipos += nbytes
 
         # convert to numpy arrays
-        self.recordarray = np.array(self.recordarray, dtype=self.header_dtype)
-        self.iposheader = np.array(self.iposheader, dtype=np.int64)
-        self.iposarray = np.array(self.iposarray, dtype=np.int64)
-        self.nper = self.recordarray["kper"].max()
+        self.recordarray = np.array(recordlist, dtype=self.header_dtype)
+        self.iposheader = np.array(iposheader, dtype=np.int64)
+        self.iposarray = np.array(iposarray, dtype=np.int64)
         return
 
-    def _skip_record(self, header):
-        """
-        Skip over this record, not counting header and header2.
+    def _finalize_index(self):
+        """
+        Fill in the times of records written without them and build the
+        lists of unique times, time steps, record names and package names
+        from recordarray.
+
+        """
+        recordarray = self.recordarray
+        self.nrecords = recordarray.shape[0]
+        self._record_lookup = None
+
+        # records without a time get it from dis, if it is available
+        totims = {}
+        for i in np.where(recordarray['totim'] == 0)[0]:
+            kstpkper = (recordarray['kstp'][i] - 1,
+                        recordarray['kper'][i] - 1)
+            if kstpkper not in totims:
+                totims[kstpkper] = self._totim_from_kstpkper(kstpkper)
+            recordarray['totim'][i] = totims[kstpkper]
+
+        totim = recordarray['totim']
+        self.times = [totim[i] for i in _first_indices(totim)
+                      if totim[i] >= 0]
+        kstpkper = np.column_stack((recordarray['kstp'],
+                                    recordarray['kper']))
+        self.kstpkper = [(recordarray['kstp'][i], recordarray['kper'][i])
+                         for i in _first_indices(kstpkper)]
+        itext = _first_indices(recordarray['text'])
+        self.textlist = list(recordarray['text'][itext])
+        self.imethlist = list(recordarray['imeth'][itext])
+        self.paknamlist = list(
+            recordarray['paknam'][_first_indices(recordarray['paknam'])])
+
+        # store record and byte position mapping
+        self.recorddict = OrderedDict(
+            (tuple(header), ipos) for header, ipos in
+            zip(recordarray, self.iposarray))
+        self.nper = recordarray["kper"].max()
+        return
 
+    def _load_index(self):
         """
-        nlay = abs(header['nlay'])
-        nrow = header['nrow']
-        ncol = header['ncol']
-        imeth = header['imeth']
-        if imeth == 0:
-            nbytes = (nrow * ncol * nlay * self.realtype(1).nbytes)
-        elif imeth == 1:
-            nbytes = (nrow * ncol * nlay * self.realtype(1).nbytes)
-        elif imeth == 2:
-            nlist = binaryread(self.file, np.int32)[0]
-            nbytes = nlist * (np.int32(1).nbytes + self.realtype(1).nbytes)
-        elif imeth == 3:
-            nbytes = (nrow * ncol * self.realtype(1).nbytes)
-            nbytes += (nrow * ncol * np.int32(1).nbytes)
-        elif imeth == 4:
-            nbytes = (nrow * ncol * self.realtype(1).nbytes)
-        elif imeth == 5:
-            nauxp1 = binaryread(self.file, np.int32)[0]
-            naux = nauxp1 - 1
-            for i in range(naux):
-                temp = binaryread(self.file, str, charlen=16)
-            nlist = binaryread(self.file, np.int32)[0]
-            if self.verbose:
-                print('naux: ', naux)
-                print('nlist: ', nlist)
-                print('')
-            nbytes = nlist * (np.int32(1).nbytes + self.realtype(1).nbytes +
-                              naux * self.realtype(1).nbytes)
-        elif imeth == 6:
-            # read rest of list data
-            nauxp1 = binaryread(self.file, np.int32)[0]
-            naux = nauxp1 - 1
-            for i in range(naux):
-                temp = binaryread(self.file, str, charlen=16)
-            nlist = binaryread(self.file, np.int32)[0]
-            if self.verbose:
-                print('naux: ', naux)
-                print('nlist: ', nlist)
-                print('')
-            nbytes = nlist * (
-                    np.int32(1).nbytes * 2 + self.realtype(1).nbytes +
-                    naux * self.realtype(1).nbytes)
-        else:
-            raise Exception('invalid method code ' + str(imeth))
-        if nbytes != 0:
-            self.file.seek(nbytes, 1)
+        Read recordarray, iposheader and iposarray from the index file.
+
+        Returns
+        -------
+        success : bool
+            False if the index file does not exist, can not be read, or
+            was written for a different version of the budget file.
+
+        """
+        if not os.path.isfile(self.index_filename):
+            return False
+        try:
+            with np.load(self.index_filename) as index:
+                if not np.array_equal(index['signature'],
+                                      self._index_signature()):
+                    return False
+                recordarray = index['recordarray']
+                iposheader = index['iposheader']
+                iposarray = index['iposarray']
+        except Exception:
+            return False
+        if recordarray.dtype != self.header_dtype:
+            return False
+        if self.verbose:
+            print('reading budget index from ' + self.index_filename)
+        self.recordarray = recordarray
+        self.iposheader = iposheader
+        self.iposarray = iposarray
+        return True
+
+    def _save_index(self):
+        """
+        Write recordarray, iposheader and iposarray to the index file, so
+        that the next CellBudgetFile for this file can skip reading the
+        headers.
+
+        """
+        try:
+            with open(self.index_filename, 'wb') as f:
+                np.savez(f, signature=self._index_signature(),
+                         recordarray=self.recordarray,
+                         iposheader=self.iposheader,
+                         iposarray=self.iposarray)
+        except (IOError, OSError) as e:
+            warnings.warn('unable to write budget index file ' +
+                          '{}: {}'.format(self.index_filename, str(e)))
         return
 
+    def _index_signature(self):
+        """
+        Get the modification time and size of the budget file and the
+        size of its real values, which identify the version of the file
+        that an index file was written for.
+
+        """
+        st = os.stat(self.filename)
+        return np.array([st.st_mtime_ns, st.st_size,
+                         self.realtype(1).nbytes], dtype=np.int64)
+
+    def _get_byte_view(self, dtype):
+        """
+        Get a read-only view of the file as values of dtype, where element
+        n is the value that starts at byte n of the file.  The view is
+        backed by a memory map of the file, so indexing it with byte
+        offsets reads only the values that are needed.
+
+        """
+        mm = self._get_mmap()
+        dtype = np.dtype(dtype)
+        n = max(mm.shape[0] - dtype.itemsize + 1, 0)
+        return np.ndarray(shape=(n,), dtype=dtype, buffer=mm, offset=0,
+                          strides=(1,))
+
+    def _get_mmap(self):
+        """
+        Get a read-only memory map of the file as bytes.
+
+        """
+        if self._mmap is None:
+            self._mmap = np.memmap(self.filename, dtype=np.uint8, mode='r')
+        return self._mmap
+
     def _get_header(self):
         """
         Read the file header
@@ -1069,10 +1390,8 @@ class CellBudgetFile(object):
                     (self.recordarray['kper'] == kper1))
             else:
                 if paknam is None and text is not None:
-                    select_indices = np.where(
-                        (self.recordarray['kstp'] == kstp1) &
-                        (self.recordarray['kper'] == kper1) &
-                        (self.recordarray['text'] == text16))
+                    select_indices = self._get_record_lookup().get(
+                        (kstp1, kper1, text16), [])
                 elif text is None and paknam is not None:
                     select_indices = np.where(
                         (self.recordarray['kstp'] == kstp1) &
@@ -1189,18 +1508,149 @@ class CellBudgetFile(object):
             for idx, t in enumerate(timesint):
                 result[idx, 0] = t
 
-        for itim, k in enumerate(kk):
-            v = self.get_data(kstpkper=k, text=text, full3D=True)
+        text16 = self._find_text(text)
+        k, i, j = np.array(kijlist, dtype=int).reshape(-1, 3).T
+        lookup = self._get_record_lookup()
+        for itim, (kstp, kper) in enumerate(self.kstpkper):
+            irecs = lookup.get((kstp, kper, text16))
             # skip missing data - required for storage
-            if len(v) > 0:
-                v = v[0]
-                istat = 1
-                for k, i, j in kijlist:
-                    result[itim, istat] = v[k, i, j].copy()
-                    istat += 1
+            if irecs is not None:
+                v = self._get_record_3d(irecs[0])
+                result[itim, 1:] = v[k, i, j].filled(np.nan)
 
         return result
 
+    def get_alldata(self, text, paknam=None):
+        """
+        Get a budget term for every time step in the binary budget file.
+
+        Parameters
+        ----------
+        text : str
+            The text identifier for the record.  Examples include
+            'RIVER LEAKAGE', 'STORAGE', 'FLOW RIGHT FACE', etc.
+        paknam : str
+            The package name for the record, for budget files that have
+            package names.  (Default is None.)
+
+        Returns
+        ----------
+        data : numpy masked array
+            Array of size (nkstpkper, nlay, nrow, ncol), where the time
+            steps are those of get_kstpkper().  Cells without a value in a
+            list-style record and time steps without the record are masked.
+
+        See Also
+        --------
+
+        Notes
+        -----
+        If a time step has more than one record for text, the first one is
+        used, which is the first record get_data() returns for the time
+        step.  Full 3D arrays are not supported for imeth = 6.
+
+        Examples
+        --------
+
+        >>> import flopy.utils.binaryfile as bf
+        >>> cbb = bf.CellBudgetFile('mymodel.cbb')
+        >>> frf = cbb.get_alldata(text='FLOW RIGHT FACE')
+
+        """
+        text16 = self._find_text(text)
+        paknam16 = self._find_paknam(paknam)
+        select = self.recordarray['text'] == text16
+        if paknam16 is not None:
+            select &= self.recordarray['paknam'] == paknam16
+        itims = dict((kstpkper, itim) for itim, kstpkper in
+                     enumerate(self.kstpkper))
+        out = np.ma.zeros((len(self.kstpkper), self.nlay, self.nrow,
+                           self.ncol), dtype=self.realtype)
+        out.mask = True
+        filled = np.zeros(len(self.kstpkper), dtype=bool)
+        for idx in np.where(select)[0]:
+            itim = itims[(self.recordarray['kstp'][idx],
+                          self.recordarray['kper'][idx])]
+            if filled[itim]:
+                continue
+            out[itim] = self._get_record_3d(idx)
+            filled[itim] = True
+        return out
+
+    def _get_record_lookup(self):
+        """
+        Get a dictionary that maps (kstp, kper, text) to the record
+        numbers with that time step and record name.  kstp and kper are
+        one-based, as in recordarray.
+
+        """
+        if self._record_lookup is None:
+            lookup = {}
+            for idx, key in enumerate(zip(self.recordarray['kstp'].tolist(),
+                                          self.recordarray['kper'].tolist(),
+                                          self.recordarray['text'].tolist())):
+                lookup.setdefault(key, []).append(idx)
+            self._record_lookup = lookup
+        return self._record_lookup
+
+    def _get_record_3d(self, idx):
+        """
+        Get a single data record from a memory map of the budget file as
+        a numpy masked array of size (nlay, nrow, ncol), like get_record()
+        with full3D=True.  List-style records are decoded with a single
+        scatter of the flows into the array.
+
+        """
+        header = self.recordarray[idx]
+        ipos = int(self.iposarray[idx])
+        imeth = header['imeth']
+        nlay = abs(header['nlay'])
+        nrow = header['nrow']
+        ncol = header['ncol']
+        isize = np.int32(1).nbytes
+        out = np.ma.zeros((self.nlay, self.nrow, self.ncol),
+                          dtype=self.realtype)
+        out.mask = True
+        mm = self._get_mmap()
+
+        if imeth == 0 or imeth == 1:
+            out[:nlay] = np.ndarray(shape=(nlay, nrow, ncol),
+                                    dtype=self.realtype, buffer=mm,
+                                    offset=ipos)
+        elif imeth == 2 or imeth == 5:
+            if imeth == 2:
+                dtype = np.dtype([('node', np.int32), ('q', self.realtype)])
+            else:
+                naux = int(np.ndarray(shape=(), dtype=np.int32, buffer=mm,
+                                      offset=ipos)) - 1
+                ipos += isize + naux * 16
+                dtype = np.dtype([('node', np.int32), ('q', self.realtype)] +
+                                 [('aux{}'.format(i), self.realtype)
+                                  for i in range(naux)])
+            nlist = int(np.ndarray(shape=(), dtype=np.int32, buffer=mm,
+                                   offset=ipos))
+            data = np.ndarray(shape=(nlist,), dtype=dtype, buffer=mm,
+                              offset=ipos + isize)
+            node = data['node'] - 1
+            flat = out.data.reshape(-1)
+            np.add.at(flat, node, data['q'])
+            out.mask.reshape(-1)[node] = False
+        elif imeth == 3:
+            ilayer = np.ndarray(shape=(nrow, ncol), dtype=np.int32,
+                                buffer=mm, offset=ipos)
+            data = np.ndarray(shape=(nrow, ncol), dtype=self.realtype,
+                              buffer=mm, offset=ipos + nrow * ncol * isize)
+            # ilayer holds the layer of each value
+            r, c = np.indices((nrow, ncol))
+            out[ilayer - 1, r, c] = data
+        elif imeth == 4:
+            out[0] = np.ndarray(shape=(nrow, ncol), dtype=self.realtype,
+                                buffer=mm, offset=ipos)
+        else:
+            raise ValueError('full 3D arrays not supported for ' +
+                             'imeth = {}'.format(imeth))
+        return out
+
     def _build_kijlist(self, idx):
         if isinstance(idx, list):
             kijlist = idx
@@ -1344,8 +1794,9 @@ class CellBudgetFile(object):
             if full3D:
                 out = np.ma.zeros((nlay, nrow, ncol), dtype=np.float32)
                 out.mask = True
-                vertical_layer = ilayer[0] - 1  # This is always the top layer
-                out[vertical_layer, :, :] = data
+                # ilayer holds the layer of each value
+                r, c = np.indices((nrow, ncol))
+                out[ilayer - 1, r, c] = data
                 return out
             else:
                 return [ilayer, data]
@@ -1438,10 +1889,10 @@ class CellBudgetFile(object):
         """
         out = np.ma.zeros((nlay * nrow * ncol), dtype=np.float32)
         out.mask = True
-        for [node, q] in zip(data['node'], data['q']):
-            idx = node - 1
-            out.data[idx] += q
-            out.mask[idx] = False
+        idx = data['node'] - 1
+        # add.at sums the flows of nodes that are listed more than once
+        np.add.at(out.data, idx, data['q'])
+        out.mask[idx] = False
         return np.ma.reshape(out, (nlay, nrow, ncol))
 
     def get_times(self):
@@ -1551,8 +2002,9 @@ class CellBudgetFile(object):
 
     def close(self):
         """
-        Close the file handle
+        Close the file handle and release the memory map of the file.
         """
+        self._mmap = None
         self.file.close()
         return
 
@@ -0,0 +1,543 @@
+"""
+Spatial indexes for locating points in the cells of a model grid
+"""
+import numpy as np
+from .geometry import rotate
+
+
+def _points(x, y):
+    """Get x and y as float arrays of the same shape."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.shape != y.shape:
+        raise Exception('x and y must have the same shape')
+    return x, y
+
+
+def _ranges(start, count):
+    """Expand ranges of integers, given by their starts and lengths, into
+    one array.  Returns the number of the range each integer comes from
+    and the integers."""
+    count = np.asarray(count, dtype=int)
+    owner = np.repeat(np.arange(len(count)), count)
+    offset = np.arange(len(owner)) - np.repeat(np.cumsum(count) - count,
+                                               count)
+    return owner, np.repeat(start, count) + offset
+
+
+def _group(owner, values, n):
+    """Split values into a list of n sorted arrays, one for each owner."""
+    order = np.lexsort((values, owner))
+    counts = np.bincount(owner, minlength=n)
+    return np.split(values[order], np.cumsum(counts)[:-1])
+
+
+def _min_by_owner(owner, values):
+    """Get the owners and the smallest value of each owner, for values
+    that are grouped by owner."""
+    if len(owner) == 0:
+        return owner, values
+    starts = np.flatnonzero(np.concatenate(([True],
+                                            owner[1:] != owner[:-1])))
+    return owner[starts], np.minimum.reduceat(values, starts)
+
+
+def cell_vertex_array(xvertices, yvertices):
+    """
+    Pack the vertices of cells with different numbers of vertices into
+    one array.
+
+    Parameters
+    ----------
+    xvertices : list of lists
+        x coordinates of the vertices of each cell
+    yvertices : list of lists
+        y coordinates of the vertices of each cell
+
+    Returns
+    -------
+    verts : ndarray
+        array of shape (ncell, nvert, 2), where nvert is the largest number
+        of vertices of a cell.  The vertices of cells with fewer vertices
+        are padded with the first vertex of the cell.
+
+    """
+    nverts = np.array([len(v) for v in xvertices])
+    verts = np.empty((len(xvertices), nverts.max(), 2))
+    for n in np.unique(nverts):
+        cells = np.where(nverts == n)[0]
+        verts[cells, :n, 0] = [xvertices[c] for c in cells]
+        verts[cells, :n, 1] = [yvertices[c] for c in cells]
+        verts[cells, n:] = verts[cells, :1]
+    return verts
+
+
+class StructuredGridIndex(object):
+    """
+    Spatial index of a structured grid.
+
+    Points are transformed to model coordinates and located with a binary
+    search of the column and row edges, so the index needs no setup
+    beyond the grid edges.
+
+    Parameters
+    ----------
+    xedge : ndarray
+        x coordinates of the column edges in model coordinates, increasing
+        (ncol + 1)
+    yedge : ndarray
+        y coordinates of the row edges in model coordinates, decreasing
+        (nrow + 1)
+    xoff : float
+        x coordinate of the lower left corner of the grid
+    yoff : float
+        y coordinate of the lower left corner of the grid
+    angrot : float
+        rotation of the grid in degrees counter-clockwise about the lower
+        left corner
+
+    Notes
+    -----
+    Cells are numbered row by row, so cell n is in row n // ncol and column
+    n % ncol.  A point on the edge between two cells is in the cell with
+    the lower row or column number.  All queries take points in the
+    spatial reference coordinate system unless local is True.
+
+    Examples
+    --------
+    >>> import flopy
+    >>> m = flopy.modflow.Modflow.load('model.nam')
+    >>> row, col = m.modelgrid.spatial_index.locate_rowcol(x, y)
+
+    """
+    def __init__(self, xedge, yedge, xoff=0., yoff=0., angrot=0.):
+        self.xedge = np.asarray(xedge, dtype=float)
+        self.yedge = np.asarray(yedge, dtype=float)
+        self.nrow = len(self.yedge) - 1
+        self.ncol = len(self.xedge) - 1
+        self.xcenter = 0.5 * (self.xedge[1:] + self.xedge[:-1])
+        self.ycenter = 0.5 * (self.yedge[1:] + self.yedge[:-1])
+        self.xoff = xoff
+        self.yoff = yoff
+        self.angrot = angrot
+
+    def get_local_coords(self, x, y):
+        """
+        Transform points from the spatial reference coordinate system to
+        model coordinates.
+
+        """
+        x, y = _points(x, y)
+        x, y = rotate(x, y, self.xoff, self.yoff, -np.radians(self.angrot))
+        return x - self.xoff, y - self.yoff
+
+    def _local(self, x, y, local):
+        if local:
+            return _points(x, y)
+        return self.get_local_coords(x, y)
+
+    def locate_rowcol(self, x, y, local=False):
+        """
+        Get the row and column of the cells that contain the points.
+
+        Parameters
+        ----------
+        x : float or array of floats
+            x coordinates of the points
+        y : float or array of floats
+            y coordinates of the points
+        local : bool
+            If True, x and y are in model coordinates (default is False)
+
+        Returns
+        -------
+        row, col : arrays of ints
+            zero-based row and column of the points, or -1 for points
+            outside of the grid
+
+        """
+        x, y = self._local(x, y, local)
+        inside = (x >= self.xedge[0]) & (x <= self.xedge[-1]) & \
+                 (y >= self.yedge[-1]) & (y <= self.yedge[0])
+        # find the column from the number of edges left of x and the
+        # row from the number of edges above y
+        col = np.searchsorted(self.xedge, x, side='left') - 1
+        row = self.nrow - np.searchsorted(self.yedge[::-1], y, side='right')
+        col = np.where(inside, np.clip(col, 0, self.ncol - 1), -1)
+        row = np.where(inside, np.clip(row, 0, self.nrow - 1), -1)
+        return row, col
+
+    def locate(self, x, y, local=False):
+        """
+        Get the cell numbers of the cells that contain the points.
+
+        Parameters
+        ----------
+        x : float or array of floats
+            x coordinates of the points
+        y : float or array of floats
+            y coordinates of the points
+        local : bool
+            If True, x and y are in model coordinates (default is False)
+
+        Returns
+        -------
+        cell : array of ints
+            cell numbers of the points, or -1 for points outside of the
+            grid
+
+        """
+        row, col = self.locate_rowcol(x, y, local)
+        return np.where(row < 0, -1, row * self.ncol + col)
+
+    def nearest(self, x, y, local=False):
+        """
+        Get the cells with the centers nearest to the points.
+
+        Parameters
+        ----------
+        x : float or array of floats
+            x coordinates of the points
+        y : float or array of floats
+            y coordinates of the points
+        local : bool
+            If True, x and y are in model coordinates (default is False)
+
+        Returns
+        -------
+        cell : array of ints
+            cell numbers of the nearest cells, or -1 for points that are
+            not finite
+        distance : array of floats
+            distances from the points to the nearest cell centers
+
+        """
+        x, y = self._local(x, y, local)
+        # the centers form a rectilinear lattice, so the nearest center
+        # is in the nearest column and the nearest row
+        col = np.searchsorted(0.5 * (self.xcenter[1:] + self.xcenter[:-1]),
+                              x, side='left')
+        ycenter = self.ycenter[::-1]
+        row = self.nrow - 1 - np.searchsorted(0.5 * (ycenter[1:] +
+                                                     ycenter[:-1]),
+                                              y, side='right')
+        valid = np.isfinite(x) & np.isfinite(y)
+        col = np.where(valid, np.clip(col, 0, self.ncol - 1), 0)
+        row = np.where(valid, np.clip(row, 0, self.nrow - 1), 0)
+        distance = np.hypot(x - self.xcenter[col], y - self.ycenter[row])
+        return np.where(valid, row * self.ncol + col, -1), distance
+
+    def within(self, x, y, radius, local=False):
+        """
+        Get the cells with centers within a distance of the points.
+
+        Parameters
+        ----------
+        x : float or array of floats
+            x coordinates of the points
+        y : float or array of floats
+            y coordinates of the points
+        radius : float or array of floats
+            search distance, for all points or for each point
+        local : bool
+            If True, x and y are in model coordinates (default is False)
+
+        Returns
+        -------
+        cells : array of ints or list of arrays of ints
+            sorted cell numbers of the cells within radius of each point.
+            A single array is returned for a single point.
+
+        """
+        x, y = self._local(x, y, local)
+        scalar = x.ndim == 0
+        x, y = x.ravel(), y.ravel()
+        radius = np.broadcast_to(np.asarray(radius, dtype=float),
+                                 x.shape)
+        ycenter = self.ycenter[::-1]
+        col0 = np.searchsorted(self.xcenter, x - radius, side='left')
+        col1 = np.searchsorted(self.xcenter, x + radius, side='right')
+        rrow0 = np.searchsorted(ycenter, y - radius, side='left')
+        rrow1 = np.searchsorted(ycenter, y + radius, side='right')
+        ncol = np.maximum(col1 - col0, 0)
+        pt, rrow = _ranges(rrow0, np.maximum(rrow1 - rrow0, 0))
+        row = self.nrow - 1 - rrow
+        seg, cell = _ranges(row * self.ncol + col0[pt], ncol[pt])
+        pt = pt[seg]
+        keep = np.hypot(x[pt] - self.xcenter[cell % self.ncol],
+                        y[pt] - self.ycenter[cell // self.ncol]) <= \
+               radius[pt]
+        cells = _group(pt[keep], cell[keep], len(x))
+        if scalar:
+            return cells[0]
+        return cells
+
+
+class UniformGridIndex(object):
+    """
+    Spatial index of the cells of a vertex or unstructured grid.
+
+    The extent of the grid is divided into uniform square bins, sized so
+    that there is about one cell per bin.  Each bin stores the cells whose
+    bounding box overlaps the bin and the cells whose center is in the
+    bin, so a query only tests the cells in the bins around each point.
+
+    Parameters
+    ----------
+    cell_vertices : ndarray
+        vertices of the cells, of shape (ncell, nvert, 2).  The vertices of
+        cells with fewer than nvert vertices are padded by repeating a
+        vertex (see cell_vertex_array).
+    xcenter : ndarray
+        x coordinates of the cell centers
+    ycenter : ndarray
+        y coordinates of the cell centers
+    bin_size : float, optional
+        width of the bins.  By default the square root of the area of the
+        grid extent divided by the number of cells.
+
+    Notes
+    -----
+    Cells are numbered in the order of cell_vertices.  A point is in a
+    cell if it is inside the cell polygon by the even-odd rule, so a point
+    on the edge between two cells is in one of them, and a point on the
+    outer edge of the grid may be outside of all of them.  A point in more
+    than one cell is in the cell with the lowest number.
+
+    Examples
+    --------
+    >>> import flopy
+    >>> sim = flopy.mf6.MFSimulation.load(sim_ws='disv_model')
+    >>> index = sim.get_model().modelgrid.spatial_index
+    >>> cell = index.locate(x, y)
+    >>> cells = index.within(x, y, 100.)
+
+    """
+    chunk_size = 100000
+
+    def __init__(self, cell_vertices, xcenter, ycenter, bin_size=None):
+        self.cell_vertices = np.asarray(cell_vertices, dtype=float)
+        self.xcenter = np.ravel(np.asarray(xcenter, dtype=float))
+        self.ycenter = np.ravel(np.asarray(ycenter, dtype=float))
+        ncell = len(self.cell_vertices)
+        lo = self.cell_vertices.min(axis=1)
+        hi = self.cell_vertices.max(axis=1)
+        self.xmin = min(lo[:, 0].min(), self.xcenter.min())
+        self.ymin = min(lo[:, 1].min(), self.ycenter.min())
+        width = max(hi[:, 0].max(), self.xcenter.max()) - self.xmin
+        height = max(hi[:, 1].max(), self.ycenter.max()) - self.ymin
+        if bin_size is None:
+            bin_size = np.sqrt(width * height / ncell)
+            if bin_size == 0.:
+                bin_size = max(width, height) / ncell
+            if bin_size == 0.:
+                bin_size = 1.
+        self.bin_size = float(bin_size)
+        self.nx = max(int(np.ceil(width / self.bin_size)), 1)
+        self.ny = max(int(np.ceil(height / self.bin_size)), 1)
+
+        # bins overlapped by the bounding box of each cell
+        ix0, iy0 = self._bin(lo[:, 0], lo[:, 1])
+        ix1, iy1 = self._bin(hi[:, 0], hi[:, 1])
+        cell, iy = _ranges(iy0, iy1 - iy0 + 1)
+        seg, bins = _ranges(iy * self.nx + ix0[cell],
+                            (ix1 - ix0 + 1)[cell])
+        self._cell_start, self._cells = self._sort_bins(bins, cell[seg])
+        # bin of each cell center
+        ix, iy = self._bin(self.xcenter, self.ycenter)
+        self._center_start, self._centers = \
+            self._sort_bins(iy * self.nx + ix, np.arange(ncell))
+
+    @property
+    def ncell(self):
+        return len(self.cell_vertices)
+
+    def _bin(self, x, y):
+        """Get the column and row of the bins of points, clipped to the
+        extent of the index."""
+        with np.errstate(invalid='ignore'):
+            ix = np.floor((x - self.xmin) / self.bin_size)
+            iy = np.floor((y - self.ymin) / self.bin_size)
+        ix = np.clip(np.nan_to_num(ix), 0, self.nx - 1).astype(int)
+        iy = np.clip(np.nan_to_num(iy), 0, self.ny - 1).astype(int)
+        return ix, iy
+
+    def _sort_bins(self, bins, items):
+        """Sort items by bin, keeping the order of the items in each bin,
+        and get the start of each bin in the sorted items."""
+        order = np.argsort(bins, kind='mergesort')
+        count = np.bincount(bins, minlength=self.nx * self.ny)
+        return np.concatenate(([0], np.cumsum(count))), items[order]
+
+    def _bin_items(self, start, items, ix0, ix1, iy0, iy1):
+        """Get the items in the bins ix0 to ix1 and iy0 to iy1 around each
+        point, as pairs of point number and item.  The bins in a row are
+        consecutive, so their items are one range of the sorted items."""
+        pt, iy = _ranges(iy0, iy1 - iy0 + 1)
+        b0 = iy * self.nx + ix0[pt]
+        b1 = iy * self.nx + ix1[pt] + 1
+        seg, pos = _ranges(start[b0], start[b1] - start[b0])
+        return pt[seg], items[pos]
+
+    def _contains(self, cell, x, y):
+        """Test if points are inside cells with the crossing number test."""
+        verts = self.cell_vertices[cell]
+        xi, yi = verts[..., 0], verts[..., 1]
+        xj, yj = np.roll(xi, -1, axis=1), np.roll(yi, -1, axis=1)
+        x, y = x[:, None], y[:, None]
+        crosses = (yi > y) != (yj > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xcross = xi + (y - yi) * (xj - xi) / (yj - yi)
+        return np.sum(crosses & (x < xcross), axis=1) % 2 == 1
+
+    def _nearest_in_bins(self, x, y, ix0, ix1, iy0, iy1):
+        """Get the distance to and the number of the nearest cell center
+        in the bins ix0 to ix1 and iy0 to iy1 around each point."""
+        pt, c = self._bin_items(self._center_start, self._centers,
+                                ix0, ix1, iy0, iy1)
+        d = np.hypot(self.xcenter[c] - x[pt], self.ycenter[c] - y[pt])
+        best = np.full(len(x), np.inf)
+        owner, dmin = _min_by_owner(pt, d)
+        best[owner] = dmin
+        # use the lowest cell number of equally near centers
+        nearest = d == best[pt]
+        cell = np.full(len(x), -1, dtype=int)
+        owner, cmin = _min_by_owner(pt[nearest], c[nearest])
+        cell[owner] = cmin
+        return best, cell
+
+    def locate(self, x, y):
+        """
+        Get the cell numbers of the cells that contain the points.
+
+        Parameters
+        ----------
+        x : float or array of floats
+            x coordinates of the points
+        y : float or array of floats
+            y coordinates of the points
+
+        Returns
+        -------
+        cell : array of ints
+            cell numbers of the points, or -1 for points outside of the
+            grid
+
+        """
+        x, y = _points(x, y)
+        shape = x.shape
+        x, y = x.ravel(), y.ravel()
+        cell = np.full(len(x), -1, dtype=int)
+        xmax = self.xmin + self.nx * self.bin_size
+        ymax = self.ymin + self.ny * self.bin_size
+        points = np.where((x >= self.xmin) & (x <= xmax) &
+                          (y >= self.ymin) & (y <= ymax))[0]
+        # limit the memory used for the candidate cells of the points
+        for i in range(0, len(points), self.chunk_size):
+            p = points[i:i + self.chunk_size]
+            ix, iy = self._bin(x[p], y[p])
+            pt, c = self._bin_items(self._cell_start, self._cells,
+                                    ix, ix, iy, iy)
+            inside = self._contains(c, x[p][pt], y[p][pt])
+            pt, c = _min_by_owner(pt[inside], c[inside])
+            cell[p[pt]] = c
+        return cell.reshape(shape)
+
+    def nearest(self, x, y):
+        """
+        Get the cells with the centers nearest to the points.
+
+        Parameters
+        ----------
+        x : float or array of floats
+            x coordinates of the points
+        y : float or array of floats
+            y coordinates of the points
+
+        Returns
+        -------
+        cell : array of ints
+            cell numbers of the nearest cells, or -1 for points that are
+            not finite.  The lowest cell number is used for points that
+            are equally distant from several cell centers.
+        distance : array of floats
+            distances from the points to the nearest cell centers
+
+        """
+        x, y = _points(x, y)
+        shape = x.shape
+        x, y = x.ravel(), y.ravel()
+        cell = np.full(len(x), -1, dtype=int)
+        distance = np.full(len(x), np.nan)
+        points = np.where(np.isfinite(x) & np.isfinite(y))[0]
+        bx, by = self._bin(x[points], y[points])
+        k = 0
+        while len(points) > 0:
+            # search the square of bins within k bins of each point
+            xp, yp = x[points], y[points]
+            ix0, ix1 = np.maximum(bx - k, 0), np.minimum(bx + k, self.nx - 1)
+            iy0, iy1 = np.maximum(by - k, 0), np.minimum(by + k, self.ny - 1)
+            best, bestcell = self._nearest_in_bins(xp, yp, ix0, ix1, iy0, iy1)
+            # a nearer center can only be beyond the sides of the searched
+            # square that are inside the extent of the index
+            safe = np.full(len(points), np.inf)
+            x0 = self.xmin + ix0 * self.bin_size
+            x1 = self.xmin + (ix1 + 1) * self.bin_size
+            y0 = self.ymin + iy0 * self.bin_size
+            y1 = self.ymin + (iy1 + 1) * self.bin_size
+            safe = np.where(ix0 > 0, np.minimum(safe, xp - x0), safe)
+            safe = np.where(ix1 < self.nx - 1, np.minimum(safe, x1 - xp), safe)
+            safe = np.where(iy0 > 0, np.minimum(safe, yp - y0), safe)
+            safe = np.where(iy1 < self.ny - 1, np.minimum(safe, y1 - yp), safe)
+            # otherwise the nearest center is no further than the nearest
+            # center found, so search the bins within that distance
+            found = (best > safe) & np.isfinite(best)
+            if np.any(found):
+                r = best[found]
+                ix0, iy0 = self._bin(xp[found] - r, yp[found] - r)
+                ix1, iy1 = self._bin(xp[found] + r, yp[found] + r)
+                best[found], bestcell[found] = \
+                    self._nearest_in_bins(xp[found], yp[found],
+                                          ix0, ix1, iy0, iy1)
+            done = (best <= safe) | found
+            cell[points[done]] = bestcell[done]
+            distance[points[done]] = best[done]
+            points, bx, by = points[~done], bx[~done], by[~done]
+            k = max(2 * k, 1)
+        return cell.reshape(shape), distance.reshape(shape)
+
+    def within(self, x, y, radius):
+        """
+        Get the cells with centers within a distance of the points.
+
+        Parameters
+        ----------
+        x : float or array of floats
+            x coordinates of the points
+        y : float or array of floats
+            y coordinates of the points
+        radius : float or array of floats
+            search distance, for all points or for each point
+
+        Returns
+        -------
+        cells : array of ints or list of arrays of ints
+            sorted cell numbers of the cells within radius of each point.
+            A single array is returned for a single point.
+
+        """
+        x, y = _points(x, y)
+        scalar = x.ndim == 0
+        x, y = x.ravel(), y.ravel()
+        radius = np.broadcast_to(np.asarray(radius, dtype=float),
+                                 x.shape)
+        ix0, iy0 = self._bin(x - radius, y - radius)
+        ix1, iy1 = self._bin(x + radius, y + radius)
+        pt, c = self._bin_items(self._center_start, self._centers,
+                                ix0, ix1, iy0, iy1)
+        keep = np.hypot(self.xcenter[c] - x[pt],
+                        self.ycenter[c] - y[pt]) <= radius[pt]
+        cells = _group(pt[keep], c[keep], len(x))
+        if scalar:
+            return cells[0]
+        return cells
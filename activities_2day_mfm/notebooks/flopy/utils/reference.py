@@ -9,6 +9,8 @@ import warnings
 
 from collections import OrderedDict
 
+from .gridindex import UniformGridIndex, cell_vertex_array
+
 
 class SpatialReference(object):
     """
@@ -541,6 +543,7 @@ class SpatialReference(object):
         self._ycentergrid = None
         self._xcentergrid = None
         self._vertices = None
+        self._cell_vertices = None
         return
 
     @property
@@ -922,20 +925,27 @@ class SpatialReference(object):
         write_grid_shapefile2(filename, self, array_dict={}, nan_val=-1.0e9,
                               epsg=epsg, prj=prj)
 
+    @property
+    def cell_vertices(self):
+        """(nrow, ncol, 4, 2) array of the vertices of all of the cells, in
+        the order of get_vertices()."""
+        if self._cell_vertices is None:
+            xgrid, ygrid = self.xgrid, self.ygrid
+            verts = np.empty((self.nrow, self.ncol, 4, 2))
+            for n, (di, dj) in enumerate([(0, 0), (1, 0), (1, 1), (0, 1)]):
+                verts[:, :, n, 0] = xgrid[di:di + self.nrow,
+                                          dj:dj + self.ncol]
+                verts[:, :, n, 1] = ygrid[di:di + self.nrow,
+                                          dj:dj + self.ncol]
+            self._cell_vertices = verts
+        return self._cell_vertices
+
     def get_vertices(self, i, j):
         """Get vertices for a single cell or sequence if i, j locations."""
-        pts = []
-        xgrid, ygrid = self.xgrid, self.ygrid
-        pts.append([xgrid[i, j], ygrid[i, j]])
-        pts.append([xgrid[i + 1, j], ygrid[i + 1, j]])
-        pts.append([xgrid[i + 1, j + 1], ygrid[i + 1, j + 1]])
-        pts.append([xgrid[i, j + 1], ygrid[i, j + 1]])
-        pts.append([xgrid[i, j], ygrid[i, j]])
-        if np.isscalar(i):
-            return pts
-        else:
-            vrts = np.array(pts).transpose([2, 0, 1])
-            return [v.tolist() for v in vrts]
+        verts = self.cell_vertices[i, j]
+        # close the polygons
+        verts = np.concatenate((verts, verts[..., :1, :]), axis=-2)
+        return verts.tolist()
 
     def get_rc(self, x, y):
         return self.get_ij(x, y)
@@ -953,15 +963,26 @@ class SpatialReference(object):
         -------
         i : row or sequence of rows (zero-based)
         j : column or sequence of columns (zero-based)
+
+        Notes
+        -----
+        The points are transformed to model coordinates and located with
+        the cell edges, so rotated grids are supported.  Points outside of
+        the grid get the nearest row and column on the edge of the grid.
+        A point on the edge of two cells is in the cell with the lower row
+        or column.
         """
+        xa, ya = self.transform(np.asarray(x, dtype=float),
+                                np.asarray(y, dtype=float), inverse=True)
+        xedge, yedge = self.xedge, self.yedge
+        # find the column from the number of edges left of x and the
+        # row from the number of edges above y
+        c = np.searchsorted(xedge, xa, side='left') - 1
+        r = self.nrow - np.searchsorted(yedge[::-1], ya, side='right')
+        c = np.clip(c, 0, self.ncol - 1)
+        r = np.clip(r, 0, self.nrow - 1)
         if np.isscalar(x):
-            c = (np.abs(self.xcentergrid[0] - x)).argmin()
-            r = (np.abs(self.ycentergrid[:, 0] - y)).argmin()
-        else:
-            xcp = np.array([self.xcentergrid[0]] * (len(x)))
-            ycp = np.array([self.ycentergrid[:, 0]] * (len(x)))
-            c = (np.abs(xcp.transpose() - x)).argmin(axis=0)
-            r = (np.abs(ycp.transpose() - y)).argmin(axis=0)
+            return int(r), int(c)
         return r, c
 
     def get_grid_map_plotter(self, **kwargs):
@@ -1553,6 +1574,11 @@ class SpatialReferenceUnstructured(SpatialReference):
     ycenter : ndarray
         array of y cell centers
 
+    spatial_index : UniformGridIndex
+        spatial index of the cells for locating points in cells, finding
+        the nearest cells and the cells within a distance of points.  The
+        index is built when it is first used.
+
     Notes
     -----
 
@@ -1564,6 +1590,7 @@ class SpatialReferenceUnstructured(SpatialReference):
         warnings.warn("SpatialReferenceUnstructured has been deprecated. "
                       "Use VertexGrid instead.",
                       category=DeprecationWarning)
+        self._spatial_index = None
         self.xc = xc
         self.yc = yc
         self.verts = verts
@@ -1709,8 +1736,20 @@ class SpatialReferenceUnstructured(SpatialReference):
 
     def __setattr__(self, key, value):
         super(SpatialReference, self).__setattr__(key, value)
+        if key in ('xc', 'yc', 'verts', 'iverts'):
+            super(SpatialReference, self).__setattr__('_spatial_index', None)
         return
 
+    @property
+    def spatial_index(self):
+        if self._spatial_index is None:
+            verts = np.asarray(self.verts)
+            xvertices = [verts[iv, 0] for iv in self.iverts]
+            yvertices = [verts[iv, 1] for iv in self.iverts]
+            self._spatial_index = UniformGridIndex(
+                cell_vertex_array(xvertices, yvertices), self.xc, self.yc)
+        return self._spatial_index
+
     def get_extent(self):
         """
         Get the extent of the grid
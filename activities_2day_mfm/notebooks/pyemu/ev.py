@@ -32,6 +32,13 @@ class ErrVar(LinearAnalysis):
     kl : bool
         flag to perform KL scaling on the jacobian before error variance
         calculations
+    randomized_svd : bool
+        flag to only form the leading singular components of Q^(1/2)X
+        (with Matrix.truncated_svd()) as they are needed, rather than
+        the full SVD of XtQX.  Neither XtQX nor a dense identity is
+        formed, and the null-space projection I - V_1 * V_1^T is applied
+        to the prediction vectors directly.  Useful for problems with
+        many parameters.  Default is False
 
     Note
     ----
@@ -73,6 +80,10 @@ class ErrVar(LinearAnalysis):
             kl = bool(kwargs["kl"])
             kwargs.pop("kl")
 
+        self.randomized_svd = False
+        if "randomized_svd" in kwargs.keys():
+            self.randomized_svd = bool(kwargs["randomized_svd"])
+            kwargs.pop("randomized_svd")
 
         self.__qhalfx = None
         self.__R = None
@@ -340,11 +351,11 @@ class ErrVar(LinearAnalysis):
         if singular_value is None:
             singular_value = int(min(self.pst.nnz_obs, self.pst.npar_adj))
         #v1_df = self.qhalfx.v[:, :singular_value].to_dataframe() ** 2
-        xtqx = self.xtqx
+        xtqx = None
         if precondition:
-            xtqx = xtqx + self.parcov.inv
+            xtqx = self.xtqx + self.parcov.inv
         #v1_df = self.xtqx.v[:, :singular_value].to_dataframe() ** 2
-        v1_df = xtqx.v[:, :singular_value].to_dataframe() ** 2
+        v1_df = self.__v1(singular_value,xtqx).to_dataframe() ** 2
         v1_df["ident"] = v1_df.sum(axis=1)
         return v1_df
 
@@ -368,6 +379,19 @@ class ErrVar(LinearAnalysis):
         results.update(self.third_prediction(singular_value))
         return results
 
+    def __v1(self, singular_value, xtqx=None):
+        """private: get the leading right singular vectors of xtqx,
+        using the truncated SVD of qhalfx (which has the same right
+        singular vectors) if ErrVar.randomized_svd is True
+        """
+        if self.randomized_svd:
+            if xtqx is None:
+                return self.qhalfx.truncated_svd(maxsing=singular_value)[2]
+            return xtqx.truncated_svd(maxsing=singular_value)[2]
+        if xtqx is None:
+            xtqx = self.xtqx
+        return xtqx.v[:, :singular_value]
+
     def R(self, singular_value):
         """get resolution Matrix (V_1 * V_1^T) at a singular value
 
@@ -390,7 +414,7 @@ class ErrVar(LinearAnalysis):
         else:
             self.log("calc R @" + str(singular_value))
             #v1 = self.qhalfx.v[:, :singular_value]
-            v1 = self.xtqx.v[:, :singular_value]
+            v1 = self.__v1(singular_value)
             self.__R = v1 * v1.T
             self.__R_sv = singular_value
             self.log("calc R @" + str(singular_value))
@@ -416,9 +440,18 @@ class ErrVar(LinearAnalysis):
             if singular_value > self.jco.ncol:
                 return self.parcov.zero
             else:
-                #v2 = self.qhalfx.v[:, singular_value:]
-                v2 = self.xtqx.v[:, singular_value:]
-                self.__I_R = v2 * v2.T
+                if self.randomized_svd:
+                    # V_2 * V_2^T == I - V_1 * V_1^T since V is orthogonal,
+                    # so only V_1 is needed
+                    v1 = self.__v1(singular_value)
+                    x = -np.dot(v1.x, v1.x.T)
+                    x[np.diag_indices_from(x)] += 1.0
+                    self.__I_R = Matrix(x=x, row_names=v1.row_names,
+                                        col_names=v1.row_names)
+                else:
+                    #v2 = self.qhalfx.v[:, singular_value:]
+                    v2 = self.xtqx.v[:, singular_value:]
+                    self.__I_R = v2 * v2.T
                 self.__I_R_sv = singular_value
                 return self.__I_R
 
@@ -459,10 +492,19 @@ class ErrVar(LinearAnalysis):
             singular_value = min(self.pst.npar_adj, self.pst.nnz_obs)
         self.log("calc G @" + str(singular_value))
         #v1 = self.qhalfx.v[:, :singular_value]
-        v1 = self.xtqx.v[:, :singular_value]
+        v1 = self.__v1(singular_value)
         #s1 = ((self.qhalfx.s[:singular_value]) ** 2).inv
-        s1 = (self.xtqx.s[:singular_value]).inv
-        self.__G = v1 * s1 * v1.T * self.jco.T * self.obscov.inv
+        if self.randomized_svd:
+            # the singular values of xtqx are the squares of those of
+            # qhalfx.  Multiply from the right so no npar by npar matrix
+            # is formed
+            s1 = self.qhalfx.truncated_svd(maxsing=singular_value)[1]
+            v1s1 = Matrix(x=v1.x / s1.x.flatten() ** 2,
+                          row_names=v1.row_names, col_names=v1.col_names)
+            self.__G = v1s1 * (v1.T * (self.jco.T * self.obscov.inv))
+        else:
+            s1 = (self.xtqx.s[:singular_value]).inv
+            self.__G = v1 * s1 * v1.T * self.jco.T * self.obscov.inv
         self.__G_sv = singular_value
         self.__G.row_names = self.jco.col_names
         self.__G.col_names = self.jco.row_names
@@ -498,6 +540,20 @@ class ErrVar(LinearAnalysis):
                 zero_preds[("first", pred.col_names[0])] = 0.0
             return zero_preds
         self.log("calc first term parameter @" + str(singular_value))
+        if self.randomized_svd:
+            # apply I - R to each prediction as y - V_1 * (V_1^T * y)
+            v1 = None
+            if singular_value > 0:
+                v1 = self.__v1(singular_value)
+            results = {}
+            for prediction in self.predictions_iter:
+                w = prediction
+                if v1 is not None:
+                    w = prediction - v1 * (v1.T * prediction)
+                results[("first",prediction.col_names[0])] = \
+                    float((w.T * self.parcov * w).x)
+            self.log("calc first term parameter @" + str(singular_value))
+            return results
         first_term = self.I_minus_R(singular_value).T * self.parcov *\
                      self.I_minus_R(singular_value)
         if self.predictions:
@@ -565,6 +621,16 @@ class ErrVar(LinearAnalysis):
             for pred in self.predictions_iter:
                 inf_pred[("second",pred.col_names[0])] = 1.0E+35
             return inf_pred
+        elif self.randomized_svd:
+            # apply G^T to each prediction rather than forming the
+            # npar by npar G * obscov * G^T
+            results = {}
+            for prediction in self.predictions_iter:
+                w = self.G(singular_value).T * prediction
+                results[("second",prediction.col_names[0])] = \
+                    float((w.T * self.obscov * w).x)
+            self.log("calc second term prediction @" + str(singular_value))
+            return results
         else:
             second_term = self.G(singular_value) * self.obscov * \
                           self.G(singular_value).T
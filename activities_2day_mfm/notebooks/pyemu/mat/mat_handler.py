@@ -146,6 +146,106 @@ def get_common_elements(list1, list2):
     return result
 
 
+def _names_equal(list1, list2):
+    """check if two name lists are identical.  Shared (and differently
+    sized) name lists are resolved without comparing the elements
+
+    Parameters
+    ----------
+    list1 : list
+        a list of names
+    list2 : list
+        a list of names
+
+    Returns
+    -------
+    bool : bool
+        True if list1 and list2 hold the same names in the same order
+
+    """
+    if list1 is list2:
+        return True
+    if len(list1) != len(list2):
+        return False
+    return list1 == list2
+
+
+def randomized_svd(x, nsing, oversample=10, n_iter=4, seed=0):
+    """approximate the leading singular components of a 2D array using
+    the randomized range finder of Halko, Martinsson and Tropp (2011).
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        2D array to decompose
+    nsing : int
+        number of leading singular components to return
+    oversample : int
+        number of extra random directions used to capture the range of x.
+        Default is 10
+    n_iter : int
+        number of power iterations.  More iterations improve the accuracy
+        of slowly decaying spectra.  Default is 4
+    seed : int
+        seed for the random projection.  Default is 0
+
+    Returns
+    -------
+    u : numpy.ndarray
+        left singular vectors, shape (x.shape[0],nsing)
+    s : numpy.ndarray
+        singular values in decreasing order, shape (nsing,)
+    v : numpy.ndarray
+        right singular vectors, shape (x.shape[1],nsing)
+
+    Note
+    ----
+    if nsing + oversample reaches min(x.shape), the exact thin SVD
+    is used instead
+
+    """
+    return _randomized_svd(x, nsing, oversample, n_iter, seed)[:3]
+
+
+def _randomized_svd(x, nsing, oversample=10, n_iter=4, seed=0, q=None):
+    """private: randomized_svd() that also returns the orthonormal basis
+    of the range of x it used.  If a basis q from an earlier call is
+    passed, it is extended with new random directions rather than
+    being recomputed.  The basis is None if the exact SVD was used.
+    """
+    nrow, ncol = x.shape
+    mn = min(nrow, ncol)
+    nsing = max(0, min(int(nsing), mn))
+    nrand = nsing + int(oversample)
+    if nrand >= mn:
+        u, s, vt = la.svd(x, full_matrices=False)
+        return u[:, :nsing], s[:nsing], vt[:nsing, :].transpose(), None
+
+    def orth(y):
+        # orthonormalize y, and against q if it is being extended
+        if q is not None:
+            for _ in range(2):
+                y = y - q.dot(q.T.dot(y))
+        return la.qr(y, mode="economic")[0]
+
+    nold = 0 if q is None else q.shape[1]
+    if nrand > nold:
+        rng = np.random.RandomState(seed + nold)
+        y = orth(x.dot(rng.standard_normal((ncol, nrand - nold))))
+        # re-orthogonalize between the power iterations to keep the
+        # small singular directions from being swamped
+        for _ in range(int(n_iter)):
+            y, _ = la.qr(x.T.dot(y), mode="economic")
+            y = orth(x.dot(y))
+        if q is not None:
+            y = np.hstack((q, y))
+    else:
+        y = q
+    ub, s, vt = la.svd(y.T.dot(x), full_matrices=False)
+    u = y.dot(ub)
+    return u[:, :nsing], s[:nsing], vt[:nsing, :].transpose(), y
+
+
 class Matrix(object):
     """a class for easy linear algebra
 
@@ -206,13 +306,13 @@ class Matrix(object):
                  autoalign=True):
 
 
-        self.col_names, self.row_names = [], []
-        [self.col_names.append(str(c).lower()) for c in col_names]
-        [self.row_names.append(str(r).lower()) for r in row_names]
+        self.col_names = [str(c).lower() for c in col_names]
+        self.row_names = [str(r).lower() for r in row_names]
         self.__x = None
         self.__u = None
         self.__s = None
         self.__v = None
+        self.__tsvd = None
         if x is not None:
             assert x.ndim == 2
             #x = np.atleast_2d(x)
@@ -241,6 +341,71 @@ class Matrix(object):
         self.isdiagonal = bool(isdiagonal)
         self.autoalign = bool(autoalign)
 
+    @property
+    def row_names(self):
+        """the row names of self
+
+        Returns
+        -------
+        list : list
+
+        """
+        return self._row_names
+
+    @row_names.setter
+    def row_names(self, names):
+        self._row_names = names
+        self._row_index = None
+
+    @property
+    def col_names(self):
+        """the column names of self
+
+        Returns
+        -------
+        list : list
+
+        """
+        return self._col_names
+
+    @col_names.setter
+    def col_names(self, names):
+        self._col_names = names
+        self._col_index = None
+
+    def name_index(self, axis):
+        """get the cached name-to-position map for an axis.  The map
+        is built on first use and rebuilt whenever the names of that
+        axis are reset (or extended in place)
+
+        Parameters
+        ----------
+        axis : int
+            the axis of the map. must be 0 (rows) or 1 (columns)
+
+        Returns
+        -------
+        dict : dict
+            name-to-position map.  If a name is repeated, the last
+            position is used
+
+        """
+        if axis == 0:
+            names, index = self._row_names, self._row_index
+        elif axis == 1:
+            names, index = self._col_names, self._col_index
+        else:
+            raise Exception("Matrix.name_index(): " +
+                            "axis argument must 0 or 1, not:" + str(axis))
+        # the length check catches names appended in place
+        if index is None or index[0] != len(names):
+            index = (len(names), {name: i for i, name in enumerate(names)})
+            if axis == 0:
+                self._row_index = index
+            else:
+                self._col_index = index
+        return index[1]
+
     def reset_x(self,x,copy=True):
         """reset self.__x private attribute
 
@@ -374,8 +539,8 @@ class Matrix(object):
                                                   str(other.shape)
                 if self.isdiagonal:
                     elem_sub = -1.0 * other
-                    for j in range(self.shape[0]):
-                        elem_sub[j, j] += self.x[j]
+                    d = np.arange(self.shape[0])
+                    elem_sub[d, d] += self.x[:, 0]
                     return type(self)(x=elem_sub, row_names=self.row_names,
                                       col_names=self.col_names)
                 else:
@@ -412,14 +577,14 @@ class Matrix(object):
                                       col_names=first.col_names)
                 elif first.isdiagonal:
                     elem_sub = -1.0 * second.newx
-                    for j in range(first.shape[0]):
-                        elem_sub[j, j] += first.x[j, 0]
+                    d = np.arange(first.shape[0])
+                    elem_sub[d, d] += first.x[:, 0]
                     return type(self)(x=elem_sub, row_names=first.row_names,
                                       col_names=first.col_names)
                 elif second.isdiagonal:
                     elem_sub = first.newx
-                    for j in range(second.shape[0]):
-                        elem_sub[j, j] -= second.x[j, 0]
+                    d = np.arange(second.shape[0])
+                    elem_sub[d, d] -= second.x[:, 0]
                     return type(self)(x=elem_sub, row_names=first.row_names,
                                       col_names=first.col_names)
                 else:
@@ -487,14 +652,14 @@ class Matrix(object):
                                   col_names=first.col_names)
             elif first.isdiagonal:
                 ox = second.newx
-                for j in range(first.shape[0]):
-                    ox[j, j] += first.__x[j]
+                d = np.arange(first.shape[0])
+                ox[d, d] += first.__x[:, 0]
                 return type(self)(x=ox, row_names=first.row_names,
                                   col_names=first.col_names)
             elif second.isdiagonal:
-                x = first.x
-                for j in range(second.shape[0]):
-                    x[j, j] += second.x[j]
+                x = first.newx
+                d = np.arange(second.shape[0])
+                x[d, d] += second.x[:, 0]
                 return type(self)(x=x, row_names=first.row_names,
                                   col_names=first.col_names)
             else:
@@ -610,8 +775,7 @@ class Matrix(object):
                 "Matrix.__mul__(): matrices are not aligned: " +\
                 str(self.shape) + ' ' + str(other.shape)
             if self.isdiagonal:
-                return type(self)(x=np.dot(np.diag(self.__x.flatten()).transpose(),
-                                           other))
+                return type(self)(x=self.__x * other)
             else:
                 return type(self)(x=np.atleast_2d(np.dot(self.__x, other)))
         elif isinstance(other, Matrix):
@@ -623,13 +787,14 @@ class Matrix(object):
                                        "don't share any common elements.  first 10: " +\
                                        ','.join(self.col_names[:9]) + '...and..' +\
                                        ','.join(other.row_names[:9])
-                # these should be aligned
+                # these should be aligned - Covs are reindexed by a single
+                # name list so that diagonal Covs stay diagonal
                 if isinstance(self, Cov):
-                    first = self.get(row_names=common, col_names=common)
+                    first = self.get(row_names=common)
                 else:
                     first = self.get(row_names=self.row_names, col_names=common)
                 if isinstance(other, Cov):
-                    second = other.get(row_names=common, col_names=common)
+                    second = other.get(row_names=common)
                 else:
                     second = other.get(row_names=common,
                                        col_names=other.col_names)
@@ -648,15 +813,12 @@ class Matrix(object):
                 return elem_prod
             elif first.isdiagonal:
                 ox = second.newx
-                for j in range(first.shape[0]):
-                    ox[j, :] *= first.x[j]
+                ox *= first.x
                 return type(self)(x=ox, row_names=first.row_names,
                               col_names=second.col_names)
             elif second.isdiagonal:
                 x = first.newx
-                ox = second.x
-                for j in range(first.shape[1]):
-                    x[:, j] *= ox[j]
+                x *= second.x.transpose()
                 return type(self)(x=x, row_names=first.row_names,
                               col_names=second.col_names)
             else:
@@ -705,13 +867,14 @@ class Matrix(object):
                 assert len(common) > 0,"Matrix.__rmul__():self.col_names " +\
                                        "and other.row_names" +\
                                        "don't share any common elements"
-                # these should be aligned
+                # these should be aligned - Covs are reindexed by a single
+                # name list so that diagonal Covs stay diagonal
                 if isinstance(self, Cov):
-                    first = self.get(row_names=common, col_names=common)
+                    first = self.get(row_names=common)
                 else:
                     first = self.get(col_names=self.row_names, row_names=common)
                 if isinstance(other, Cov):
-                    second = other.get(row_names=common, col_names=common)
+                    second = other.get(row_names=common)
                 else:
                     second = other.get(col_names=common,
                                        row_names=other.col_names)
@@ -730,15 +893,12 @@ class Matrix(object):
                 return elem_prod
             elif first.isdiagonal:
                 ox = second.newx
-                for j in range(first.shape[0]):
-                    ox[j, :] *= first.x[j]
+                ox *= first.x
                 return type(self)(x=ox, row_names=first.row_names,
                               col_names=second.col_names)
             elif second.isdiagonal:
                 x = first.newx
-                ox = second.x
-                for j in range(first.shape[1]):
-                    x[:, j] *= ox[j]
+                x *= second.x.transpose()
                 return type(self)(x=x, row_names=first.row_names,
                               col_names=second.col_names)
             else:
@@ -805,10 +965,7 @@ class Matrix(object):
         assert isinstance(other, Matrix), \
             "Matrix.isaligned(): other argumnent must be type Matrix, not: " +\
             str(type(other))
-        if self.col_names == other.row_names:
-            return True
-        else:
-            return False
+        return _names_equal(self.col_names, other.row_names)
 
 
     def element_isaligned(self, other):
@@ -826,11 +983,8 @@ class Matrix(object):
         assert isinstance(other, Matrix), \
             "Matrix.isaligned(): other argument must be type Matrix, not: " +\
             str(type(other))
-        if self.row_names == other.row_names \
-                and self.col_names == other.col_names:
-            return True
-        else:
-            return False
+        return _names_equal(self.row_names, other.row_names) \
+            and _names_equal(self.col_names, other.col_names)
 
 
     @property
@@ -970,7 +1124,106 @@ class Matrix(object):
                               col_names=self.col_names,
                               autoalign=self.autoalign)
 
-    def get_maxsing(self,eigthresh=1.0e-5):
+    def truncated_svd(self,maxsing=None,eigthresh=1.0e-5,oversample=10,
+                      n_iter=4):
+        """ Get the leading SVD components of self without forming the
+        full SVD.  The components are found with a randomized SVD and
+        cached on self - later requests for the same or fewer components
+        reuse them.  If the full SVD of self has already been formed,
+        it is sliced instead.
+
+        Parameters
+        ----------
+        maxsing : int
+            the number of singular components to get.  If None, enough
+            components are found to reach eigthresh
+        eigthresh : float
+            the ratio of the largest to smallest singular value used to size
+            the decomposition.  Ignored if maxsing is not None
+        oversample : int
+            number of extra random directions.  Default is 10
+        n_iter : int
+            number of power iterations.  Default is 4
+
+        Returns
+        -------
+        u : Matrix
+            leading left singular vectors
+        s : Matrix
+            leading singular values (diagonal)
+        v : Matrix
+            leading right singular vectors
+
+        Note
+        ----
+        the accuracy of the trailing returned components depends on how
+        quickly the singular spectrum decays - increase n_iter for flat
+        spectra
+
+        """
+        mn = min(self.shape)
+        if self.__s is not None:
+            if maxsing is None:
+                maxsing = self.get_maxsing(eigthresh=eigthresh)
+            maxsing = min(int(maxsing),mn)
+            return self.u[:,:maxsing],self.s[:maxsing],self.v[:,:maxsing]
+
+        if self.isdiagonal:
+            x = np.diag(self.x.flatten())
+        else:
+            x = self.x
+
+        def covered(tsvd):
+            # does the cached decomposition reach what is being asked for?
+            if tsvd is None:
+                return False
+            ts = tsvd[1]
+            if maxsing is not None:
+                return ts.shape[0] >= min(int(maxsing),mn)
+            if ts.shape[0] >= mn:
+                return True
+            return ts.shape[0] > 0 and ts[-1] / ts[0] <= eigthresh
+
+        if not covered(self.__tsvd):
+            if maxsing is not None:
+                nsing = min(int(maxsing),mn)
+            else:
+                nsing = min(mn,10)
+            # grow geometrically so stepping through singular values
+            # doesn't redo the decomposition every time
+            if self.__tsvd is not None:
+                nsing = max(nsing,min(mn,2 * self.__tsvd[1].shape[0]))
+            # extend the range basis of the cached decomposition rather
+            # than sketching x again from scratch
+            q = None
+            if self.__tsvd is not None:
+                q = self.__tsvd[3]
+            while True:
+                self.__tsvd = _randomized_svd(x,nsing,oversample=oversample,
+                                              n_iter=n_iter,q=q)
+                q = self.__tsvd[3]
+                if covered(self.__tsvd) or nsing >= mn or q is None:
+                    break
+                nsing = min(mn,2 * nsing)
+
+        u,ts,v = self.__tsvd[:3]
+        if maxsing is None:
+            nsing = ts.shape[0]
+        else:
+            nsing = min(int(maxsing),ts.shape[0])
+        u_names = ["left_sing_vec_" + str(i + 1) for i in range(nsing)]
+        sing_names = ["sing_val_" + str(i + 1) for i in range(nsing)]
+        v_names = ["right_sing_vec_" + str(i + 1) for i in range(nsing)]
+        u = Matrix(x=u[:,:nsing],row_names=self.row_names,col_names=u_names,
+                   autoalign=False)
+        s = Matrix(x=np.atleast_2d(ts[:nsing]).transpose(),
+                   row_names=sing_names,col_names=sing_names,isdiagonal=True,
+                   autoalign=False)
+        v = Matrix(x=v[:,:nsing],row_names=self.col_names,col_names=v_names,
+                   autoalign=False)
+        return u,s,v
+
+    def get_maxsing(self,eigthresh=1.0e-5,randomized=False):
         """ Get the number of singular components with a singular
         value ratio greater than or equal to eigthresh
 
@@ -978,6 +1231,10 @@ class Matrix(object):
         ----------
         eigthresh : float
             the ratio of the largest to smallest singular value
+        randomized : bool
+            flag to use the leading singular values from
+            Matrix.truncated_svd() rather than the full SVD.
+            Default is False
 
         Returns
         -------
@@ -986,7 +1243,11 @@ class Matrix(object):
 
         """
         #sthresh =np.abs((self.s.x / self.s.x[0]) - eigthresh)
-        sthresh = self.s.x.flatten()/self.s.x[0]
+        if randomized:
+            s = self.truncated_svd(eigthresh=eigthresh)[1]
+        else:
+            s = self.s
+        sthresh = s.x.flatten()/s.x[0]
         ising = 0
         for i,st in enumerate(sthresh):
             if st > eigthresh:
@@ -997,7 +1258,8 @@ class Matrix(object):
         #return max(1,np.argmin(sthresh))
         return max(1,ising)
 
-    def pseudo_inv_components(self,maxsing=None,eigthresh=1.0e-5,truncate=True):
+    def pseudo_inv_components(self,maxsing=None,eigthresh=1.0e-5,truncate=True,
+                              randomized=False):
         """ Get the (optionally) truncated SVD components
 
         Parameters
@@ -1011,6 +1273,10 @@ class Matrix(object):
         truncate : bool
             flag to truncate components. If False, U, s, and V will be zeroed out instead of truncated.
             Default is True
+        randomized : bool
+            flag to only form the leading maxsing components with
+            Matrix.truncated_svd() instead of the full SVD.  Useful for
+            large matrices.  Default is False
 
         Returns
         -------
@@ -1024,9 +1290,38 @@ class Matrix(object):
         """
 
         if maxsing is None:
-            maxsing = self.get_maxsing(eigthresh=eigthresh)
+            maxsing = self.get_maxsing(eigthresh=eigthresh,
+                                       randomized=randomized)
         else:
-             maxsing = min(self.get_maxsing(eigthresh=eigthresh),maxsing)
+             maxsing = min(self.get_maxsing(eigthresh=eigthresh,
+                                            randomized=randomized),maxsing)
+
+        if randomized:
+            tu,ts,tv = self.truncated_svd(maxsing=maxsing)
+            if truncate:
+                x = np.zeros((maxsing,maxsing))
+                x[np.arange(maxsing),np.arange(maxsing)] = ts.x[:,0]
+                s = Matrix(x=x,row_names=self.row_names[:maxsing],
+                           col_names=self.col_names[:maxsing],
+                           autoalign=False)
+                return tu,s,tv
+            # pad the leading components with zeros to the full shapes
+            nrow,ncol = self.shape
+            x = np.zeros((nrow,ncol))
+            x[np.arange(maxsing),np.arange(maxsing)] = ts.x[:,0]
+            s = Matrix(x=x,row_names=self.row_names,col_names=self.col_names,
+                       autoalign=False)
+            x = np.zeros((nrow,nrow))
+            x[:,:maxsing] = tu.x
+            u = Matrix(x=x,row_names=self.row_names,
+                       col_names=["left_sing_vec_" + str(i + 1)
+                                  for i in range(nrow)],autoalign=False)
+            x = np.zeros((ncol,ncol))
+            x[:,:maxsing] = tv.x
+            v = Matrix(x=x,row_names=self.col_names,
+                       col_names=["right_sing_vec_" + str(i + 1)
+                                  for i in range(ncol)],autoalign=False)
+            return u,s,v
 
         s = self.full_s.copy()
         v = self.v.copy()
@@ -1173,33 +1468,50 @@ class Matrix(object):
     def find_rowcol_indices(names,row_names,col_names,axis=None):
         self_row_idxs = {row_names[i]: i for i in range(len(row_names))}
         self_col_idxs = {col_names[i]: i for i in range(len(col_names))}
+        return Matrix._lookup_indices(names,self_row_idxs,self_col_idxs,
+                                      axis=axis)
 
-        scol = set(col_names)
-        srow = set(row_names)
-        row_idxs = []
-        col_idxs = []
-        for name in names:
-            name = name.lower()
-            if name not in scol \
-                    and name not in srow:
-                raise Exception('Matrix.indices(): name not found: ' + name)
-            if name in scol:
-                col_idxs.append(self_col_idxs[name])
-            if name.lower() in srow:
-                row_idxs.append(self_row_idxs[name])
-        if axis is None:
-            return np.array(row_idxs, dtype=np.int32), \
-                   np.array(col_idxs, dtype=np.int32)
-        elif axis == 0:
-            if len(row_idxs) != len(names):
+    @staticmethod
+    def _lookup_indices(names,row_index,col_index,axis=None):
+        """private method to look up the positions of names in
+        name-to-position maps.  Only the map(s) for the requested
+        axis are searched
+
+        """
+        names = [str(name).lower() for name in names]
+        if axis == 0:
+            idxs = [row_index.get(name) for name in names]
+            if None in idxs:
+                for name,idx in zip(names,idxs):
+                    if idx is None and name not in col_index:
+                        raise Exception('Matrix.indices(): name not found: ' +
+                                        name)
                 raise Exception("Matrix.indices(): " +
                                 "not all names found in row_names")
-            return np.array(row_idxs, dtype=np.int32)
+            return np.array(idxs, dtype=np.int32)
         elif axis == 1:
-            if len(col_idxs) != len(names):
+            idxs = [col_index.get(name) for name in names]
+            if None in idxs:
+                for name,idx in zip(names,idxs):
+                    if idx is None and name not in row_index:
+                        raise Exception('Matrix.indices(): name not found: ' +
+                                        name)
                 raise Exception("Matrix.indices(): " +
                                 "not all names found in col_names")
-            return np.array(col_idxs, dtype=np.int32)
+            return np.array(idxs, dtype=np.int32)
+        elif axis is None:
+            row_idxs = []
+            col_idxs = []
+            for name in names:
+                if name not in col_index \
+                        and name not in row_index:
+                    raise Exception('Matrix.indices(): name not found: ' + name)
+                if name in col_index:
+                    col_idxs.append(col_index[name])
+                if name in row_index:
+                    row_idxs.append(row_index[name])
+            return np.array(row_idxs, dtype=np.int32), \
+                   np.array(col_idxs, dtype=np.int32)
         else:
             raise Exception("Matrix.indices(): " +
                             "axis argument must 0 or 1, not:" + str(axis))
@@ -1220,9 +1532,29 @@ class Matrix(object):
         numpy.ndarray : numpy.ndarray
             indices of names.
 
+        Note
+        ----
+        uses the cached name-to-position maps of self (see
+        Matrix.name_index()), so repeated lookups do not rebuild them
+
         """
-        return Matrix.find_rowcol_indices(names,self.row_names,self.col_names,axis=axis)
+        if axis not in [None,0,1]:
+            raise Exception("Matrix.indices(): " +
+                            "axis argument must 0 or 1, not:" + str(axis))
+        row_index = self.name_index(0)
+        col_index = self.name_index(1)
+        return Matrix._lookup_indices(names,row_index,col_index,axis=axis)
 
+    def _axis_take(self, names, axis):
+        """private method to get the positions needed to reorder an axis
+        by names.  Returns None if names already match that axis so the
+        reindexing can be skipped
+
+        """
+        own = self.row_names if axis == 0 else self.col_names
+        if _names_equal(names, own):
+            return None
+        return self.indices(names, axis=axis)
 
 
 
@@ -1284,17 +1616,15 @@ class Matrix(object):
         """
         if not isinstance(names, list):
             names = [names]
-        row_idxs, col_idxs = self.indices(names)
         if self.isdiagonal or isinstance(self, Cov):
+            row_idxs, col_idxs = self.indices(names)
             assert row_idxs.shape == col_idxs.shape
             assert row_idxs.shape[0] == self.shape[0]
             if self.isdiagonal:
                 self.__x = self.__x[row_idxs]
             else:
-                self.__x = self.__x[row_idxs, :]
-                self.__x = self.__x[:, col_idxs]
-            row_names = []
-            [row_names.append(self.row_names[i]) for i in row_idxs]
+                self.__x = self.__x[np.ix_(row_idxs, col_idxs)]
+            row_names = [self.row_names[i] for i in row_idxs]
             self.row_names, self.col_names = row_names, row_names
 
         else:
@@ -1302,19 +1632,17 @@ class Matrix(object):
                 raise Exception("Matrix.align(): must specify axis in " +
                                 "align call for non-diagonal instances")
             if axis == 0:
+                row_idxs = self.indices(names)[0]
                 assert row_idxs.shape[0] == self.shape[0], \
                     "Matrix.align(): not all names found in self.row_names"
-                self.__x = self.__x[row_idxs, :]
-                row_names = []
-                [row_names.append(self.row_names[i]) for i in row_idxs]
-                self.row_names = row_names
+                self.__x = np.take(self.__x, row_idxs, axis=0)
+                self.row_names = [self.row_names[i] for i in row_idxs]
             elif axis == 1:
+                col_idxs = self.indices(names)[1]
                 assert col_idxs.shape[0] == self.shape[1], \
                     "Matrix.align(): not all names found in self.col_names"
-                self.__x = self.__x[:, col_idxs]
-                col_names = []
-                [col_names.append(self.col_names[i]) for i in row_idxs]
-                self.col_names = col_names
+                self.__x = np.take(self.__x, col_idxs, axis=1)
+                self.col_names = [self.col_names[i] for i in col_idxs]
             else:
                 raise Exception("Matrix.align(): axis argument to align()" +
                                 " must be either 0 or 1")
@@ -1357,29 +1685,48 @@ class Matrix(object):
             if self.isdiagonal:
                 extract = self.__x[idxs].copy()
             else:
-                extract = self.__x[idxs, :].copy()
-                extract = extract[:, idxs]
+                extract = self.__x[np.ix_(idxs, idxs)]
             if drop:
                 self.drop(names, 0)
             return Cov(x=extract, names=names, isdiagonal=self.isdiagonal)
+
+        # positions along each axis - None means keep that axis as is
+        row_idxs, col_idxs = None, None
+        if row_names is not None:
+            row_idxs = self._axis_take(row_names, 0)
+        if col_names is not None:
+            col_idxs = self._axis_take(col_names, 1)
+
         if self.isdiagonal:
-            extract = np.diag(self.__x[:, 0])
+            # only fill the diagonal entries that survive the reindexing
+            # instead of expanding self to a dense 2D array first
+            n = self.shape[0]
+            ridxs = np.arange(n) if row_idxs is None else row_idxs
+            cidxs = np.arange(n) if col_idxs is None else col_idxs
+            extract = np.zeros((ridxs.shape[0], cidxs.shape[0]),
+                               dtype=self.__x.dtype)
+            ii, jj = np.nonzero(ridxs[:, None] == cidxs[None, :])
+            extract[ii, jj] = self.__x[ridxs[ii], 0]
+        elif row_idxs is not None and col_idxs is not None:
+            extract = self.__x[np.ix_(row_idxs, col_idxs)]
+        elif row_idxs is not None:
+            extract = np.take(self.__x, row_idxs, axis=0)
+        elif col_idxs is not None:
+            extract = np.take(self.__x, col_idxs, axis=1)
         else:
             extract = self.__x.copy()
+        extract = np.atleast_2d(extract)
+
         if row_names is not None:
-            row_idxs = self.indices(row_names, axis=0)
-            extract = np.atleast_2d(extract[row_idxs, :].copy())
             if drop:
                 self.drop(row_names, axis=0)
         else:
             row_names = self.row_names
         if col_names is not None:
-            col_idxs = self.indices(col_names, axis=1)
-            extract = np.atleast_2d(extract[:, col_idxs].copy())
             if drop:
                 self.drop(col_names, axis=1)
         else:
-            col_names = copy.deepcopy(self.col_names)
+            col_names = self.col_names
 
         return type(self)(x=extract, row_names=row_names, col_names=col_names)
 
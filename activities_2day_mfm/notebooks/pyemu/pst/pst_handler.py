@@ -2240,6 +2240,18 @@ class Pst(object):
         """
         pst_utils.write_input_files(self)
 
+    def read_output_files(self):
+        """reads model output files using instruction files.
+        just syntatic sugar for pst_utils.read_output_files()
+
+        Returns
+        -------
+        obs_vals : numpy.ndarray
+            simulated values in Pst.observation_data order
+
+        """
+        return pst_utils.read_output_files(self)
+
     def get_res_stats(self,nonzero=True):
         """ get some common residual stats from the current obsvals,
         weights and grouping in self.observation_data and the modelled values in
@@ -315,8 +315,86 @@ def write_to_template(parvals,tpl_file,in_file):
     in_file : str
         input file
 
+    Note
+    ----
+    the template file is parsed once by compile_template() and the
+    resulting plan is reused for later calls
+
+    """
+    chunks,par_names,fmts = compile_template(tpl_file)
+    if isinstance(parvals,pd.Series):
+        vals = parvals.loc[par_names].values
+    else:
+        vals = [parvals[name] for name in par_names]
+    items = [chunks[0]]
+    for fmt,val,chunk in zip(fmts,vals,chunks[1:]):
+        items.append(fmt % val)
+        items.append(chunk)
+    with open(in_file,'w') as f_in:
+        f_in.write(''.join(items))
+
+
+def write_to_template_ensemble(parvals,tpl_file,in_files):
+    """ write several sets of parameter values to model input files
+    using a single template file.  Values are formatted with numpy, one
+    format (field width) at a time, across all parameter sets.
+
+    Parameters
+    ----------
+    parvals : pandas.DataFrame
+        parameter sets (rows) of parameter values (columns named
+        by parameter names), such as a pyemu.ParameterEnsemble
+    tpl_file : str
+        template file
+    in_files : list
+        input file to write for each row in parvals
+
+    """
+    assert len(in_files) == parvals.shape[0],\
+        "write_to_template_ensemble() error: need one in_file per parameter set"
+    chunks,par_names,fmts = compile_template(tpl_file)
+    nsets = parvals.shape[0]
+    vals = parvals.loc[:,par_names].values.astype(np.float64)
+    items = np.empty((nsets,(2 * len(par_names)) + 1),dtype=object)
+    items[:,0::2] = np.array(chunks,dtype=object)
+    fmts = np.array(fmts)
+    for fmt in np.unique(fmts):
+        idx = np.where(fmts == fmt)[0]
+        items[:,(2 * idx) + 1] = np.char.mod(fmt,vals[:,idx])
+    for row,in_file in zip(items,in_files):
+        with open(in_file,'w') as f_in:
+            f_in.write(''.join(row))
+
+
+_tpl_cache = {}
+
+
+def compile_template(tpl_file):
+    """ parse a template file into a "plan" that can be used to write
+    input files quickly.  Plans are cached on the template file name,
+    modification time and size.  Used by write_to_template()
+
+    Parameters
+    ----------
+    tpl_file : str
+        template file
+
+    Returns
+    -------
+    chunks : list
+        the literal text between parameter fields (len(par_names) + 1 entries)
+    par_names : list
+        the parameter name for each parameter field
+    fmts : list
+        the printf-style format for each parameter field
+
     """
-    f_in = open(in_file,'w')
+    fstat = os.stat(tpl_file)
+    key = os.path.abspath(tpl_file)
+    sig = (fstat.st_mtime,fstat.st_size)
+    if key in _tpl_cache and _tpl_cache[key][0] == sig:
+        return _tpl_cache[key][1]
+
     f_tpl = open(tpl_file,'r')
     header = f_tpl.readline().strip().split()
     assert header[0].lower() in ["ptf", "jtf"], \
@@ -330,33 +408,37 @@ def write_to_template(parvals,tpl_file,in_file):
     assert len(marker) == 1, \
         "template file error: marker must be a single character, not:" + \
         str(marker)
+    chunks,par_names,fmts = [],[],[]
+    literal = []
     for line in f_tpl:
         if marker not in line:
-            f_in.write(line)
-        else:
-            line = line.rstrip()
-            par_names = line.lower().split(marker)[1::2]
-            par_names = [name.strip() for name in par_names]
-            start,end = get_marker_indices(marker,line)
-            assert len(par_names) == len(start)
-            new_line = line[:start[0]]
-            between = [line[e:s] for s,e in zip(start[1:],end[:-1])]
-            for i,name in enumerate(par_names):
-                s,e = start[i],end[i]
-                w = e - s
-                if w > 15:
-                    d = 6
-                else:
-                    d = 3
-                fmt = "{0:" + str(w)+"."+str(d)+"E}"
-                val_str = fmt.format(parvals[name])
-                new_line += val_str
-                if i != len(par_names) - 1:
-                    new_line += between[i]
-            new_line += line[end[-1]:]
-            f_in.write(new_line+'\n')
+            literal.append(line)
+            continue
+        line = line.rstrip()
+        names = line.lower().split(marker)[1::2]
+        names = [name.strip() for name in names]
+        start,end = get_marker_indices(marker,line)
+        assert len(names) == len(start)
+        literal.append(line[:start[0]])
+        for i,name in enumerate(names):
+            chunks.append(''.join(literal))
+            s,e = start[i],end[i]
+            w = e - s
+            if w > 15:
+                d = 6
+            else:
+                d = 3
+            par_names.append(name)
+            fmts.append("%" + str(w) + "." + str(d) + "E")
+            if i != len(names) - 1:
+                literal = [line[e:start[i+1]]]
+        literal = [line[end[-1]:] + '\n']
+    chunks.append(''.join(literal))
     f_tpl.close()
-    f_in.close()
+
+    result = (chunks,par_names,fmts)
+    _tpl_cache[key] = (sig,result)
+    return result
 
 
 def get_marker_indices(marker,line):
@@ -460,6 +542,264 @@ def parse_ins_string(string):
     return obs_names
 
 
+_ins_cache = {}
+
+
+def compile_ins_file(ins_file):
+    """ parse a pest instruction file into a list of instructions that can
+    be executed by process_ins_file().  The compiled instructions are cached
+    on the instruction file name, modification time and size.
+
+    Parameters
+    ----------
+    ins_file : str
+        instruction file name
+
+    Returns
+    -------
+    ins_lines : list
+        a list (one entry per instruction line) of lists of
+        (instruction type, argument) tuples
+    obs_names : list
+        observation names in instruction file order (excluding "dum")
+
+    Note
+    ----
+    supported instructions are line advance ("l"), primary and secondary
+    markers, whitespace ("w"), tab ("t"), whitespace-delimited ("!obs!"),
+    fixed ("[obs]a:b") and semi-fixed ("(obs)a:b") observations,
+    "dum" observations and "&" line continuation.
+
+    """
+    fstat = os.stat(ins_file)
+    key = os.path.abspath(ins_file)
+    sig = (fstat.st_mtime,fstat.st_size)
+    if key in _ins_cache and _ins_cache[key][0] == sig:
+        return _ins_cache[key][1]
+
+    with open(ins_file,'r') as f:
+        header = f.readline().strip().split()
+        assert header[0].lower() in ["pif","jif"],\
+            "instruction file error: must start with [pif,jif], not:" +\
+            str(header[0])
+        marker = header[1]
+        assert len(marker) == 1,\
+            "instruction file error: marker must be a single character, not:" +\
+            str(marker)
+        lines = []
+        for line in f:
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            if line.startswith('&') and len(lines) > 0:
+                lines[-1] += ' ' + line[1:]
+            else:
+                lines.append(line)
+
+    ins_lines,obs_names = [],[]
+    for line in lines:
+        try:
+            ins_line = _parse_ins_line(line,marker)
+        except Exception as e:
+            raise Exception("error parsing instruction file {0} line '{1}': {2}".\
+                            format(ins_file,line,str(e)))
+        for ityp,arg in ins_line:
+            if ityp in ["obs","fixed","semi"] and arg[0] != "dum":
+                obs_names.append(arg[0])
+        ins_lines.append(ins_line)
+
+    result = (ins_lines,obs_names)
+    _ins_cache[key] = (sig,result)
+    return result
+
+
+def _parse_ins_line(line,marker):
+    """ private method to split an instruction line into
+    (instruction type, argument) tuples.  Used by compile_ins_file()
+
+    """
+    ins_line = []
+    end_markers = {'[':']','(':')','!':'!'}
+    idx = 0
+    while idx < len(line):
+        char = line[idx]
+        if char.isspace():
+            idx += 1
+        elif char == marker:
+            eidx = line.index(marker,idx+1)
+            mtext = line[idx+1:eidx]
+            # a marker preceded by nothing but line advances is primary
+            if all(ityp == "l" for ityp,_ in ins_line):
+                ins_line.append(("primary",mtext))
+            else:
+                ins_line.append(("secondary",mtext))
+            idx = eidx + 1
+        elif char in end_markers:
+            eidx = line.index(end_markers[char],idx+1)
+            obs_name = line[idx+1:eidx].strip().lower()
+            idx = eidx + 1
+            if char == '!':
+                ins_line.append(("obs",(obs_name,)))
+                continue
+            # fixed and semi-fixed obs are followed by a column range
+            cidx = idx
+            while cidx < len(line) and not line[cidx].isspace():
+                cidx += 1
+            cstart,cend = [int(i) for i in line[idx:cidx].split(':')]
+            idx = cidx
+            if char == '[':
+                ins_line.append(("fixed",(obs_name,cstart-1,cend)))
+            else:
+                ins_line.append(("semi",(obs_name,cstart-1,cend)))
+        else:
+            eidx = idx
+            while eidx < len(line) and not line[eidx].isspace():
+                eidx += 1
+            item = line[idx:eidx].lower()
+            idx = eidx
+            if item[0] == 'l':
+                ins_line.append(("l",int(item[1:])))
+            elif item == 'w':
+                ins_line.append(("w",None))
+            elif item[0] == 't':
+                ins_line.append(("t",int(item[1:])-1))
+            else:
+                raise Exception("unrecognized instruction: {0}".format(item))
+    return ins_line
+
+
+def process_ins_file(ins_file,out_file=None):
+    """ read the observation values from a model output file using a
+    compiled instruction file.  This is a pure python replacement for
+    INSCHEK that runs in a single pass over the output file.
+
+    Parameters
+    ----------
+    ins_file : str
+        instruction file name
+    out_file : str
+        model output file name.  If None, ins_file with ".ins"
+        removed is used.  Default is None
+
+    Returns
+    -------
+    obs_names : list
+        observation names in instruction file order
+    obs_vals : numpy.ndarray
+        observation values in instruction file order
+
+    """
+    if out_file is None:
+        out_file = ins_file.replace(".ins","")
+    ins_lines,obs_names = compile_ins_file(ins_file)
+    with open(out_file,'r') as f:
+        out_lines = f.read().splitlines()
+    obs_vals = np.zeros(len(obs_names)) + np.NaN
+
+    iline,icol,iobs = -1,0,0
+    line = ''
+    for ins_line in ins_lines:
+        advanced = False
+        for ityp,arg in ins_line:
+            if ityp == "l":
+                advanced = True
+                iline += arg
+                icol = 0
+                if iline >= len(out_lines):
+                    raise Exception("unexpected end of output file {0} ".format(out_file) +\
+                                    "while processing instruction file {0}".format(ins_file))
+                line = out_lines[iline]
+            elif ityp == "primary":
+                # after a line advance the search starts on the line
+                # advanced to, otherwise on the next line
+                if advanced:
+                    iline -= 1
+                while True:
+                    iline += 1
+                    if iline >= len(out_lines):
+                        raise Exception("primary marker '{0}' not found in output file {1}".\
+                                        format(arg,out_file))
+                    line = out_lines[iline]
+                    mi = line.find(arg)
+                    if mi >= 0:
+                        break
+                icol = mi + len(arg)
+            elif ityp == "secondary":
+                mi = line.find(arg,icol)
+                if mi < 0:
+                    raise Exception("secondary marker '{0}' not found on output file {1} line {2}".\
+                                    format(arg,out_file,iline+1))
+                icol = mi + len(arg)
+            elif ityp == "w":
+                while icol < len(line) and not line[icol].isspace():
+                    icol += 1
+                while icol < len(line) and line[icol].isspace():
+                    icol += 1
+                if icol >= len(line):
+                    raise Exception("'w' instruction ran off the end of output file {0} line {1}".\
+                                    format(out_file,iline+1))
+            elif ityp == "t":
+                icol = arg
+            else:
+                name = arg[0]
+                if ityp == "obs":
+                    start = icol
+                    while start < len(line) and line[start].isspace():
+                        start += 1
+                    end = start
+                elif ityp == "fixed":
+                    start,end = arg[1],arg[2]
+                else:
+                    start = arg[1]
+                    while start < arg[2] and start < len(line) and line[start].isspace():
+                        start += 1
+                    while start > 0 and not line[start-1].isspace():
+                        start -= 1
+                    end = start
+                if ityp != "fixed":
+                    while end < len(line) and not line[end].isspace():
+                        end += 1
+                val_str = line[start:end]
+                icol = end
+                if name == "dum":
+                    continue
+                try:
+                    obs_vals[iobs] = float(val_str.lower().replace('d','e'))
+                except Exception as e:
+                    raise Exception("error reading obs {0} from output file {1} line {2}, string '{3}': {4}".\
+                                    format(name,out_file,iline+1,val_str,str(e)))
+                iobs += 1
+    return obs_names,obs_vals
+
+
+def read_output_files(pst,cwd='.'):
+    """ read the model output files of a pyemu.Pst using compiled
+    instruction files (see process_ins_file()).
+
+    Parameters
+    ----------
+    pst : (pyemu.Pst)
+        a Pst instance
+    cwd : (str)
+        the directory that the instruction and output file
+        names are relative to.  Default is '.'
+
+    Returns
+    -------
+    obs_vals : numpy.ndarray
+        the simulated values in Pst.observation_data order.  Observations
+        not found in any instruction file are assigned np.NaN
+
+    """
+    obs_idx = {name:i for i,name in enumerate(pst.observation_data.obsnme)}
+    obs_vals = np.zeros(len(obs_idx)) + np.NaN
+    for ins_file,out_file in zip(pst.instruction_files,pst.output_files):
+        names,vals = process_ins_file(os.path.join(cwd,ins_file),
+                                      os.path.join(cwd,out_file))
+        obs_vals[[obs_idx[name] for name in names]] = vals
+    return obs_vals
+
+
 def populate_dataframe(index,columns, default_dict, dtype):
     """ helper function to populate a generic Pst dataframe attribute.  This
     function is called as part of constructing a generic Pst instance
@@ -604,52 +944,8 @@ def try_process_ins_file(ins_file,out_file=None):
         print("out file {0} not found".format(out_file))
         return pd.DataFrame({"obsnme":obs_names},index="obsnme")
     try:
-        f_ins = open(ins_file,'r')
-        f_out = open(out_file,'r')
-
-        header = f_ins.readline().lower().strip().split()
-        assert header[0] == "pif"
-        marker = header[1]
-        icount,ocount = 1,0
-        obsnme,obsval = [],[]
-        for iline in f_ins:
-            iraw = iline.lower().strip().split()
-            if iraw[0][0] != 'l':
-                raise Exception("not support instruction:{0}".format(iraw[0]))
-            num_lines = int(iraw[0][1:])
-            for i in range(num_lines):
-                oline = f_out.readline().lower().strip()
-                ocount += 1
-            if '(' in oline:
-                raise Exception("semi-fixed obs index instructions not supported")
-            elif '[' in oline:
-                raise Exception("fixed obs index instructions not supported")
-            elif marker in oline:
-                raise Exception("marker-based file seeking not supported")
-            oraw = oline.strip().split()
-            if oline[0] in [' ','   ']:
-                oraw.insert(0,'')
-            oc = 0
-            for ir in iraw[1:]:
-                if ir == 'w':
-                    oc += 1
-                    if oc > len(oraw):
-                        raise Exception("out file line {0} too short".format(ocount))
-                elif '!' in ir:
-                    n = ir.replace('!','')
-                    try:
-                        v = float(oraw[oc])
-                    except Exception as e:
-                        raise Exception("error processing ins {0} for obs {1}, string: {2} on line {3} (ins line {4}):{5}".
-                                        format(ir,n,oline,ocount,icount,str(e)))
-                    obsnme.append(n)
-                    obsval.append(v)
-                    oc += 1
-
-        f_ins.close()
-        f_out.close()
+        obsnme,obsval = process_ins_file(ins_file,out_file)
         df = pd.DataFrame({"obsnme":obsnme,"obsval":obsval},index=obsnme)
-
         return df
     except Exception as e:
         print("error processing ins file {0}: {1}".format(ins_file,str(e)))
@@ -0,0 +1,54 @@
+import os
+
+
+def _errvar_args(nobs=120, npar=300, npred=3, seed=0):
+    import numpy as np
+    import pyemu
+    rng = np.random.RandomState(seed)
+    mn = min(nobs, npar)
+    u = np.linalg.qr(rng.standard_normal((nobs, mn)))[0]
+    v = np.linalg.qr(rng.standard_normal((npar, mn)))[0]
+    s = 10.0 ** np.linspace(2.0, -4.0, mn)
+    obs_names = ["o{0}".format(i) for i in range(nobs)]
+    par_names = ["p{0}".format(i) for i in range(npar)]
+    jco = pyemu.Jco(x=(u * s).dot(v.T), row_names=obs_names,
+                    col_names=par_names)
+    parcov = pyemu.Cov(x=rng.uniform(0.5, 2.0, (npar, 1)), names=par_names,
+                       isdiagonal=True)
+    obscov = pyemu.Cov(x=rng.uniform(0.1, 1.0, (nobs, 1)), names=obs_names,
+                       isdiagonal=True)
+    preds = pyemu.Matrix(x=rng.standard_normal((npar, npred)),
+                         row_names=par_names,
+                         col_names=["pred{0}".format(i) for i in range(npred)])
+    return {"jco": jco, "parcov": parcov, "obscov": obscov,
+            "predictions": preds, "verbose": False}
+
+
+def errvar_randomized_svd_test():
+    import numpy as np
+    import pyemu
+    full = pyemu.ErrVar(**_errvar_args())
+    rand = pyemu.ErrVar(randomized_svd=True, **_errvar_args())
+    sing_vals = [0, 1, 10, 40, 80]
+    df_full = full.get_errvar_dataframe(sing_vals)
+    df_rand = rand.get_errvar_dataframe(sing_vals)
+    # the full path works from the eigen decomposition of XtQX, which
+    # squares the condition number, so agreement is limited to about 1e-7
+    # relative to the largest value of each term
+    scale = np.abs(df_full.values).max(axis=0)
+    scale[scale == 0.0] = 1.0
+    assert (np.abs(df_rand.values - df_full.values) / scale).max() < 1.0e-5
+
+    for sv in [1, 10, 40]:
+        imr_full = full.I_minus_R(sv)
+        imr_rand = rand.I_minus_R(sv)
+        assert np.abs(imr_rand.as_2d - imr_full.as_2d).max() < 1.0e-10
+        g_full = full.G(sv)
+        g_rand = rand.G(sv)
+        assert list(g_rand.row_names) == list(g_full.row_names)
+        assert np.allclose(g_rand.as_2d, g_full.as_2d, rtol=1.0e-8,
+                           atol=1.0e-10 * np.abs(g_full.as_2d).max())
+
+
+if __name__ == "__main__":
+    errvar_randomized_svd_test()
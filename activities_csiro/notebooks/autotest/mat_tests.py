@@ -0,0 +1,74 @@
+import os
+
+
+def _decaying_matrix(nrow, ncol, decay=20.0, seed=0):
+    """ a random matrix with singular values from 1 down to 10**-decay
+    """
+    import numpy as np
+    rng = np.random.RandomState(seed)
+    mn = min(nrow, ncol)
+    u = np.linalg.qr(rng.standard_normal((nrow, mn)))[0]
+    v = np.linalg.qr(rng.standard_normal((ncol, mn)))[0]
+    s = 10.0 ** np.linspace(0.0, -decay, mn)
+    return (u * s).dot(v.T)
+
+
+def _subspace_dist(v1, v2):
+    """ the 2-norm distance between the projections onto the column
+    spaces of v1 and v2
+    """
+    import numpy as np
+    return np.linalg.norm(v1.dot(v1.T) - v2.dot(v2.T), 2)
+
+
+def randomized_svd_test():
+    import numpy as np
+    from pyemu.mat.mat_handler import randomized_svd
+    x = _decaying_matrix(150, 400)
+    u_full, s_full, vt_full = np.linalg.svd(x, full_matrices=False)
+    for nsing in [1, 10, 40]:
+        u, s, v = randomized_svd(x, nsing)
+        assert s.shape == (nsing,)
+        assert np.allclose(s, s_full[:nsing], rtol=1.0e-10, atol=0.0)
+        assert _subspace_dist(v, vt_full[:nsing, :].T) < 1.0e-8
+        assert _subspace_dist(u, u_full[:, :nsing]) < 1.0e-8
+    # asking for (nearly) all of the components uses the exact svd
+    u, s, v = randomized_svd(x, 145)
+    assert np.allclose(s, s_full[:145], rtol=1.0e-12, atol=0.0)
+
+
+def truncated_svd_test():
+    import numpy as np
+    import pyemu
+    x = _decaying_matrix(200, 300)
+    m = pyemu.Matrix(x=x, row_names=["o{0}".format(i) for i in range(200)],
+                     col_names=["p{0}".format(i) for i in range(300)])
+    full = pyemu.Matrix(x=x.copy(), row_names=m.row_names,
+                        col_names=m.col_names)
+    fu, fs, fv = full.pseudo_inv_components(maxsing=30)
+    # pseudo_inv_components() returns single precision singular values
+    fs = np.diag(full.s.as_2d)[:30]
+
+    u, s, v = m.truncated_svd(maxsing=30)
+    assert s.shape == (30, 30)
+    assert np.allclose(s.x.flatten(), fs, rtol=1.0e-10, atol=0.0)
+    assert _subspace_dist(v.x, fv.x) < 1.0e-8
+    assert _subspace_dist(u.x, fu.x) < 1.0e-8
+    assert list(v.row_names) == list(m.col_names)
+
+    # searching for eigthresh grows the cached decomposition
+    m = pyemu.Matrix(x=x, row_names=full.row_names, col_names=full.col_names)
+    m.truncated_svd(maxsing=5)
+    u, s, v = m.truncated_svd(eigthresh=1.0e-3)
+    ts = np.diag(s.as_2d)
+    fs = np.diag(full.s.as_2d)
+    assert ts[-1] / ts[0] <= 1.0e-3
+    assert np.allclose(ts, fs[:ts.shape[0]], rtol=1.0e-10, atol=0.0)
+    nsing = full.get_maxsing(eigthresh=1.0e-3)
+    assert m.get_maxsing(eigthresh=1.0e-3, randomized=True) == nsing
+    assert _subspace_dist(v.x[:, :nsing], full.v.x[:, :nsing]) < 1.0e-8
+
+
+if __name__ == "__main__":
+    randomized_svd_test()
+    truncated_svd_test()
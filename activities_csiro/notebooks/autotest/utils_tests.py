@@ -0,0 +1,102 @@
+import os
+import tempfile
+
+
+def _setup_sweep_model(ws):
+    """ a fake forward model whose behavior is set by the "mode" parameter:
+    0 - success, 1 - fails, 2 - hangs, 3 - fails on the first attempt only
+
+    """
+    import pyemu
+    slave_dir = os.path.join(ws, "template")
+    os.mkdir(slave_dir)
+    flaky_dir = os.path.join(ws, "flaky")
+    os.mkdir(flaky_dir)
+    with open(os.path.join(slave_dir, "forward_run.py"), 'w') as f:
+        f.write("import os\nimport sys\nimport time\n")
+        f.write("val, mode = [float(v) for v in open('model.in').read().split()]\n")
+        f.write("mode = int(round(mode))\n")
+        f.write("if mode == 1:\n    sys.exit(1)\n")
+        f.write("if mode == 2:\n    time.sleep(60)\n")
+        f.write("if mode == 3:\n")
+        f.write("    flag = os.path.join({0!r}, str(val))\n".format(flaky_dir))
+        f.write("    if not os.path.exists(flag):\n")
+        f.write("        open(flag, 'w').close()\n")
+        f.write("        sys.exit(1)\n")
+        f.write("with open('model.out', 'w') as f:\n")
+        f.write("    f.write('{0:20.8E}\\n'.format(2.0 * val))\n")
+    with open(os.path.join(slave_dir, "model.in.tpl"), 'w') as f:
+        f.write("ptf ~\n~  val     ~\n~  mode    ~\n")
+    with open(os.path.join(slave_dir, "model.in"), 'w') as f:
+        f.write("1.0\n0.0\n")
+    with open(os.path.join(slave_dir, "model.out.ins"), 'w') as f:
+        f.write("pif ~\nl1 !sim!\n")
+    with open(os.path.join(slave_dir, "model.out"), 'w') as f:
+        f.write("2.0\n")
+    bd = os.getcwd()
+    os.chdir(slave_dir)
+    try:
+        pst = pyemu.Pst.from_io_files(["model.in.tpl"], ["model.in"],
+                                      ["model.out.ins"], ["model.out"])
+    finally:
+        os.chdir(bd)
+    par = pst.parameter_data
+    par.loc[:, "partrans"] = "none"
+    par.loc[:, "parlbnd"] = -10.0
+    par.loc[:, "parubnd"] = 10.0
+    pst.model_command = ["python forward_run.py"]
+    return pst, slave_dir
+
+
+def run_sweep_local_test():
+    import warnings
+    import numpy as np
+    import pandas as pd
+    import pyemu
+    ws = tempfile.mkdtemp()
+    pst, slave_dir = _setup_sweep_model(ws)
+    df = pd.DataFrame({"val": [1.0, 2.0, 3.0, 4.0, 5.0],
+                       "mode": [0.0, 1.0, 2.0, 3.0, 0.0]},
+                      index=["ok1", "fail", "hang", "flaky", "ok2"])
+    pe = pyemu.ParameterEnsemble.from_dataframe(df=df, pst=pst)
+    calls = []
+
+    def callback(real_name, success, num_finished, num_total):
+        calls.append((real_name, success, num_finished, num_total))
+
+    worker_root = os.path.join(ws, "workers")
+    os.mkdir(worker_root)
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        oe, info = pyemu.os_utils.run_sweep_local(pe, slave_dir, num_workers=3,
+                                                  worker_root=worker_root,
+                                                  max_retries=1, timeout=2.0,
+                                                  callback=callback)
+    assert any("2 of 5 realizations failed" in str(ww.message) for ww in w)
+
+    assert list(oe.index) == list(df.index)
+    assert np.allclose(oe.loc[["ok1", "flaky", "ok2"], "sim"].values,
+                       [2.0, 8.0, 10.0])
+    assert oe.loc[["fail", "hang"], "sim"].isnull().all()
+
+    assert list(info.success) == [True, False, False, True, True]
+    # failed runs are tried max_retries + 1 times
+    assert list(info.attempts) == [1, 2, 2, 2, 1]
+    assert "timed out" in info.loc["hang", "error"]
+    assert info.loc["fail", "error"] != ''
+    assert info.loc["flaky", "error"] == ''
+    assert info.loc[info.success, "run_time"].notnull().all()
+    assert info.loc[~info.success, "run_time"].isnull().all()
+
+    # the callback is called once for each realization, after retries
+    assert sorted(c[0] for c in calls) == sorted(df.index)
+    assert [c[2] for c in calls] == [1, 2, 3, 4, 5]
+    assert all(c[3] == 5 for c in calls)
+    assert dict((c[0], c[1]) for c in calls) == info.success.to_dict()
+
+    # worker dirs are removed by default
+    assert len(os.listdir(worker_root)) == 0
+
+
+if __name__ == "__main__":
+    run_sweep_local_test()
@@ -0,0 +1,56 @@
+"""benchmark OrdinaryKrige.calc_factors_vectorized() against the
+point-by-point OrdinaryKrige.calc_factors() loop.
+
+usage: python krige_factors_benchmark.py [nrow ncol npp]
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pyemu
+
+
+class _GridSR(object):
+    """ the parts of a spatial reference that calc_factors_grid() uses
+    """
+    def __init__(self, nrow, ncol, delta=100.):
+        self.nrow, self.ncol = nrow, ncol
+        self.xcentergrid, self.ycentergrid = np.meshgrid(
+            (np.arange(ncol) + 0.5) * delta,
+            (np.arange(nrow)[::-1] + 0.5) * delta)
+
+
+def run(nrow=50, ncol=60, npp=60):
+    sr = _GridSR(nrow, ncol)
+    rng = np.random.RandomState(0)
+    pp_df = pd.DataFrame({"name": ["pp{0}".format(i) for i in range(npp)],
+                          "x": rng.uniform(0., ncol * 100., npp),
+                          "y": rng.uniform(0., nrow * 100., npp),
+                          "parval1": 1.0})
+    v = pyemu.geostats.ExpVario(contribution=1.0, a=1000., anisotropy=2.0,
+                                bearing=45.)
+    gs = pyemu.geostats.GeoStruct(variograms=v, nugget=0.1)
+    ws = tempfile.mkdtemp()
+    times = {}
+    for vectorized in [False, True]:
+        ok = pyemu.geostats.OrdinaryKrige(gs, pp_df)
+        start = datetime.now()
+        ok.calc_factors_grid(sr, maxpts_interp=20, vectorized=vectorized)
+        times[vectorized] = (datetime.now() - start).total_seconds()
+        ok.to_grid_factors_file(os.path.join(ws, "{0}.fac".format(vectorized)))
+    with open(os.path.join(ws, "False.fac")) as f:
+        loop_lines = f.readlines()
+    with open(os.path.join(ws, "True.fac")) as f:
+        vec_lines = f.readlines()
+    print("\n{0} nodes, {1} pilot points".format(nrow * ncol, npp))
+    print("loop:       {0:10.3f} sec".format(times[False]))
+    print("vectorized: {0:10.3f} sec".format(times[True]))
+    print("speedup:    {0:10.1f}x".format(times[False] / times[True]))
+    print("identical factors files: {0}".format(loop_lines == vec_lines))
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:]])
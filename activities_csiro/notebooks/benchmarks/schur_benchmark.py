@@ -0,0 +1,77 @@
+"""benchmark a typical Schur posterior chain and the Matrix name
+bookkeeping (get(), align() and misaligned products) it relies on.
+
+usage: python schur_benchmark.py [nobs npar [package_dir]]
+
+nobs and npar default to 50000 and 10000 (the jco alone is 4 GB at
+that size).  package_dir is the directory holding the pyemu package to
+time, so that an older checkout can be timed with the same script.
+It defaults to the parent of this directory.
+"""
+import os
+import sys
+from datetime import datetime
+import numpy as np
+
+if len(sys.argv) > 3:
+    sys.path.insert(0, os.path.abspath(sys.argv[3]))
+else:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    ".."))
+import pyemu
+
+
+def _timed(label, func, times):
+    start = datetime.now()
+    result = func()
+    times.append((label, (datetime.now() - start).total_seconds()))
+    print("{0:40s} {1:10.3f} sec".format(label, times[-1][1]))
+    return result
+
+
+def run(nobs=50000, npar=10000, npred=10):
+    rng = np.random.RandomState(0)
+    obs_names = ["obs_{0}".format(i) for i in range(nobs)]
+    par_names = ["par_{0}".format(i) for i in range(npar)]
+    pred_names = ["pred_{0}".format(i) for i in range(npred)]
+    jco = pyemu.Jco(x=rng.standard_normal((nobs, npar)),
+                    row_names=obs_names, col_names=par_names)
+    parcov = pyemu.Cov(x=rng.uniform(0.5, 2.0, (npar, 1)), names=par_names,
+                       isdiagonal=True)
+    obscov = pyemu.Cov(x=rng.uniform(1.0, 10.0, (nobs, 1)), names=obs_names,
+                       isdiagonal=True)
+    preds = pyemu.Matrix(x=rng.standard_normal((npar, npred)),
+                         row_names=par_names, col_names=pred_names)
+    print("\npyemu from {0}".format(os.path.dirname(pyemu.__file__)))
+    print("{0} obs x {1} pars, {2} forecasts\n".format(nobs, npar, npred))
+
+    times = []
+    # name bookkeeping on the large operands
+    shuffled_pars = list(np.array(par_names)[rng.permutation(npar)])
+    shuffled_obs = list(np.array(obs_names)[rng.permutation(nobs)])
+    _timed("jco.get(shuffled rows and cols)",
+           lambda: jco.get(row_names=shuffled_obs, col_names=shuffled_pars),
+           times)
+    shuffled_parcov = parcov.get(row_names=shuffled_pars)
+    _timed("jco * diag parcov (misaligned)", lambda: jco * shuffled_parcov,
+           times)
+    _timed("parcov.align(shuffled names)",
+           lambda: parcov.get(shuffled_pars).align(par_names), times)
+
+    # the Schur chain
+    sc = _timed("Schur()", lambda: pyemu.Schur(jco=jco, parcov=parcov,
+                                                obscov=obscov,
+                                                predictions=preds,
+                                                verbose=False), times)
+    _timed("Schur.posterior_parameter", lambda: sc.posterior_parameter,
+           times)
+    _timed("Schur.posterior_prediction", lambda: sc.posterior_prediction,
+           times)
+    _timed("Schur.get_parameter_summary()", sc.get_parameter_summary, times)
+    _timed("Schur.get_forecast_summary()", sc.get_forecast_summary, times)
+    print("{0:40s} {1:10.3f} sec".format("total", sum(t for _, t in times)))
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
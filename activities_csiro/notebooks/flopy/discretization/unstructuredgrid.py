@@ -1,6 +1,7 @@
 import numpy as np
 import itertools
 from .grid import Grid, CachedData
+from ..utils.gridindex import cell_vertex_array
 
 
 class UnstructuredGrid(Grid):
@@ -25,6 +26,8 @@ class UnstructuredGrid(Grid):
     ----------
     get_cell_vertices(cellid)
         returns vertices for a single cell at cellid.
+    intersect(x, y, local)
+        returns the cell number of a point or of arrays of points
     """
     def __init__(self, vertices, iverts, xcenters, ycenters,
                  top=None, botm=None, idomain=None, lenuni=None,
@@ -141,8 +144,33 @@ class UnstructuredGrid(Grid):
         return self._cache_dict[cache_index].data
 
     def intersect(self, x, y, local=True):
-        x, y = super(UnstructuredGrid, self).intersect(x, y, local)
-        raise Exception('Not implemented yet')
+        """
+        Get the cell number of a point or of arrays of points.
+
+        Parameters
+        ----------
+        x : float or array of floats
+            x coordinates of the points
+        y : float or array of floats
+            y coordinates of the points
+        local : bool
+            If True, x and y are in model coordinates, otherwise they are
+            in the spatial reference coordinate system (default is True)
+
+        Returns
+        -------
+        cellid : int or array of ints
+            zero-based cell number of the points
+
+        """
+        if local:
+            x, y = self.get_coords(x, y)
+        cellid = self.spatial_index.locate(x, y)
+        if np.any(cellid < 0):
+            raise Exception('x, y point given is outside of the model area')
+        if np.isscalar(x):
+            return int(cellid)
+        return cellid
 
     def get_cell_vertices(self, cellid):
         """
@@ -154,6 +182,16 @@ class UnstructuredGrid(Grid):
         return list(zip(self.xvertices[cellid],
                         self.yvertices[cellid]))
 
+    def _build_cell_vertices(self):
+        """Build the (ncpl, nvert, 2) array of the vertices of all cells,
+        padded as for VertexGrid."""
+        cache_index = 'xyzgrid'
+        if cache_index not in self._cache_dict or \
+                self._cache_dict[cache_index].out_of_date:
+            self._build_grid_geometry_info()
+        xvertices, yvertices = self._cache_dict[cache_index].data_nocopy[:2]
+        return cell_vertex_array(xvertices, yvertices)
+
     def _build_grid_geometry_info(self):
         cache_index_cc = 'cellcenters'
         cache_index_vert = 'xyzgrid'
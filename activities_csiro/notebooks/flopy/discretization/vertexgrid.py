@@ -1,6 +1,7 @@
 import numpy as np
 import itertools
 from .grid import Grid, CachedData
+from ..utils.gridindex import cell_vertex_array
 
 
 class VertexGrid(Grid):
@@ -25,6 +26,8 @@ class VertexGrid(Grid):
     ----------
     get_cell_vertices(cellid)
         returns vertices for a single cell at cellid.
+    intersect(x, y, local)
+        returns the cell number of a point or of arrays of points
     """
 
     def __init__(self, vertices, cell2d, top=None, botm=None, idomain=None,
@@ -106,8 +109,33 @@ class VertexGrid(Grid):
         return self._cache_dict[cache_index].data
 
     def intersect(self, x, y, local=True):
-        x, y = super(VertexGrid, self).intersect(x, y, local)
-        raise Exception('Not implemented yet')
+        """
+        Get the cell number of a point or of arrays of points.
+
+        Parameters
+        ----------
+        x : float or array of floats
+            x coordinates of the points
+        y : float or array of floats
+            y coordinates of the points
+        local : bool
+            If True, x and y are in model coordinates, otherwise they are
+            in the spatial reference coordinate system (default is True)
+
+        Returns
+        -------
+        cellid : int or array of ints
+            zero-based cell number of the points
+
+        """
+        if local:
+            x, y = self.get_coords(x, y)
+        cellid = self.spatial_index.locate(x, y)
+        if np.any(cellid < 0):
+            raise Exception('x, y point given is outside of the model area')
+        if np.isscalar(x):
+            return int(cellid)
+        return cellid
 
     def get_cell_vertices(self, cellid):
         """
@@ -116,8 +144,24 @@ class VertexGrid(Grid):
         :param cellid: (int) cellid number
         :return: list of x,y cell vertices
         """
-        return list(zip(self.xvertices[cellid],
-                        self.yvertices[cellid]))
+        cache_index = 'xyzgrid'
+        if cache_index not in self._cache_dict or \
+                self._cache_dict[cache_index].out_of_date:
+            self._build_grid_geometry_info()
+        xvertices, yvertices = self._cache_dict[cache_index].data_nocopy[:2]
+        return list(zip(xvertices[cellid], yvertices[cellid]))
+
+    def _build_cell_vertices(self):
+        """Build the (ncpl, nvert, 2) array of the vertices of all cells,
+        where nvert is the largest number of vertices of a cell.  The
+        vertices of cells with fewer vertices are padded with the first
+        vertex of the cell."""
+        cache_index = 'xyzgrid'
+        if cache_index not in self._cache_dict or \
+                self._cache_dict[cache_index].out_of_date:
+            self._build_grid_geometry_info()
+        xvertices, yvertices = self._cache_dict[cache_index].data_nocopy[:2]
+        return cell_vertex_array(xvertices, yvertices)
 
     def _build_grid_geometry_info(self):
         cache_index_cc = 'cellcenters'
@@ -38,6 +38,10 @@ def ensemble_helper(inputs_filename, outputs_filename, models, add_reals=True,
     all models have same dis and reference information, only difference is
     properties and boundary conditions.  Assumes model.nam.split('_')[-1] is the
     realization suffix to use in the netcdf variable names
+
+    The realizations are exported one after another and the ensemble mean
+    and standard deviation are accumulated with Welford's online algorithm,
+    so only one realization is held in memory at a time.
     """
     f_in, f_out = None, None
     for m in models[1:]:
@@ -46,28 +50,18 @@ def ensemble_helper(inputs_filename, outputs_filename, models, add_reals=True,
     if inputs_filename is not None:
         f_in = models[0].export(inputs_filename, **kwargs)
         vdict = {}
-        vdicts = [models[0].export(vdict, **kwargs)]
+        stats = {}
+        _update_ensemble_stats(stats, models[0].export(vdict, **kwargs))
         i = 1
         for m in models[1:]:
             suffix = m.name.split('.')[0].split('_')[-1]
             vdict = {}
             m.export(vdict, **kwargs)
-            vdicts.append(vdict)
+            _update_ensemble_stats(stats, vdict)
             if add_reals:
                 f_in.append(vdict, suffix=suffix)
             i += 1
-        mean, stdev = {}, {}
-        for vname in vdict.keys():
-            alist = []
-            for vd in vdicts:
-                alist.append(vd[vname])
-            alist = np.array(alist)
-            mean[vname] = alist.mean(axis=0)
-            stdev[vname] = alist.std(axis=0)
-            mean[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
-            stdev[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
-            mean[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            stdev[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
+        mean, stdev = _get_ensemble_stats(stats, vdict)
 
         if i >= 2:
             if not add_reals:
@@ -84,31 +78,22 @@ def ensemble_helper(inputs_filename, outputs_filename, models, add_reals=True,
         f_out = output_helper(outputs_filename, models[0], models[0]. \
                               load_results(as_dict=True), **kwargs)
         vdict = {}
-        vdicts = [output_helper(vdict, models[0], models[0]. \
-                                load_results(as_dict=True), **kwargs)]
+        stats = {}
+        _update_ensemble_stats(stats, output_helper(
+            vdict, models[0], models[0].load_results(as_dict=True),
+            **kwargs))
         i = 1
         for m in models[1:]:
             suffix = m.name.split('.')[0].split('_')[-1]
             oudic = m.load_results(as_dict=True)
             vdict = {}
             output_helper(vdict, m, oudic, **kwargs)
-            vdicts.append(vdict)
+            _update_ensemble_stats(stats, vdict)
             if add_reals:
                 f_out.append(vdict, suffix=suffix)
             i += 1
 
-        mean, stdev = {}, {}
-        for vname in vdict.keys():
-            alist = []
-            for vd in vdicts:
-                alist.append(vd[vname])
-            alist = np.array(alist)
-            mean[vname] = alist.mean(axis=0)
-            stdev[vname] = alist.std(axis=0)
-            mean[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            stdev[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            mean[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
-            stdev[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
+        mean, stdev = _get_ensemble_stats(stats, vdict)
         if i >= 2:
             if not add_reals:
                 f_out.write()
@@ -124,55 +109,128 @@ def ensemble_helper(inputs_filename, outputs_filename, models, add_reals=True,
     return f_in, f_out
 
 
-def _add_output_nc_variable(f, times, shape3d, out_obj, var_name, logger=None,
-                            text='', mask_vals=[], mask_array3d=None):
-    if logger:
-        logger.log("creating array for {0}".format(
-            var_name))
+def _update_ensemble_stats(stats, vdict):
+    """
+    Add the arrays of one realization to the running count, mean and sum
+    of squared differences from the mean of each variable, which are
+    updated with Welford's online algorithm.
 
-    array = np.zeros((len(times), shape3d[0], shape3d[1], shape3d[2]),
-                     dtype=np.float32)
-    array[:] = np.NaN
-    for i, t in enumerate(times):
-        if t in out_obj.recordarray["totim"]:
-            try:
-                if text:
-                    a = out_obj.get_data(totim=t, full3D=True, text=text)
-                    if isinstance(a, list):
-                        a = a[0]
-                else:
-                    a = out_obj.get_data(totim=t)
-            except Exception as e:
-                estr = "error getting data for {0} at time {1}:{2}".format(
-                    var_name + text.decode().strip().lower(), t, str(e))
-                if logger:
-                    logger.warn(estr)
-                else:
-                    print(estr)
-                continue
-            if mask_array3d is not None and a.shape == mask_array3d.shape:
-                a[mask_array3d] = np.NaN
-            try:
-                array[i, :, :, :] = a.astype(np.float32)
-            except Exception as e:
-                estr = "error assigning {0} data to array for time {1}:{2}".format(
-                    var_name + text.decode().strip().lower(), t, str(e))
-                if logger:
-                    logger.warn(estr)
-                else:
-                    print(estr)
-                continue
+    Parameters
+    ----------
+    stats : dict
+        [count, mean, sum of squared differences] by variable name, which
+        is updated in place
+    vdict : dict
+        arrays of the realization by variable name
 
-    if logger:
-        logger.log("creating array for {0}".format(
-            var_name))
+    """
+    for vname, array in vdict.items():
+        array = np.asarray(array, dtype=np.float64)
+        if vname not in stats:
+            stats[vname] = [1, array.copy(), np.zeros_like(array)]
+            continue
+        stat = stats[vname]
+        stat[0] += 1
+        delta = array - stat[1]
+        stat[1] += delta / stat[0]
+        stat[2] += delta * (array - stat[1])
+
+
+def _get_ensemble_stats(stats, vdict):
+    """
+    Get the ensemble mean and standard deviation of the variables of
+    vdict from the running statistics of _update_ensemble_stats().  Both
+    are set to FILLVALUE where the arrays of vdict are NaN or FILLVALUE.
 
+    Returns
+    -------
+    mean, stdev : dict
+        arrays by variable name
+
+    """
+    mean, stdev = {}, {}
+    for vname, array in vdict.items():
+        n, m, m2 = stats[vname]
+        array = np.asarray(array)
+        dtype = array.dtype
+        if not np.issubdtype(dtype, np.floating):
+            dtype = np.float64
+        mean[vname] = m.astype(dtype)
+        stdev[vname] = np.sqrt(m2 / n).astype(dtype)
+        mask = np.isnan(array) | (array == netcdf.FILLVALUE)
+        mean[vname][mask] = netcdf.FILLVALUE
+        stdev[vname][mask] = netcdf.FILLVALUE
+    return mean, stdev
+
+
+def _get_output_nc_step(out_obj, t, shape3d, var_name, logger=None,
+                        text='', mask_vals=[], mask_array3d=None):
+    """
+    Get the three dimensional data of an output file at one time as a
+    float32 array, which is NaN where there are no data or the data are
+    masked.
+
+    """
+    array = np.empty(shape3d, dtype=np.float32)
+    array[:] = np.NaN
+    if t not in out_obj.recordarray["totim"]:
+        return array
+    try:
+        if text:
+            a = out_obj.get_data(totim=t, full3D=True, text=text)
+            if isinstance(a, list):
+                a = a[0]
+        else:
+            a = out_obj.get_data(totim=t)
+    except Exception as e:
+        estr = "error getting data for {0} at time {1}:{2}".format(
+            var_name + text.decode().strip().lower(), t, str(e))
+        if logger:
+            logger.warn(estr)
+        else:
+            print(estr)
+        return array
+    try:
+        array[:] = a.astype(np.float32)
+    except Exception as e:
+        estr = "error assigning {0} data to array for time {1}:{2}".format(
+            var_name + text.decode().strip().lower(), t, str(e))
+        if logger:
+            logger.warn(estr)
+        else:
+            print(estr)
+        return array
+    if mask_array3d is not None and a.shape == mask_array3d.shape:
+        array[mask_array3d] = np.NaN
     for mask_val in mask_vals:
         array[np.where(array == mask_val)] = np.NaN
-    mx, mn = np.nanmax(array), np.nanmin(array)
-    array[np.isnan(array)] = netcdf.FILLVALUE
+    return array
+
+
+def _add_output_nc_variable(f, times, shape3d, out_obj, var_name, logger=None,
+                            text='', mask_vals=[], mask_array3d=None):
+    """
+    Add the data of an output file for all times to a dict or a NetCdf
+    instance.  The data are written to a NetCdf instance one time at a
+    time, so only the data of one time are held in memory.
+
+    """
+    log_name = var_name
+    if logger:
+        logger.log("creating array for {0}".format(
+            log_name))
 
     if isinstance(f, dict):
+        array = np.zeros((len(times), shape3d[0], shape3d[1], shape3d[2]),
+                         dtype=np.float32)
+        for i, t in enumerate(times):
+            array[i, :, :, :] = _get_output_nc_step(
+                out_obj, t, shape3d, var_name, logger=logger, text=text,
+                mask_vals=mask_vals, mask_array3d=mask_array3d)
+        array[np.isnan(array)] = netcdf.FILLVALUE
+        if logger:
+            logger.log("creating array for {0}".format(
+                log_name))
         if text:
             var_name = text.decode().strip().lower()
         f[var_name] = array
@@ -188,8 +246,8 @@ def _add_output_nc_variable(f, times, shape3d, out_obj, var_name, logger=None,
         var_name = text.decode().strip().lower()
     attribs = {"long_name": var_name}
     attribs["coordinates"] = "time layer latitude longitude"
-    attribs["min"] = mn
-    attribs["max"] = mx
+    attribs["min"] = np.NaN
+    attribs["max"] = np.NaN
     if units is not None:
         attribs["units"] = units
     try:
@@ -204,16 +262,42 @@ def _add_output_nc_variable(f, times, shape3d, out_obj, var_name, logger=None,
             logger.lraise(estr)
         else:
             raise Exception(estr)
-
-    try:
-        var[:] = array
-    except Exception as e:
-        estr = "error setting array to variable {0}:\n{1}".format(
-            var_name, str(e))
+    if var is None:
+        # a duplicate variable that is skipped
         if logger:
-            logger.lraise(estr)
-        else:
-            raise Exception(estr)
+            logger.log("creating array for {0}".format(
+                log_name))
+        return
+
+    mx, mn = np.NaN, np.NaN
+    for i, t in enumerate(times):
+        array = _get_output_nc_step(
+            out_obj, t, shape3d, var_name, logger=logger, text=text,
+            mask_vals=mask_vals, mask_array3d=mask_array3d)
+        isnan = np.isnan(array)
+        if not isnan.all():
+            mx = np.nanmax([mx, np.nanmax(array)])
+            mn = np.nanmin([mn, np.nanmin(array)])
+        array[isnan] = netcdf.FILLVALUE
+        try:
+            var[i, :, :, :] = array
+        except Exception as e:
+            estr = "error setting array to variable {0}:\n{1}".format(
+                var_name, str(e))
+            if logger:
+                logger.lraise(estr)
+            else:
+                raise Exception(estr)
+
+    # keep the attributes in the precision of the variable
+    mn, mx = var.dtype.type(mn), var.dtype.type(mx)
+    attribs["min"] = mn
+    attribs["max"] = mx
+    var.setncattr("min", mn)
+    var.setncattr("max", mx)
+    if logger:
+        logger.log("creating array for {0}".format(
+            log_name))
 
 
 def output_helper(f, ml, oudic, **kwargs):
@@ -509,8 +593,8 @@ def mflist_export(f, mfl, **kwargs):
                 ra = mfl[kper]
                 verts = np.array(model_grid.get_cell_vertices(ra.i, ra.j))
             elif df is not None:
-                verts = np.array([model_grid.get_cell_vertices(i, df.j.values[ix])
-                                  for ix, i in enumerate(df.i.values)])
+                verts = model_grid.get_cell_vertices(df.i.values,
+                                                     df.j.values)
                 ra = df.to_records(index=False)
             epsg = kwargs.get('epsg', None)
             prj = kwargs.get('prj', None)
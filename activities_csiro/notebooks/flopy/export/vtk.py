@@ -1,7 +1,16 @@
 from __future__ import print_function, division
 import os
+import zlib
+from collections import OrderedDict
 import numpy as np
-from ..discretization import StructuredGrid
+from ..discretization import StructuredGrid, VertexGrid
+
+# vtk cell types
+VTK_VOXEL = 11
+VTK_POLYHEDRON = 42
+
+# size of the blocks of compressed binary data
+VTK_BLOCK_SIZE = 32768
 
 
 def start_tag(f, tag, indent_level, indent_char='  '):
@@ -22,6 +31,18 @@ class Vtk(object):
     """
     Support for writing a model to a vtk file
 
+    Parameters
+    ----------
+    output_filename : str
+        name of the .vtu file.  If transient arrays are added, a .pvd
+        collection with the same base name is written with one .vtu file
+        for each time.
+    model : flopy model instance
+        model with a structured or vertex model grid
+    verbose : bool
+        If True, stdout is verbose.  If None, the verbose flag of the
+        model is used. (default is None)
+
     """
     def __init__(self, output_filename, model, verbose=None):
 
@@ -38,10 +59,17 @@ class Vtk(object):
 
         self.model = model
         self.modelgrid = model.modelgrid
-        self.shape = (self.modelgrid.nlay, self.modelgrid.nrow,
-                      self.modelgrid.ncol)
+        if isinstance(self.modelgrid, StructuredGrid):
+            self.shape = (self.modelgrid.nlay, self.modelgrid.nrow,
+                          self.modelgrid.ncol)
+        elif isinstance(self.modelgrid, VertexGrid):
+            self.shape = (self.modelgrid.nlay, self.modelgrid.ncpl)
+        else:
+            raise Exception('vtk export is not supported for grid '
+                            'type {}'.format(self.modelgrid.grid_type))
 
-        self.arrays = {}
+        self.arrays = OrderedDict()
+        self.transient_arrays = OrderedDict()
 
         return
 
@@ -50,7 +78,25 @@ class Vtk(object):
         self.arrays[name] = a
         return
 
-    def write(self, shared_vertex=False, ibound_filter=False, htop=None):
+    def add_transient_array(self, name, d):
+        """
+        Add an array that changes with time, such as heads
+
+        Parameters
+        ----------
+        name : str
+            name of the array
+        d : dict
+            arrays with the shape of the model grid keyed by time
+
+        """
+        for a in d.values():
+            assert a.shape == self.shape
+        self.transient_arrays[name] = d
+        return
+
+    def write(self, shared_vertex=False, ibound_filter=False, htop=None,
+              binary=False, compress=False):
         """
 
         Parameters
@@ -72,42 +118,106 @@ class Vtk(object):
             minimum of the cell top and the head and the maximum of the cell
             bottom and the head.
 
-        """
+        binary : bool
+            Append the data to the file as raw binary data instead of
+            writing it as ascii text. (default is False)
 
-        indent_level = 0
+        compress : bool
+            Compress the binary data with zlib. (default is False)
+
+        Notes
+        -----
+        If transient arrays were added, a .vtu file is written for each
+        time, with the arrays of add_array and the transient arrays of that
+        time, together with a .pvd collection of these files.  The points
+        and cells are built and encoded once and are reused for every
+        time.
+
+        """
         if self.verbose:
             print('writing vtk file')
-        f = open(self.output_filename, 'w')
 
         ibound = None
         if ibound_filter:
             ibound = self.modelgrid.idomain
+        if ibound is None:
+            ibound = np.ones(self.shape, dtype=np.int32)
+        else:
+            ibound = np.asarray(ibound).reshape(self.shape)
 
-        dis = self.model.dis
-        z = np.vstack([dis.top.array.reshape(1, dis.nrow, dis.ncol),
-                       dis.botm.array])
-        if shared_vertex:
-            verts, iverts = dis.sr.get_3d_shared_vertex_connectivity(dis.nlay,
-                                                            z, ibound=ibound)
+        mg = self.modelgrid
+        if isinstance(mg, StructuredGrid):
+            if shared_vertex:
+                verts, iverts = self.get_3d_shared_vertex_connectivity(
+                    mg, ibound=ibound)
+            else:
+                verts, iverts = self.get_3d_vertex_connectivity(
+                    mg, ibound=ibound, top=htop)
+            ncells = iverts.shape[0]
+            cells = [('connectivity', iverts.ravel()),
+                     ('offsets', 8 * np.arange(1, ncells + 1)),
+                     ('types', np.full(ncells, VTK_VOXEL, dtype=np.uint8))]
+            icell = np.flatnonzero(ibound)
         else:
-            top = z[:-1]
-            bot = z[1:]
-            if htop is not None:
-                top = htop
-            verts, iverts = dis.sr.get_3d_vertex_connectivity(dis.nlay, top, bot,
-                                                              ibound=ibound)
-        ncells = len(iverts)
+            verts, cells, icell = self.get_3d_polyhedron_connectivity(
+                mg, ibound=ibound, shared_vertex=shared_vertex, top=htop)
+            ncells = icell.shape[0]
         npoints = verts.shape[0]
         if self.verbose:
             s = 'Number of point is {}\n ' \
                 'Number of cells is {}\n'.format(npoints, ncells)
             print(s)
 
+        # encode the points and cells once for all of the files
+        points = self._encode(verts, binary, compress)
+        cells = [(name, self._data_type(a), self._encode(a, binary, compress))
+                 for name, a in cells]
+
+        arrays = [('top', mg.top_botm[0:-1])] + list(self.arrays.items())
+        if not self.transient_arrays:
+            self._write_vtu(self.output_filename, npoints, ncells, points,
+                            cells, arrays, icell, binary, compress)
+            return
+
+        times = set()
+        for d in self.transient_arrays.values():
+            times.update(d.keys())
+        times = sorted(times)
+        base = os.path.splitext(self.output_filename)[0]
+        fnames = []
+        for i, t in enumerate(times):
+            fname = '{}_{:05d}.vtu'.format(base, i)
+            tarrays = arrays + [(name, d[t]) for name, d in
+                                self.transient_arrays.items() if t in d]
+            self._write_vtu(fname, npoints, ncells, points, cells, tarrays,
+                            icell, binary, compress)
+            fnames.append(fname)
+        self._write_pvd(base + '.pvd', times, fnames)
+        return
+
+    def _write_vtu(self, fname, npoints, ncells, points, cells, arrays,
+                   icell, binary, compress):
+        """
+        Write a vtu file with the encoded points and cells and the cell
+        data of the active cells
+
+        """
+        data = []
+        for name, a in arrays:
+            a = np.asarray(a, dtype=np.float64).ravel()[icell]
+            data.append((name, self._encode(a, binary, compress)))
+
+        indent_level = 0
+        f = open(fname, 'w')
+
         # xml
         s = '<?xml version="1.0"?>'
         f.write(s + '\n')
-        indent_level = start_tag(f, '<VTKFile type="UnstructuredGrid">',
-                                 indent_level)
+        s = '<VTKFile type="UnstructuredGrid" version="1.0" ' \
+            'byte_order="LittleEndian" header_type="UInt64"'
+        if binary and compress:
+            s += ' compressor="vtkZLibDataCompressor"'
+        indent_level = start_tag(f, s + '>', indent_level)
 
         # unstructured grid
         indent_level = start_tag(f, '<UnstructuredGrid>', indent_level)
@@ -117,73 +227,33 @@ class Vtk(object):
             'NumberOfCells="{}">'.format(npoints, ncells)
         indent_level = start_tag(f, s, indent_level)
 
+        # binary data is appended to the file after the xml, in the
+        # order of the data array tags
+        appended = []
+
         # points
         s = '<Points>'
         indent_level = start_tag(f, s, indent_level)
-
-        s = '<DataArray type="Float64" NumberOfComponents="3">'
-        indent_level = start_tag(f, s, indent_level)
-        assert(isinstance(self.modelgrid, StructuredGrid))
-        z = np.vstack([self.modelgrid.top.reshape(1, self.modelgrid.nrow,
-                                                  self.modelgrid.ncol),
-                       self.modelgrid.botm])
-        if shared_vertex:
-            verts, iverts = self.get_3d_shared_vertex_connectivity(
-                self.modelgrid)
-        else:
-            verts, iverts = self.get_3d_vertex_connectivity(self.modelgrid)
-
-        for row in verts:
-            s = indent_level * '  ' + '{} {} {} \n'.format(*row)
-            f.write(s)
-        s = '</DataArray>'
-        indent_level = end_tag(f, s, indent_level)
-
+        self._write_data_array(f, indent_level, None, 'Float64', points,
+                               appended, ncomponents=3)
         s = '</Points>'
         indent_level = end_tag(f, s, indent_level)
 
         # cells
         s = '<Cells>'
         indent_level = start_tag(f, s, indent_level)
-
-        s = '<DataArray type="Int32" Name="connectivity">'
-        indent_level = start_tag(f, s, indent_level)
-        for row in iverts:
-            s = indent_level * '  ' + ' '.join([str(i) for i in row]) + '\n'
-            f.write(s)
-        s = '</DataArray>'
-        indent_level = end_tag(f, s, indent_level)
-
-        s = '<DataArray type="Int32" Name="offsets">'
-        indent_level = start_tag(f, s, indent_level)
-        icount = 0
-        for row in iverts:
-            icount += len(row)
-            s = indent_level * '  ' + '{} \n'.format(icount)
-            f.write(s)
-        s = '</DataArray>'
-        indent_level = end_tag(f, s, indent_level)
-
-        s = '<DataArray type="UInt8" Name="types">'
-        indent_level = start_tag(f, s, indent_level)
-        for row in iverts:
-            s = indent_level * '  ' + '{} \n'.format(11)
-            f.write(s)
-        s = '</DataArray>'
-        indent_level = end_tag(f, s, indent_level)
-
+        for name, dtype, a in cells:
+            self._write_data_array(f, indent_level, name, dtype, a,
+                                   appended)
         s = '</Cells>'
         indent_level = end_tag(f, s, indent_level)
 
         # add cell data
         s = '<CellData Scalars="scalars">'
         indent_level = start_tag(f, s, indent_level)
-
-        self._write_data_array(f, indent_level, 'top', z[0:-1], ibound)
-
-        for name, a in self.arrays.items():
-            self._write_data_array(f, indent_level, name, a, ibound)
-
+        for name, a in data:
+            self._write_data_array(f, indent_level, name, 'Float64', a,
+                                   appended)
         s = '</CellData>'
         indent_level = end_tag(f, s, indent_level)
 
@@ -193,6 +263,18 @@ class Vtk(object):
         # end unstructured grid
         indent_level = end_tag(f, '</UnstructuredGrid>', indent_level)
 
+        # appended data
+        if binary:
+            f.write(indent_level * '  ' + '<AppendedData encoding="raw">\n')
+            f.write(indent_level * '  ' + '_')
+            f.close()
+            f = open(fname, 'ab')
+            for a in appended:
+                f.write(a)
+            f.close()
+            f = open(fname, 'a')
+            f.write('\n' + indent_level * '  ' + '</AppendedData>\n')
+
         # end xml
         indent_level = end_tag(f, '</VTKFile>', indent_level)
 
@@ -200,37 +282,34 @@ class Vtk(object):
         f.close()
         return
 
-    def _write_data_array(self, f, indent_level, name, a, ibound):
+    @staticmethod
+    def _write_data_array(f, indent_level, name, dtype, a, appended,
+                          ncomponents=None):
         """
-        Write a numpy array to the vtk file
+        Write an encoded array to the vtk file, or write its tag and
+        add it to the data that is appended to the file if it is binary
 
         """
+        s = '<DataArray type="{}"'.format(dtype)
+        if name is not None:
+            s += ' Name="{}"'.format(name)
+        if ncomponents is not None:
+            s += ' NumberOfComponents="{}"'.format(ncomponents)
+
+        if isinstance(a, bytes):
+            offset = sum([len(b) for b in appended])
+            s += ' format="appended" offset="{}"/>'.format(offset)
+            f.write(indent_level * '  ' + s + '\n')
+            appended.append(a)
+            return
 
         # header tag
-        s = '<DataArray type="Float64" Name="{}" format="ascii">'.format(name)
+        s += ' format="ascii">'
         indent_level = start_tag(f, s, indent_level)
 
         # data
-        nlay = a.shape[0]
-
-        # combine ibound with laycbd when model supports laycbd
-        if ibound is not None and hasattr(self.model, 'dis') and \
-                hasattr(self.model.dis, 'laycbd'):
-            cbd = np.where(self.model.dis.laycbd.array > 0)
-            ibound = np.insert(ibound, cbd[0]+1, ibound[cbd[0],:,:], axis=0)
-
-        for k in range(nlay):
-            s = indent_level * '  '
-            f.write(s)
-            if ibound is None:
-                ak = a[k].flatten()
-            else:
-                idx = (ibound[k] != 0)
-                ak = a[k][idx].flatten()
-            for v in ak:
-                s = ' {}'.format(v)
-                f.write(s)
-            f.write('\n')
+        for line in a:
+            f.write(indent_level * '  ' + line + '\n')
 
         # ending tag
         s = '</DataArray>'
@@ -238,7 +317,111 @@ class Vtk(object):
         return
 
     @staticmethod
-    def get_3d_shared_vertex_connectivity(mg):
+    def _write_pvd(fname, times, fnames):
+        """
+        Write a pvd collection of the vtu files of each time
+
+        """
+        indent_level = 0
+        f = open(fname, 'w')
+        s = '<?xml version="1.0"?>'
+        f.write(s + '\n')
+        s = '<VTKFile type="Collection" version="0.1" ' \
+            'byte_order="LittleEndian">'
+        indent_level = start_tag(f, s, indent_level)
+        indent_level = start_tag(f, '<Collection>', indent_level)
+        for t, vtu in zip(times, fnames):
+            s = '<DataSet timestep="{}" group="" part="0" ' \
+                'file="{}"/>'.format(t, os.path.basename(vtu))
+            f.write(indent_level * '  ' + s + '\n')
+        indent_level = end_tag(f, '</Collection>', indent_level)
+        indent_level = end_tag(f, '</VTKFile>', indent_level)
+        f.close()
+        return
+
+    @staticmethod
+    def _data_type(a):
+        """
+        Get the vtk type of the encoded array
+
+        """
+        if a.dtype.kind == 'f':
+            return 'Float64'
+        elif a.dtype == np.uint8:
+            return 'UInt8'
+        return 'Int64'
+
+    @staticmethod
+    def _encode(a, binary=False, compress=False):
+        """
+        Encode an array for a vtk data array
+
+        Parameters
+        ----------
+        a : ndarray
+            array of floats, integers or bytes
+        binary : bool
+            If False, the array is returned as a list of lines of text with
+            a row of a two-dimensional array on each line.  If True, the
+            array is returned as bytes with a UInt64 header of the number of
+            bytes.
+        compress : bool
+            If True, the binary data is split in blocks that are compressed
+            with zlib and the header is the number of blocks, the size of
+            the blocks, the size of the last block and the compressed size
+            of each block.
+
+        """
+        if a.dtype.kind == 'f':
+            a = a.astype('<f8')
+        elif a.dtype != np.uint8:
+            a = a.astype('<i8')
+
+        if not binary:
+            if a.ndim == 1:
+                a = a.reshape(1, -1)
+            if a.dtype.kind == 'f':
+                return [' '.join(map(repr, row)) for row in a.tolist()]
+            return [' '.join(map(str, row)) for row in a.tolist()]
+
+        b = np.ascontiguousarray(a).tobytes()
+        if not compress:
+            return np.array([len(b)], dtype='<u8').tobytes() + b
+
+        nbytes = len(b)
+        blocks = [zlib.compress(b[i:i + VTK_BLOCK_SIZE])
+                  for i in range(0, nbytes, VTK_BLOCK_SIZE)]
+        last = nbytes - (len(blocks) - 1) * VTK_BLOCK_SIZE if blocks else 0
+        header = [len(blocks), VTK_BLOCK_SIZE, last] + \
+                 [len(block) for block in blocks]
+        return np.array(header, dtype='<u8').tobytes() + b''.join(blocks)
+
+    @staticmethod
+    def get_3d_shared_vertex_connectivity(mg, ibound=None):
+        """
+        Get the points and cells of a structured grid, where cells share
+        the points at their corners.  The elevation of a point is the mean
+        of the elevations of the cells around it.
+
+        Parameters
+        ----------
+        mg : StructuredGrid
+            model grid
+        ibound : ndarray
+            cells with an ibound of zero are left out, and so are the
+            points that are only used by these cells.  If None, the idomain
+            of the model grid is used.
+
+        Returns
+        -------
+        verts : ndarray
+            (npoints, 3) coordinates of the points
+        iverts : ndarray
+            (ncells, 8) points of each cell
+
+        """
+        if ibound is None:
+            ibound = mg.idomain
 
         # get the x and y points for the grid
         x, y, z = mg.xyzvertices
@@ -252,111 +435,236 @@ class Vtk(object):
         nrvncv = nrowvert * ncolvert
         npoints = nrvncv * nlayvert
 
+        # average the elevations of the (up to four) cells around each
+        # point of the vertex grid
+        top_botm = mg.top_botm
+        zsum = np.zeros((nlayvert, nrowvert, ncolvert))
+        count = np.zeros((nrowvert, ncolvert))
+        for i in (0, 1):
+            for j in (0, 1):
+                zsum[:, i:i + mg.nrow, j:j + mg.ncol] += top_botm
+                count[i:i + mg.nrow, j:j + mg.ncol] += 1
+
         # create and fill a 3d points array for the grid
-        verts = np.empty((npoints, 3), dtype=np.float)
+        verts = np.empty((npoints, 3), dtype=np.float64)
         verts[:, 0] = np.tile(x, nlayvert)
         verts[:, 1] = np.tile(y, nlayvert)
-        istart = 0
-        istop = nrvncv
-        top_botm = mg.top_botm
-        for k in range(mg.nlay + 1):
-            verts[istart:istop, 2] = mg.interpolate(top_botm[k],
-                                                      verts[istart:istop, :2],
-                                                      method='linear')
-            istart = istop
-            istop = istart + nrvncv
+        verts[:, 2] = (zsum / count).ravel()
 
         # create the list of points comprising each cell. points must be
         # listed a specific way according to vtk requirements.
-        iverts = []
-        for k in range(mg.nlay):
-            koffset = k * nrvncv
-            for i in range(mg.nrow):
-                for j in range(mg.ncol):
-                    if mg._idomain is not None:
-                        if mg._idomain[k, i, j] == 0:
-                            continue
-                    iv1 = i * ncolvert + j + koffset
-                    iv2 = iv1 + 1
-                    iv4 = (i + 1) * ncolvert + j + koffset
-                    iv3 = iv4 + 1
-                    iverts.append([iv4 + nrvncv, iv3 + nrvncv,
-                                   iv1 + nrvncv, iv2 + nrvncv,
-                                   iv4, iv3, iv1, iv2])
+        if ibound is None:
+            k, i, j = np.indices((mg.nlay, mg.nrow, mg.ncol))
+            k, i, j = k.ravel(), i.ravel(), j.ravel()
+        else:
+            k, i, j = np.nonzero(ibound != 0)
+        iv1 = i * ncolvert + j + k * nrvncv
+        iv2 = iv1 + 1
+        iv4 = (i + 1) * ncolvert + j + k * nrvncv
+        iv3 = iv4 + 1
+        iverts = np.column_stack((iv4 + nrvncv, iv3 + nrvncv,
+                                  iv1 + nrvncv, iv2 + nrvncv,
+                                  iv4, iv3, iv1, iv2))
+
+        # renumber and reduce the vertices to the ones that are used
+        if ibound is not None:
+            used = np.zeros(npoints, dtype=bool)
+            used[iverts] = True
+            ivertrenum = np.cumsum(used) - 1
+            iverts = ivertrenum[iverts]
+            verts = verts[used]
 
         return verts, iverts
 
     @staticmethod
-    def get_3d_vertex_connectivity(mg):
-        if mg.idomain is None:
-            ncells = mg.nlay * mg.nrow * mg.ncol
-            ibound = np.ones((mg.nlay, mg.nrow, mg.ncol), dtype=np.int)
-        else:
-            ncells = (mg.idomain != 0).sum()
+    def get_3d_vertex_connectivity(mg, ibound=None, top=None):
+        """
+        Get the points and cells of a structured grid, where each cell has
+        its own eight points
+
+        Parameters
+        ----------
+        mg : StructuredGrid
+            model grid
+        ibound : ndarray
+            cells with an ibound of zero are left out.  If None, the
+            idomain of the model grid is used.
+        top : ndarray
+            (nlay, nrow, ncol) elevations of the cell tops.  If None, the
+            cell tops of the model grid are used.
+
+        Returns
+        -------
+        verts : ndarray
+            (npoints, 3) coordinates of the points
+        iverts : ndarray
+            (ncells, 8) points of each cell
+
+        """
+        if ibound is None:
             ibound = mg.idomain
-        npoints = ncells * 8
-        verts = np.empty((npoints, 3), dtype=np.float)
-        iverts = []
-        ipoint = 0
+        if ibound is None:
+            ibound = np.ones((mg.nlay, mg.nrow, mg.ncol), dtype=np.int32)
+        k, i, j = np.nonzero(ibound != 0)
+        ncells = k.shape[0]
+
         top_botm = mg.top_botm
-        for k in range(mg.nlay):
-            for i in range(mg.nrow):
-                for j in range(mg.ncol):
-                    if ibound[k, i, j] == 0:
-                        continue
-
-                    ivert = []
-                    pts = mg._cell_vert_list(i, j)
-                    pt0, pt1, pt2, pt3, pt0 = pts
-
-                    z = top_botm[k + 1, i, j]
-
-                    verts[ipoint, 0:2] = np.array(pt1)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt2)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt0)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt3)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    z = top_botm[k, i, j]
-
-                    verts[ipoint, 0:2] = np.array(pt1)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt2)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt0)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt3)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    iverts.append(ivert)
+        bot = top_botm[1:]
+        if top is None:
+            top = top_botm[:-1]
+
+        # the corners of each cell in the order (i + 1, j), (i + 1, j + 1),
+        # (i, j), (i, j + 1), at the bottom and then at the top of the cell
+        xgrid, ygrid = mg.xvertices, mg.yvertices
+        ii = i[:, None] + np.array([1, 1, 0, 0])
+        jj = j[:, None] + np.array([0, 1, 0, 1])
+
+        verts = np.empty((ncells, 8, 3), dtype=np.float64)
+        verts[:, :4, 0] = verts[:, 4:, 0] = xgrid[ii, jj]
+        verts[:, :4, 1] = verts[:, 4:, 1] = ygrid[ii, jj]
+        verts[:, :4, 2] = bot[k, i, j][:, None]
+        verts[:, 4:, 2] = top[k, i, j][:, None]
+        verts = verts.reshape(-1, 3)
+        iverts = np.arange(ncells * 8).reshape(ncells, 8)
 
         return verts, iverts
 
+    @staticmethod
+    def get_3d_polyhedron_connectivity(mg, ibound=None, shared_vertex=False,
+                                       top=None):
+        """
+        Get the points and cells of a vertex grid, where each cell is a
+        polyhedron of the cell polygon at the bottom and at the top of the
+        cell.
+
+        Parameters
+        ----------
+        mg : VertexGrid
+            model grid
+        ibound : ndarray
+            cells with an ibound of zero are left out.  If None, the
+            idomain of the model grid is used.
+        shared_vertex : bool
+            If True, cells share the points at their corners and the
+            elevation of a point is the mean of the elevations of the
+            cells around it.
+        top : ndarray
+            (nlay, ncpl) elevations of the cell tops.  If None, the cell
+            tops of the model grid are used.  top is not used if
+            shared_vertex is True.
+
+        Returns
+        -------
+        verts : ndarray
+            (npoints, 3) coordinates of the points
+        cells : list
+            (name, ndarray) of the connectivity, offsets, types, faces and
+            faceoffsets data arrays of the cells
+        icell : ndarray
+            node number of each cell
+
+        """
+        nlay, ncpl = mg.nlay, mg.ncpl
+        if ibound is None:
+            ibound = mg.idomain
+        if ibound is None:
+            ibound = np.ones((nlay, ncpl), dtype=np.int32)
+        ibound = np.asarray(ibound).reshape(nlay, ncpl)
+
+        # x and y of the vertices and the vertices of each cell
+        vertexdict = {int(v[0]): (v[1], v[2]) for v in mg._vertices}
+        ivert = np.array(sorted(vertexdict.keys()), dtype=np.int64)
+        xv = np.array([vertexdict[iv][0] for iv in ivert], dtype=np.float64)
+        yv = np.array([vertexdict[iv][1] for iv in ivert], dtype=np.float64)
+        if mg._has_ref_coordinates:
+            xv, yv = mg.get_coords(xv, yv)
+        nvert = ivert.shape[0]
+        cellverts = []
+        for cell2d in mg._cell2d:
+            cell2d = tuple(cell2d)
+            cellverts.append(np.searchsorted(
+                ivert, [int(iv) for iv in cell2d[4:] if iv is not None]))
+        ncellverts = np.array([len(cv) for cv in cellverts])
+
+        top_botm = mg.top_botm.reshape(nlay + 1, ncpl)
+        bot = top_botm[1:]
+        if top is None:
+            top = top_botm[:-1]
+        top = np.asarray(top).reshape(nlay, ncpl)
+
+        if shared_vertex:
+            # average the elevations of the cells around each vertex
+            icpl = np.repeat(np.arange(ncpl), ncellverts)
+            iv = np.concatenate(cellverts)
+            count = np.bincount(iv, minlength=nvert).astype(np.float64)
+            count[count == 0] = 1.
+            zv = np.array([np.bincount(iv, weights=z[icpl], minlength=nvert)
+                           for z in top_botm]) / count
+            verts = np.column_stack((np.tile(xv, nlay + 1),
+                                     np.tile(yv, nlay + 1), zv.ravel()))
+
+        # build the cells with the same number of vertices together
+        icell, connectivity, offsets, faces, faceoffsets = [], [], [], [], []
+        vlist = []
+        npoints = 0
+        for n in np.unique(ncellverts):
+            cpl = np.flatnonzero(ncellverts == n)
+            cv = np.array([cellverts[c] for c in cpl], dtype=np.int64)
+            k, ic = np.nonzero(ibound[:, cpl] != 0)
+            ncells = k.shape[0]
+            if ncells == 0:
+                continue
+            c = cpl[ic]
+            icell.append(k * ncpl + c)
+            if shared_vertex:
+                ibot = cv[ic] + (k[:, None] + 1) * nvert
+                itop = cv[ic] + k[:, None] * nvert
+            else:
+                v = np.empty((ncells, 2, n, 3), dtype=np.float64)
+                v[:, :, :, 0] = xv[cv[ic]][:, None, :]
+                v[:, :, :, 1] = yv[cv[ic]][:, None, :]
+                v[:, 0, :, 2] = bot[k, c][:, None]
+                v[:, 1, :, 2] = top[k, c][:, None]
+                vlist.append(v.reshape(-1, 3))
+                iv = npoints + np.arange(ncells * 2 * n).reshape(ncells, 2, n)
+                npoints += ncells * 2 * n
+                ibot, itop = iv[:, 0], iv[:, 1]
+            connectivity.append(np.hstack((ibot, itop)).ravel())
+            offsets.append(np.full(ncells, 2 * n))
+
+            # the number of faces, followed by the number of points and
+            # the points of the bottom, the top and each side face
+            sides = np.stack((ibot, np.roll(ibot, -1, axis=1),
+                              np.roll(itop, -1, axis=1), itop), axis=2)
+            sides = np.concatenate((np.full((ncells, n, 1), 4), sides),
+                                   axis=2).reshape(ncells, -1)
+            f = np.hstack((np.full((ncells, 1), n + 2),
+                           np.full((ncells, 1), n), ibot[:, ::-1],
+                           np.full((ncells, 1), n), itop, sides))
+            faces.append(f.ravel())
+            faceoffsets.append(np.full(ncells, f.shape[1]))
+
+        if not shared_vertex:
+            if vlist:
+                verts = np.concatenate(vlist)
+            else:
+                verts = np.empty((0, 3), dtype=np.float64)
+
+        def concatenate(arrays):
+            if arrays:
+                return np.concatenate(arrays)
+            return np.empty(0, dtype=np.int64)
+
+        icell = concatenate(icell)
+        ncells = icell.shape[0]
+        cells = [('connectivity', concatenate(connectivity)),
+                 ('offsets', np.cumsum(concatenate(offsets))),
+                 ('types', np.full(ncells, VTK_POLYHEDRON, dtype=np.uint8)),
+                 ('faces', concatenate(faces)),
+                 ('faceoffsets', np.cumsum(concatenate(faceoffsets)))]
+
+        return verts, cells, icell
+
 
 if __name__ == '__main__':
     import flopy
@@ -12,7 +12,10 @@ import os
 import subprocess as sp
 import shutil
 import threading
+import multiprocessing
+import time
 import warnings
+from collections import OrderedDict
 
 if sys.version_info > (3, 0):
     import queue as Queue
@@ -35,6 +38,48 @@ else:
 iconst = 1  # Multiplier for individual array elements in integer and real arrays read by MODFLOW's U2DREL, U1DREL and U2DINT.
 iprn = -1  # Printout flag. If >= 0 then array values read are printed in listing file.
 
+# model and packages that are written by the worker processes of
+# write_input(), and the state of the worker process
+_write_model = None
+_write_packages = None
+_write_state = {'worker': False, 'unit_required': False}
+
+
+class _ExternalUnitRequired(Exception):
+    """
+    Raised when a package file that is written by a worker process needs
+    an external unit number, so that it is written again in package order.
+
+    """
+    pass
+
+
+def _write_package_process(i):
+    """
+    Write the file of package i of _write_packages of _write_model in a
+    worker process.
+
+    Returns
+    -------
+    t : float
+        time in seconds to write the file
+    unit_required : bool
+        True if the package needs external unit numbers, which are only
+        handed out by the process that called write_input()
+    error : str or None
+        message of the error that occurred when writing the file
+
+    """
+    _write_state['worker'] = True
+    _write_state['unit_required'] = False
+    t, error = 0., None
+    try:
+        t = _write_model._write_package(_write_packages[i])
+    except Exception as e:
+        if not _write_state['unit_required']:
+            error = str(e)
+    return t, _write_state['unit_required'], error
+
 
 
 class FileDataEntry(object):
@@ -193,6 +238,14 @@ class BaseModel(ModelInterface):
         self.namefile_ext = namefile_ext
         self._namefile = self.__name + '.' + self.namefile_ext
         self._packagelist = []
+        # packages that were indexed from the name file by a lazy load,
+        # but have not been read yet
+        self._lazy_packages = OrderedDict()
+        self._lazy_ext_unit_dict = None
+        self._lazy_model_ws = None
+        self.lazy_load = False
+        # time in seconds to write each package file in write_input()
+        self.package_write_times = OrderedDict()
         self.heading = ''
         self.exe_name = exe_name
         self._verbose = verbose
@@ -395,6 +448,10 @@ class BaseModel(ModelInterface):
         Function to encapsulate next_ext_unit attribute
 
         """
+        if _write_state['worker']:
+            # unit numbers are only handed out in package order
+            _write_state['unit_required'] = True
+            raise _ExternalUnitRequired()
         next_unit = self._next_ext_unit + 1
         self._next_ext_unit += 1
         return next_unit
@@ -926,6 +983,9 @@ class BaseModel(ModelInterface):
                     continue
                 s += '{:14s} {:5d}  '.format(p.name[i], p.unit_number[i]) + \
                      '{:s} {:s}\n'.format(p.file_name[i], p.extra[i])
+        for filetype, (unit, item) in self._lazy_packages.items():
+            s += '{:14s} {:5d}  '.format(filetype, unit) + \
+                 '{:s} {:s}\n'.format(os.path.basename(item.filename), '')
         return s
 
     def has_package(self, name):
@@ -950,6 +1010,8 @@ class BaseModel(ModelInterface):
             for pn in p.name:
                 if pn.upper() == name:
                     return True
+        if name in self._lazy_packages:
+            return True
         return False
 
     def get_package(self, name):
@@ -966,6 +1028,11 @@ class BaseModel(ModelInterface):
         pp : Package object
             Package object of type :class:`flopy.pakbase.Package`
 
+        Notes
+        -----
+        If the model was loaded with lazy=True, a package that has not
+        been accessed yet is read from its file first.
+
         """
         if not name:
             raise ValueError('invalid package name')
@@ -973,8 +1040,31 @@ class BaseModel(ModelInterface):
         for pp in (self.packagelist):
             if pp.name[0].upper() == name:
                 return pp
+        if name in self._lazy_packages:
+            return self._load_lazy_package(name)
         return None
 
+    def _load_lazy_package(self, name):
+        """
+        Every model that supports lazy loading needs its own
+        _load_lazy_package method
+
+        """
+        raise Exception(
+            'IMPLEMENTATION ERROR: _load_lazy_package must be overloaded')
+
+    def _is_lazy_package_in_place(self, name):
+        """
+        Check if the file of a package that has not been read by a lazy
+        load is where write_input() would write it, so that it can be
+        left as it is.
+
+        """
+        unit, item = self._lazy_packages[name]
+        fn_path = os.path.join(self.model_ws,
+                               os.path.basename(item.filename))
+        return os.path.abspath(fn_path) == os.path.abspath(item.filename)
+
     def get_package_list(self, ftype=None):
         """
         Get a list of all the package names.
@@ -990,6 +1080,11 @@ class BaseModel(ModelInterface):
             Can be used to see what packages are in the model, and can then
             be used with get_package to pull out individual packages.
 
+        Notes
+        -----
+        If the model was loaded with lazy=True, packages that have not
+        been read yet are included.
+
         """
         val = []
         for pp in (self.packagelist):
@@ -997,6 +1092,9 @@ class BaseModel(ModelInterface):
                 val.append(pp.name[0].upper())
             elif pp.package_type.lower() == ftype:
                 val.append(pp.name[0].upper())
+        for name in self._lazy_packages:
+            if ftype is None or name.lower() == ftype:
+                val.append(name)
         return val
 
     def set_version(self, version):
@@ -1017,9 +1115,8 @@ class BaseModel(ModelInterface):
                   'generated by Flopy version {}.'.format(__version__)
         self.heading = heading
 
-        # set heading for each package
-        for p in self.get_package_list():
-            pak = self.get_package(p)
+        # set heading for each package that has been read
+        for pak in self.packagelist:
             heading = '# {} package for '.format(pak.name[0]) + \
                       '{}, '.format(self.version_types[self.version]) + \
                       'generated by Flopy version {}.'.format(__version__)
@@ -1199,13 +1296,28 @@ class BaseModel(ModelInterface):
 
         return None
 
-    def write_input(self, SelPackList=False, check=False):
+    def write_input(self, SelPackList=False, check=False, nworkers=1):
         """
         Write the input.
 
         Parameters
         ----------
         SelPackList : False or list of packages
+        check : boolean
+            Check model input for common errors before writing. Default False.
+        nworkers : int
+            Number of processes that write package files concurrently.
+            The processes are forked from the current process, if this is
+            not supported on the platform the files are written one after
+            another. Package files that need external unit numbers are
+            written again in package order after the processes finish, so
+            unit numbers and the name file are the same as for a single
+            process. Default 1.
+
+        Notes
+        -----
+        The time taken to write each package file is stored in the
+        package_write_times dictionary of the model.
 
         """
         if check:
@@ -1221,41 +1333,125 @@ class BaseModel(ModelInterface):
                       'preserve the precision of the parameter data.')
             self.free_format_input = True
 
+        # packages that a lazy load has not read yet are left untouched,
+        # unless their files are not in the model workspace
+        for name in list(self._lazy_packages.keys()):
+            if not self._is_lazy_package_in_place(name):
+                self.get_package(name)
+
         if self.verbose:
             print('\nWriting packages:')
 
         if SelPackList == False:
-            for p in self.packagelist:
-                if self.verbose:
-                    print('   Package: ', p.name[0])
-                # prevent individual package checks from running after
-                # model-level package check above
-                # otherwise checks are run twice
-                # or the model level check procedure would have to be split up
-                # or each package would need a check argument,
-                # or default for package level check would have to be False
-                try:
-                    p.write_file(check=False)
-                except TypeError:
-                    p.write_file()
+            packages = list(self.packagelist)
         else:
+            packages = []
             for pon in SelPackList:
-                for i, p in enumerate(self.packagelist):
+                for p in self.packagelist:
                     if pon in p.name:
-                        if self.verbose:
-                            print('   Package: ', p.name[0])
-                        try:
-                            p.write_file(check=False)
-                        except TypeError:
-                            p.write_file()
-                            break
+                        packages.append(p)
+
+        times = {}
+        if nworkers > 1 and len(packages) > 1:
+            remaining = self._write_packages_parallel(packages, nworkers,
+                                                      times)
+        else:
+            remaining = packages
+        for p in remaining:
+            times[id(p)] = self._write_package(p)
+
+        self.package_write_times = OrderedDict()
+        for p in packages:
+            name = p.name[0]
+            self.package_write_times[name] = \
+                self.package_write_times.get(name, 0.) + times[id(p)]
         if self.verbose:
+            print('\nPackage write times (s):')
+            for name, t in self.package_write_times.items():
+                print('   {:14s} {:10.3f}'.format(name, t))
             print(' ')
         # write name file
         self.write_name_file()
         # os.chdir(org_dir)
         return
 
+    def _write_package(self, p):
+        """
+        Write the file of a package and return the time it took in seconds.
+
+        """
+        if self.verbose:
+            print('   Package: ', p.name[0])
+        t0 = time.time()
+        # prevent individual package checks from running after
+        # model-level package check above
+        # otherwise checks are run twice
+        # or the model level check procedure would have to be split up
+        # or each package would need a check argument,
+        # or default for package level check would have to be False
+        try:
+            p.write_file(check=False)
+        except TypeError:
+            p.write_file()
+        return time.time() - t0
+
+    def _write_packages_parallel(self, packages, nworkers, times):
+        """
+        Write package files with a pool of worker processes, which are
+        forked from this process so that the model is not copied to them.
+
+        Parameters
+        ----------
+        packages : list of Package objects
+            packages to write
+        nworkers : int
+            number of worker processes
+        times : dict
+            write time of each package, by id of the package, which is
+            filled for the packages that were written
+
+        Returns
+        -------
+        remaining : list of Package objects
+            packages, in package order, that need external unit numbers
+            and have to be written by this process
+
+        """
+        global _write_model, _write_packages
+        if not hasattr(os, 'fork'):
+            warnings.warn('write_input(): worker processes can not be ' +
+                          'forked on this platform, writing package ' +
+                          'files one after another')
+            return packages
+        if sys.version_info >= (3, 4):
+            context = multiprocessing.get_context('fork')
+        else:
+            context = multiprocessing
+        _write_model = self
+        _write_packages = packages
+        try:
+            pool = context.Pool(min(nworkers, len(packages)))
+            try:
+                results = pool.map(_write_package_process,
+                                   range(len(packages)), chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            _write_model = None
+            _write_packages = None
+
+        remaining = []
+        for p, (t, unit_required, error) in zip(packages, results):
+            if error is not None:
+                raise Exception('error writing package {}: {}'
+                                .format(p.name[0], error))
+            if unit_required:
+                remaining.append(p)
+            else:
+                times[id(p)] = t
+        return remaining
+
     def write_name_file(self):
         """
         Every Package needs its own writenamefile function
@@ -583,7 +583,8 @@ class Modflow(BaseModel):
 
     @staticmethod
     def load(f, version='mf2005', exe_name='mf2005.exe', verbose=False,
-             model_ws='.', load_only=None, forgive=True, check=True):
+             model_ws='.', load_only=None, forgive=True, check=True,
+             lazy=False):
         """
         Load an existing MODFLOW model.
 
@@ -611,6 +612,15 @@ class Modflow(BaseModel):
             useful for debugging. Default False.
         check : boolean, optional
             Check model input for common errors. Default True.
+        lazy : boolean, optional
+            Only index the packages other than "dis" or "disu" from the name
+            file and read each of them when it is first accessed, and leave
+            OPEN/CLOSE arrays unread until their values are used. Packages
+            and OPEN/CLOSE files that have not been read are copied as they
+            are by write_input(). Internal arrays and arrays on EXTERNAL
+            units are still read with their package. Load failures are
+            raised when a package is accessed, regardless of forgive.
+            Default False.
 
         Returns
         -------
@@ -645,6 +655,7 @@ class Modflow(BaseModel):
 
         ml = Modflow(modelname, version=version, exe_name=exe_name,
                      verbose=verbose, model_ws=model_ws, **attribs)
+        ml.lazy_load = lazy
 
         files_successfully_loaded = []
         files_not_loaded = []
@@ -752,18 +763,14 @@ class Modflow(BaseModel):
         for key, item in ext_unit_dict.items():
             if item.package is not None:
                 if item.filetype in load_only:
-                    if forgive:
+                    if lazy:
+                        ml._lazy_packages[item.filetype] = (key, item)
+                        if ml.verbose:
+                            print('   {:4s} package load...deferred'
+                                  .format(item.filetype))
+                    elif forgive:
                         try:
-                            package_load_args = \
-                                list(inspect.getargspec(item.package.load))[0]
-                            if "check" in package_load_args:
-                                pck = item.package.load(
-                                        item.filename, ml,
-                                        ext_unit_dict=ext_unit_dict, check=False)
-                            else:
-                                pck = item.package.load(
-                                        item.filename, ml,
-                                        ext_unit_dict=ext_unit_dict)
+                            Modflow._load_package(item, ml, ext_unit_dict)
                             files_successfully_loaded.append(item.filename)
                             if ml.verbose:
                                 print('   {:4s} package load...success'
@@ -775,16 +782,7 @@ class Modflow(BaseModel):
                                       .format(item.filetype, e))
                             files_not_loaded.append(item.filename)
                     else:
-                        package_load_args = \
-                            list(inspect.getargspec(item.package.load))[0]
-                        if "check" in package_load_args:
-                            pck = item.package.load(
-                                item.filename, ml,
-                                ext_unit_dict=ext_unit_dict, check=False)
-                        else:
-                            pck = item.package.load(
-                                item.filename, ml,
-                                ext_unit_dict=ext_unit_dict)
+                        Modflow._load_package(item, ml, ext_unit_dict)
                         files_successfully_loaded.append(item.filename)
                         if ml.verbose:
                             print('   {:4s} package load...success'
@@ -807,7 +805,12 @@ class Modflow(BaseModel):
                 if key not in ml.pop_key_list:
                     # do not add unit number (key) if it already exists
                     if key not in ml.external_units:
-                        ml.external_fnames.append(item.filename)
+                        fname = item.filename
+                        if lazy:
+                            # keep the name file path, as this may be the
+                            # output file of a package that is read later
+                            fname = os.path.relpath(fname, model_ws)
+                        ml.external_fnames.append(fname)
                         ml.external_units.append(key)
                         ml.external_binflag.append("binary"
                                                    in item.filetype.lower())
@@ -817,14 +820,12 @@ class Modflow(BaseModel):
 
         # pop binary output keys and any external file units that are now
         # internal
-        for key in ml.pop_key_list:
-            try:
-                ml.remove_external(unit=key)
-                ext_unit_dict.pop(key)
-            except KeyError:
-                if ml.verbose:
-                    print('Warning: external file unit {} does not exist in '
-                          'ext_unit_dict.'.format(key))
+        ml._pop_external_units(ml.pop_key_list, ext_unit_dict)
+
+        # keep the name file entries for the packages that are read later
+        if ml._lazy_packages:
+            ml._lazy_ext_unit_dict = ext_unit_dict
+            ml._lazy_model_ws = model_ws
 
         # write message indicating packages that were successfully loaded
         if ml.verbose:
@@ -843,3 +844,81 @@ class Modflow(BaseModel):
 
         # return model object
         return ml
+
+    @staticmethod
+    def _load_package(item, ml, ext_unit_dict):
+        """
+        Load the package of a name file entry.
+
+        Parameters
+        ----------
+        item : NamData
+            name file entry of the package
+        ml : Modflow object
+            model the package is added to
+        ext_unit_dict : dict
+            dictionary of the name file entries
+
+        Returns
+        -------
+        pck : Package object
+
+        """
+        package_load_args = list(inspect.getargspec(item.package.load))[0]
+        if "check" in package_load_args:
+            pck = item.package.load(item.filename, ml,
+                                    ext_unit_dict=ext_unit_dict, check=False)
+        else:
+            pck = item.package.load(item.filename, ml,
+                                    ext_unit_dict=ext_unit_dict)
+        return pck
+
+    def _pop_external_units(self, units, ext_unit_dict):
+        """
+        Remove the units of binary output files and of external files that
+        were read into package arrays from the external files of the model
+        and from ext_unit_dict.
+
+        """
+        for key in units:
+            try:
+                self.remove_external(unit=key)
+                ext_unit_dict.pop(key)
+            except KeyError:
+                if self.verbose:
+                    print('Warning: external file unit {} does not exist in '
+                          'ext_unit_dict.'.format(key))
+        return
+
+    def _load_lazy_package(self, name):
+        """
+        Read a package that was indexed from the name file by a lazy load.
+
+        Parameters
+        ----------
+        name : str
+            upper case file type of the package in the name file
+
+        Returns
+        -------
+        pck : Package object
+
+        """
+        unit, item = self._lazy_packages[name]
+        npop = len(self.pop_key_list)
+        # files referenced by the package are relative to the workspace
+        # the model was loaded from, which may have changed since
+        model_ws = self._model_ws
+        self._model_ws = self._lazy_model_ws
+        try:
+            pck = Modflow._load_package(item, self, self._lazy_ext_unit_dict)
+        finally:
+            self._model_ws = model_ws
+        self._lazy_packages.pop(name)
+        for pp in self.packagelist:
+            pp.fn_path = os.path.join(self.model_ws, pp.file_name[0])
+        if self.verbose:
+            print('   {:4s} package load...success'.format(name))
+        self._pop_external_units(self.pop_key_list[npop:],
+                                 self._lazy_ext_unit_dict)
+        return pck
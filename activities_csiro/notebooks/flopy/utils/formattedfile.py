@@ -263,25 +263,26 @@ class FormattedLayerFile(LayerFile):
         # Initialize result array and put times in first column
         result = self._init_result(nstation)
 
-        istat = 1
-        for k, i, j in kijlist:
-            recordlist = []
-            ioffset_col = (i * self._col_data_size)
-            for irec, header in enumerate(self.recordarray):
-                ilay = header[
-                           'ilay'] - 1  # change ilay from header to zero-based
-                if ilay != k:
-                    continue
-                ipos = self.iposarray[irec]
-
-                # Calculate offset necessary to reach intended column
-                self.file.seek(ipos + ioffset_col, 0)
-
-                # Find the time index and then put value into result in the
-                # correct location.
-                itim = np.where(result[:, 0] == header['totim'])[0]
-                result[itim, istat] = self._read_val(j)
-            istat += 1
+        # group the stations by layer and row so that each row of each
+        # record is only read once, no matter how many stations it holds
+        stations = {}
+        for istat, (k, i, j) in enumerate(kijlist):
+            stations.setdefault(k, {}).setdefault(i, []).append((istat + 1, j))
+
+        for irec, header in enumerate(self.recordarray):
+            ilay = header['ilay'] - 1  # change ilay from header to zero-based
+            if ilay not in stations:
+                continue
+            ipos = self.iposarray[irec]
+
+            # Find the time index
+            itim = np.where(result[:, 0] == header['totim'])[0]
+            for i, row_stations in stations[ilay].items():
+                # Calculate offset necessary to reach intended row
+                self.file.seek(ipos + (i * self._col_data_size), 0)
+                row = self._read_data((1, self.ncol))[0]
+                for istat, j in row_stations:
+                    result[itim, istat] = row[j]
         return result
 
     def close(self):
@@ -6,9 +6,10 @@ recarrays, which can then be easily plotted.
 """
 
 import collections
+import mmap
 import os
 import re
-import sys
+import warnings
 from datetime import timedelta
 import numpy as np
 
@@ -27,6 +28,11 @@ class ListBudget(object):
         the text string identifying the budget table. (default is None)
     timeunit : str
         the time unit to return in the recarray. (default is 'days')
+    cache_index : bool
+        If True, the budget recarrays are written to an index file named
+        file_name + '.idx.npz', and are read from it instead of parsing
+        the list file again as long as the list file is unchanged.
+        (default is False)
 
     Notes
     -----
@@ -42,15 +48,15 @@ class ListBudget(object):
 
     """
 
-    def __init__(self, file_name, budgetkey=None, timeunit='days'):
+    def __init__(self, file_name, budgetkey=None, timeunit='days',
+                 cache_index=False):
 
-        # Set up file reading
+        # Set up file reading, the file is read through a memory map
         assert os.path.exists(file_name),"file_name {0} not found".format(file_name)
         self.file_name = file_name
-        if sys.version_info[0] == 2:
-            self.f = open(file_name, 'r')
-        elif sys.version_info[0] == 3:
-            self.f = open(file_name, 'r', encoding='ascii', errors='replace')
+        self.cache_index = cache_index
+        self.index_filename = file_name + '.idx.npz'
+        self._mm = None
 
         self.tssp_lines = 0
 
@@ -93,9 +99,6 @@ class ListBudget(object):
         if len(self.idx_map) > 0:
             self._isvalid = True
 
-        # Close the open file
-        self.f.close()
-
         # return
         return
 
@@ -275,24 +278,24 @@ class ListBudget(object):
         if not self._isvalid:
             return None
 
-        # reopen the file
-        if sys.version_info[0] == 2:
-            self.f = open(self.file_name, 'r')
-        elif sys.version_info[0] == 3:
-            self.f = open(self.file_name, 'r', encoding='ascii', errors='replace')
         units = units.lower()
         if not units == 'seconds' and not units == 'minutes' and not units == 'hours':
             raise('"units" input variable must be "minutes", "hours", or "seconds": {0} was specified'.format(units))
-        try:
-            seekpoint = self._seek_to_string('Elapsed run time:')
-        except:
+        self._open_mmap()
+        if self._mm is None:
+            seekpoint = -1
+        else:
+            try:
+                seekpoint = self._find_line('Elapsed run time:', 0)
+                if seekpoint >= 0:
+                    line = self._read_lines(seekpoint, nlines=1)[0]
+            finally:
+                self._mm.close()
+                self._mm = None
+        if seekpoint < 0:
             print('Elapsed run time not included in list file. Returning NaN')
             return np.nan
 
-        self.f.seek(seekpoint)
-        line = self.f.readline()
-
-        self.f.close()
         # yank out the floating point values from the Elapsed run time string
         times = list(map(float, re.findall(r'[+-]?[0-9.]+', line)))
         # pad an array with zeros and times with [days, hours, minutes, seconds]
@@ -509,54 +512,76 @@ class ListBudget(object):
         return
 
     def _get_index(self, maxentries):
-        # --parse through the file looking for matches and parsing ts and sp
+        # --search the memory map for the budget key and parse ts and sp
         idxs = []
-        l_count = 1
-        while True:
-            seekpoint = self.f.tell()
-            line = self.f.readline()
-            if line == '':
+        key = self.budgetkey.encode()
+        ipos = self._mm.find(key)
+        while ipos >= 0:
+            seekpoint = self._mm.rfind(b'\n', 0, ipos) + 1
+            line = self._read_lines(seekpoint, self.tssp_lines + 1)[-1]
+            try:
+                ts, sp = self._get_ts_sp(line)
+            except:
+                print('unable to cast ts,sp at file position', seekpoint,
+                      ' line: ', line)
                 break
-            if self.budgetkey in line:
-                for l in range(self.tssp_lines):
-                    line = self.f.readline()
-                try:
-                    ts, sp = self._get_ts_sp(line)
-                except:
-                    print('unable to cast ts,sp on line number', l_count,
-                          ' line: ', line)
-                    break
-                # print('info found for timestep stress period',ts,sp)
+            # print('info found for timestep stress period',ts,sp)
 
-                idxs.append([ts, sp, seekpoint])
+            idxs.append([ts, sp, seekpoint])
 
-                if maxentries and len(idxs) >= maxentries:
-                    break
+            if maxentries and len(idxs) >= maxentries:
+                break
+
+            # continue the search on the line after the budget key
+            ipos = self._mm.find(b'\n', ipos)
+            if ipos < 0:
+                break
+            ipos = self._mm.find(key, ipos)
 
         return idxs
 
-    def _seek_to_string(self, s):
+    def _find_line(self, s, start):
         """
         Parameters
         ----------
         s : str
-            Seek through the file to the next occurrence of s.  Return the
-            seek location when found.
+            Search the memory map of the file for the next occurrence of s
+            after position start.
+        start : int
+            The file position to start the search at.
 
         Returns
         -------
         seekpoint : int
-            Next location of the string
+            Location of the start of the line containing s, or -1 if s is
+            not found.
 
         """
-        while True:
-            seekpoint = self.f.tell()
-            line = self.f.readline()
-            if line == '':
-                break
-            if s in line:
-                break
-        return seekpoint
+        ipos = self._mm.find(s.encode(), start)
+        if ipos < 0:
+            return ipos
+        return self._mm.rfind(b'\n', 0, ipos) + 1
+
+    def _read_lines(self, seekpoint, nlines=None, end=None):
+        """
+        Read lines from the memory map of the file, starting at seekpoint.
+        Either nlines lines or the lines up to and including the line at
+        file position end are returned, with fewer lines returned if the
+        end of the file is reached.
+
+        """
+        if end is None:
+            end = seekpoint - 1
+            for i in range(nlines):
+                end = self._mm.find(b'\n', end + 1)
+                if end < 0:
+                    break
+        else:
+            end = self._mm.find(b'\n', end)
+        if end < 0:
+            end = len(self._mm)
+        s = self._mm[seekpoint:end + 1].decode('ascii', 'replace')
+        return s.splitlines(True)
 
     def _get_ts_sp(self, line):
         """
@@ -597,33 +622,51 @@ class ListBudget(object):
         except:
             raise Exception('unable to read budget information from first '
                             'entry in list file')
-        self.entries = incdict.keys()
+        self.entries = list(incdict.keys())
         null_entries = collections.OrderedDict()
-        incdict = collections.OrderedDict()
-        cumdict = collections.OrderedDict()
         for entry in self.entries:
-            incdict[entry] = []
-            cumdict[entry] = []
             null_entries[entry] = np.NaN
         self.null_entries = [null_entries, null_entries]
         return incdict, cumdict
 
     def _load(self, maxentries=None):
-        self._build_index(maxentries)
-        incdict, cumdict = self._set_entries()
-        if incdict is None and cumdict is None:
+        """
+        Find the budget tables and time summaries in a single pass over a
+        memory map of the list file and fill the incremental and
+        cumulative recarrays.  If cache_index is True, the recarrays are
+        read from the index file when it was written for the current
+        version of the list file and are written to it otherwise.
+
+        """
+        if maxentries is None and self.cache_index and self._load_index():
+            return
+        self._open_mmap()
+        if self._mm is None:
             return
-        totim = []
-        for ts, sp, seekpoint in self.idx_map:
-            tinc, tcum = self._get_sp(ts, sp, seekpoint)
-            for entry in self.entries:
-                incdict[entry].append(tinc[entry])
-                cumdict[entry].append(tcum[entry])
-
-            # Get the time for this record
-            seekpoint = self._seek_to_string('TIME SUMMARY AT END')
-            tslen, sptim, tt = self._get_totim(ts, sp, seekpoint)
-            totim.append(tt)
+        try:
+            self._build_index(maxentries)
+            incdict, cumdict = self._set_entries()
+            if incdict is None and cumdict is None:
+                return
+            nrecords = len(self.idx_map)
+            nentries = len(self.entries)
+            incvals = np.empty((nrecords, nentries), dtype=np.float64)
+            cumvals = np.empty((nrecords, nentries), dtype=np.float64)
+            totim = np.empty(nrecords, dtype=np.float64)
+            for i, (ts, sp, seekpoint) in enumerate(self.idx_map):
+                if i > 0:
+                    incdict, cumdict = self._get_sp(ts, sp, seekpoint)
+                incvals[i] = [incdict.get(entry, np.NaN)
+                              for entry in self.entries]
+                cumvals[i] = [cumdict.get(entry, np.NaN)
+                              for entry in self.entries]
+
+                # Get the time for this record
+                seekpoint = self._find_line('TIME SUMMARY AT END', seekpoint)
+                tslen, sptim, totim[i] = self._get_totim(ts, sp, seekpoint)
+        finally:
+            self._mm.close()
+            self._mm = None
 
         # get kstp and kper
         idx_array = np.array(self.idx_map)
@@ -635,58 +678,123 @@ class ListBudget(object):
             dtype_tups.append((entry, np.float32))
         dtype = np.dtype(dtype_tups)
 
-        # create recarray
-        nentries = len(incdict[entry])
-        self.inc = np.recarray(shape=(nentries,), dtype=dtype)
-        self.cum = np.recarray(shape=(nentries,), dtype=dtype)
+        # create and fill the incremental and cumulative recarrays, with
+        # zero-based kstp and kper
+        self.inc = np.recarray(shape=(nrecords,), dtype=dtype)
+        self.cum = np.recarray(shape=(nrecords,), dtype=dtype)
+        for rec, vals in ((self.inc, incvals), (self.cum, cumvals)):
+            rec['totim'] = totim
+            rec["time_step"] = idx_array[:, 0] - 1
+            rec["stress_period"] = idx_array[:, 1] - 1
+            for j, entry in enumerate(self.entries):
+                rec[entry] = vals[:, j]
+
+        if maxentries is None and self.cache_index:
+            self._save_index()
+        return
 
-        # fill each column of the recarray
-        for entry in self.entries:
-            self.inc[entry] = incdict[entry]
-            self.cum[entry] = cumdict[entry]
+    def _open_mmap(self):
+        """
+        Open a read-only memory map of the list file.  The memory map is
+        None for an empty file, which can not be memory mapped.
+
+        """
+        with open(self.file_name, 'rb') as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self._mm = None
+        return
 
-        # file the totim, time_step, and stress_period columns for the
-        # incremental and cumulative recarrays (zero-based kstp,kper)
-        self.inc['totim'] = np.array(totim)[:]
-        self.inc["time_step"] = idx_array[:, 0] - 1
-        self.inc["stress_period"] = idx_array[:, 1] - 1
+    def _load_index(self):
+        """
+        Read idx_map and the incremental and cumulative recarrays from the
+        index file.
+
+        Returns
+        -------
+        success : bool
+            False if the index file does not exist, can not be read, or
+            was written for a different version of the list file or for a
+            different budget key or time unit.
+
+        """
+        if not os.path.isfile(self.index_filename):
+            return False
+        try:
+            with np.load(self.index_filename) as index:
+                if not np.array_equal(index['signature'],
+                                      self._index_signature()):
+                    return False
+                if list(index['key']) != [self.budgetkey, self.timeunit]:
+                    return False
+                idx_map = index['idx_map']
+                inc = index['inc']
+                cum = index['cum']
+        except Exception:
+            return False
+        self.idx_map = idx_map.tolist()
+        self.inc = inc.view(np.recarray)
+        self.cum = cum.view(np.recarray)
+        self.entries = list(self.inc.dtype.names[3:])
+        null_entries = collections.OrderedDict()
+        for entry in self.entries:
+            null_entries[entry] = np.NaN
+        self.null_entries = [null_entries, null_entries]
+        return True
 
-        self.cum['totim'] = np.array(totim)[:]
-        self.cum["time_step"] = idx_array[:, 0] - 1
-        self.cum["stress_period"] = idx_array[:, 1] - 1
+    def _save_index(self):
+        """
+        Write idx_map and the incremental and cumulative recarrays to the
+        index file, so that the next ListBudget for this file can skip
+        parsing it.
 
+        """
+        try:
+            with open(self.index_filename, 'wb') as f:
+                np.savez(f, signature=self._index_signature(),
+                         key=np.array([self.budgetkey, self.timeunit]),
+                         idx_map=np.array(self.idx_map, dtype=np.int64),
+                         inc=np.asarray(self.inc), cum=np.asarray(self.cum))
+        except (IOError, OSError) as e:
+            warnings.warn('unable to write list file index file ' +
+                          '{}: {}'.format(self.index_filename, str(e)))
         return
 
+    def _index_signature(self):
+        """
+        Get the modification time and size of the list file, which
+        identify the version of the file that an index file was written
+        for.
+
+        """
+        st = os.stat(self.file_name)
+        return np.array([st.st_mtime_ns, st.st_size], dtype=np.int64)
+
     def _get_sp(self, ts, sp, seekpoint):
-        self.f.seek(seekpoint)
-        # --read to the start of the "in" budget information
-        while True:
-            line = self.f.readline()
-            if line == '':
-                print(
-                        'end of file found while seeking budget information for ts,sp',
-                        ts, sp)
-                return self.null_entries
+        # --read the budget table, which ends with the percent discrepancy
+        ipos = self._mm.find(b'PERCENT DISCREPANCY', seekpoint)
+        if ipos < 0:
+            print(
+                    'end of file found while seeking budget information for ts,sp',
+                    ts, sp)
+            return self.null_entries
+        lines = iter(self._read_lines(seekpoint, end=ipos))
 
+        # --read to the start of the "in" budget information
+        for line in lines:
             # --if there are two '=' in this line, then it is a budget line
-            if len(re.findall('=', line)) == 2:
+            if line.count('=') == 2:
                 break
 
         tag = 'IN'
         incdict = collections.OrderedDict()
         cumdict = collections.OrderedDict()
         while True:
-
-            if line == '':
-                # raise Exception('end of file found while seeking budget information')
-                print(
-                        'end of file found while seeking budget information for ts,sp',
-                        ts, sp)
-                return self.null_entries
-            if len(re.findall('=', line)) == 2:
+            if line.count('=') == 2:
                 try:
                     entry, flux, cumu = self._parse_budget_line(line)
-                except e:
+                except Exception:
                     print('error parsing budget line in ts,sp', ts, sp)
                     return self.null_entries
                 if flux is None:
@@ -712,12 +820,17 @@ class ListBudget(object):
                     key = '{}_{}'.format(entry.replace(' ', '_'), tag)
                 incdict[key] = flux
                 cumdict[key] = cumu
+                if entry.upper() == 'PERCENT DISCREPANCY':
+                    break
             else:
                 if 'OUT:' in line.upper():
                     tag = 'OUT'
-            line = self.f.readline()
-            if entry.upper() == 'PERCENT DISCREPANCY':
-                break
+            line = next(lines, '')
+            if line == '':
+                print(
+                        'end of file found while seeking budget information for ts,sp',
+                        ts, sp)
+                return self.null_entries
 
         return incdict, cumdict
 
@@ -754,11 +867,17 @@ class ListBudget(object):
         return entry, flux, cumu
 
     def _get_totim(self, ts, sp, seekpoint):
-        self.f.seek(seekpoint)
+        if seekpoint < 0:
+            print(
+                    'end of file found while seeking time information for ts,sp',
+                    ts, sp)
+            return np.NaN, np.NaN, np.NaN
+        # --the time summary has at most three header lines
+        lines = iter(self._read_lines(seekpoint, nlines=6))
         # --read header lines
         ihead = 0
         while True:
-            line = self.f.readline()
+            line = next(lines, '')
             ihead += 1
             if line == '':
                 print(
@@ -768,19 +887,19 @@ class ListBudget(object):
             elif ihead == 2 and 'SECONDS     MINUTES      HOURS       DAYS        YEARS' not in line:
                 break
             elif '-----------------------------------------------------------' in line:
-                line = self.f.readline()
+                line = next(lines, '')
                 break
         tslen = self._parse_time_line(line)
         if tslen is None:
             print('error parsing tslen for ts,sp', ts, sp)
             return np.NaN, np.NaN, np.NaN
 
-        sptim = self._parse_time_line(self.f.readline())
+        sptim = self._parse_time_line(next(lines, ''))
         if sptim is None:
             print('error parsing sptim for ts,sp', ts, sp)
             return np.NaN, np.NaN, np.NaN
 
-        totim = self._parse_time_line(self.f.readline())
+        totim = self._parse_time_line(next(lines, ''))
         if totim is None:
             print('error parsing totim for ts,sp', ts, sp)
             return np.NaN, np.NaN, np.NaN
@@ -7,20 +7,309 @@ important classes that can be accessed by the user.
 
 """
 
+import io
 import itertools
-import collections
+import os
 import warnings
 import numpy as np
 
 try:
-    from numpy.lib.recfunctions import append_fields, stack_arrays
+    from numpy.lib.recfunctions import stack_arrays
 except:
     pass
 from ..utils.flopy_io import loadtxt
 from ..utils.recarray_utils import ra_slice
 
 
-class PathlineFile():
+class _ModpathFile(object):
+    """
+    Base class for the MODPATH pathline and endpoint files, which reads the
+    particle data in chunks and indexes them by particle id.
+
+    The particle data are either held in memory or, if cache_data is True,
+    written to a binary cache file (filename + '.npy') with the particle
+    index in an index file (filename + '.idx.npz').  The cache file is
+    memory mapped, so that queries only read the rows that are needed, and
+    it is reused as long as the MODPATH file is unchanged.
+
+    Derived classes set sort_data and implement _read_chunks().  If
+    sort_data is True, the data are stored sorted by particle id, so that
+    the rows of each particle are a contiguous row range.  Otherwise the
+    data are stored in file order and the index holds the rows sorted by
+    particle id.
+
+    """
+    sort_data = True
+
+    def _load_data(self, cache_data=False, chunksize=100000):
+        """
+        Read the particle data from the file or the cache file and build
+        the particle index.
+
+        """
+        self.chunksize = chunksize
+        self.data_filename = self.fname + '.npy'
+        self.index_filename = self.fname + '.idx.npz'
+        self._order = None
+        if cache_data:
+            if not self._load_cache():
+                self._write_cache()
+                if not self._load_cache():
+                    msg = 'unable to read particle data from ' + \
+                          '{}'.format(self.data_filename)
+                    raise Exception(msg)
+            if self.verbose:
+                print('particle data memory mapped from ' +
+                      '{}'.format(self.data_filename))
+            return
+
+        chunks = list(self._read_chunks())
+        if len(chunks) == 1:
+            data = chunks[0]
+        elif len(chunks) > 1:
+            data = np.concatenate(chunks)
+        else:
+            data = np.zeros(0, dtype=self.dtype)
+        order = np.argsort(data['particleid'], kind='mergesort')
+        partids, counts = np.unique(data['particleid'], return_counts=True)
+        if self.sort_data:
+            if np.any(np.diff(order) < 0):
+                data = data[order]
+        else:
+            self._order = order
+        self._data = data
+        self._set_index(partids, counts)
+        return
+
+    def _set_index(self, partids, counts):
+        """
+        Set the sorted particle ids and the start of the rows of each
+        particle, in the data or in the sorted rows.
+
+        """
+        self._partids = partids
+        self._partpos = np.zeros(len(partids) + 1, dtype=np.int64)
+        self._partpos[1:] = np.cumsum(counts)
+        return
+
+    def _read_chunks(self):
+        """
+        Read the particle data from the file in chunks of at most about
+        chunksize rows.  Must be overridden.
+
+        """
+        raise NotImplementedError('must be overridden...')
+
+    def _read_text_chunks(self, dtype):
+        """
+        Read chunks of particle data that have one row per line.
+
+        """
+        for n in range(self.skiprows):
+            self.file.readline()
+        while True:
+            lines = list(itertools.islice(self.file, self.chunksize))
+            if len(lines) == 0:
+                break
+            yield loadtxt(io.StringIO(''.join(lines)), dtype=dtype)
+
+    def _to_zero_based(self, data):
+        """
+        Convert layer, row, and column indices; particle id and group; and
+        line segment indices to zero-based.
+
+        """
+        for n in self.kijnames:
+            if n in data.dtype.names:
+                data[n] -= 1
+        return data
+
+    def _get_rows(self, partid):
+        """
+        Get the rows of particle partid in the particle data, as a slice
+        if the data are sorted by particle id.
+
+        """
+        i = np.searchsorted(self._partids, partid)
+        if i < len(self._partids) and self._partids[i] == partid:
+            i0, i1 = self._partpos[i], self._partpos[i + 1]
+        else:
+            i0, i1 = 0, 0
+        if self._order is None:
+            return slice(i0, i1)
+        return self._order[i0:i1]
+
+    def _get_partids_data(self, partids):
+        """
+        Get the particle data of particles partids, ordered by particle id.
+
+        """
+        rows = [self._get_rows(partid) for partid in np.unique(partids)]
+        if len(rows) == 0:
+            return self._data[0:0].copy()
+        if self._order is None:
+            return np.concatenate([self._data[row] for row in rows])
+        return self._data[np.concatenate(rows)]
+
+    def _iter_data(self):
+        """
+        Iterate over the particle data in chunks of chunksize rows.
+
+        """
+        nrows = self._data.shape[0]
+        for i0 in range(0, max(nrows, 1), self.chunksize):
+            yield self._data[i0:i0 + self.chunksize]
+
+    def _get_storage_dtype(self, dtype):
+        """
+        Get the dtype of the cached data.  Text columns that pandas read as
+        objects are stored with the dtype of the file.
+
+        """
+        descr = []
+        for name in dtype.names:
+            if dtype[name].kind == 'O':
+                descr.append((name, self.dtype[name]))
+            else:
+                descr.append((name, dtype[name]))
+        return np.dtype(descr)
+
+    def _write_cache(self):
+        """
+        Read the particle data from the file in chunks and write them to
+        the cache file, sorted by particle id if sort_data is True, and
+        the particle index to the index file.  The chunks are first
+        written to a temporary file, together with the number of rows of
+        each particle, and are then copied to the rows of each particle in
+        the cache file.
+
+        """
+        tmp_filename = self.data_filename + '.tmp'
+        dtype = None
+        counts = np.zeros(0, dtype=np.int64)
+        pids = []
+        nrows = 0
+        with open(tmp_filename, 'wb') as f:
+            for chunk in self._read_chunks():
+                if dtype is None:
+                    dtype = self._get_storage_dtype(chunk.dtype)
+                chunk = np.asarray(chunk).astype(dtype)
+                pid = chunk['particleid']
+                if pid.size > 0 and pid.min() < 0:
+                    raise Exception('particle ids must be greater than or '
+                                    'equal to 0 to be cached')
+                c = np.bincount(pid, minlength=counts.shape[0])
+                c[:counts.shape[0]] += counts
+                counts = c
+                if not self.sort_data:
+                    pids.append(pid)
+                f.write(chunk.tobytes())
+                nrows += chunk.shape[0]
+        if dtype is None:
+            dtype = self.dtype
+        partids = np.nonzero(counts)[0].astype(np.int32)
+        self._set_index(partids, counts[partids])
+
+        if self.sort_data:
+            # position of the next row of each particle in the cache file
+            fill = np.zeros(counts.shape[0], dtype=np.int64)
+            fill[partids] = self._partpos[:-1]
+            order = None
+        else:
+            order = np.argsort(np.concatenate(pids), kind='mergesort')
+        try:
+            if nrows == 0:
+                np.save(self.data_filename, np.zeros(0, dtype=dtype))
+            else:
+                tmp = np.memmap(tmp_filename, dtype=dtype, mode='r',
+                                shape=(nrows,))
+                data = np.lib.format.open_memmap(self.data_filename,
+                                                 mode='w+', dtype=dtype,
+                                                 shape=(nrows,))
+                for i0 in range(0, nrows, self.chunksize):
+                    chunk = np.array(tmp[i0:i0 + self.chunksize])
+                    if not self.sort_data:
+                        data[i0:i0 + chunk.shape[0]] = chunk
+                        continue
+                    # rows of the chunk sorted by particle id and their
+                    # rank among the rows of the same particle
+                    pid = chunk['particleid']
+                    isort = np.argsort(pid, kind='mergesort')
+                    spid = pid[isort]
+                    rank = np.arange(spid.shape[0]) - \
+                           np.searchsorted(spid, spid, side='left')
+                    data[fill[spid] + rank] = chunk[isort]
+                    fill += np.bincount(pid, minlength=fill.shape[0])
+                data.flush()
+                del data, tmp
+        finally:
+            os.remove(tmp_filename)
+
+        try:
+            with open(self.index_filename, 'wb') as f:
+                if order is None:
+                    np.savez(f, signature=self._index_signature(),
+                             partids=self._partids, partpos=self._partpos)
+                else:
+                    np.savez(f, signature=self._index_signature(),
+                             partids=self._partids, partpos=self._partpos,
+                             order=order)
+        except (IOError, OSError) as e:
+            warnings.warn('unable to write particle index file ' +
+                          '{}: {}'.format(self.index_filename, str(e)))
+        return
+
+    def _load_cache(self):
+        """
+        Memory map the cache file and read the particle index from the
+        index file.
+
+        Returns
+        -------
+        success : bool
+            False if the cache or index file does not exist, can not be
+            read, or was written for a different version of the MODPATH
+            file.
+
+        """
+        if not os.path.isfile(self.data_filename) or \
+                not os.path.isfile(self.index_filename):
+            return False
+        try:
+            with np.load(self.index_filename) as index:
+                if not np.array_equal(index['signature'],
+                                      self._index_signature()):
+                    return False
+                partids = index['partids']
+                partpos = index['partpos']
+                order = None
+                if not self.sort_data:
+                    order = index['order']
+            if partpos[-1] == 0:
+                data = np.load(self.data_filename)
+            else:
+                data = np.load(self.data_filename, mmap_mode='r')
+        except Exception:
+            return False
+        if data.shape[0] != partpos[-1]:
+            return False
+        self._data = data.view(np.ndarray)
+        self._partids = partids
+        self._partpos = partpos
+        self._order = order
+        return True
+
+    def _index_signature(self):
+        """
+        Get the modification time and size of the MODPATH file, which
+        identify the version of the file that the cache was written for.
+
+        """
+        st = os.stat(self.fname)
+        return np.array([st.st_mtime_ns, st.st_size], dtype=np.int64)
+
+
+class PathlineFile(_ModpathFile):
     """
     PathlineFile Class.
 
@@ -30,6 +319,14 @@ class PathlineFile():
         Name of the pathline file
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_data : bool
+        If True, the pathline data are written to a binary cache file
+        (filename + '.npy') that is memory mapped instead of being held in
+        memory, and that is reused as long as the pathline file is
+        unchanged.  Default is False.
+    chunksize : int
+        Number of rows of the pathline file that are read at a time.
+        Default is 100000.
 
     Examples
     --------
@@ -42,7 +339,8 @@ class PathlineFile():
                 'particleid', 'particlegroup', 'linesegmentindex',
                 'particleidloc', 'sequencenumber']
 
-    def __init__(self, filename, verbose=False):
+    def __init__(self, filename, verbose=False, cache_data=False,
+                 chunksize=100000):
         """
         Class constructor.
 
@@ -56,24 +354,15 @@ class PathlineFile():
         # set output dtype
         self.outdtype = self._get_outdtype()
 
-        # set data dtype and read pathline data
+        # set data dtype and read pathline data sorted by particle id
         if self.version == 7:
-            self.dtype, self._data = self._get_mp7data()
+            self.dtyper, self.dtype = self._get_mp7dtypes()
         else:
             self.dtype = self._get_dtypes()
-            self._data = loadtxt(self.file, dtype=self.dtype,
-                                 skiprows=self.skiprows)
-
-        # convert layer, row, and column indices; particle id and group; and
-        #  line segment indices to zero-based
-        for n in self.kijnames:
-            try:
-                self._data[n] -= 1
-            except:
-                pass
+        self._load_data(cache_data=cache_data, chunksize=chunksize)
 
         # set number of particle ids
-        self.nid = np.unique(self._data['particleid'])
+        self.nid = self._partids
 
         # close the input file
         self.file.close()
@@ -152,8 +441,7 @@ class PathlineFile():
                              ("particleid", np.int32)])
         return outdtype
 
-    def _get_mp7data(self):
-        data = None
+    def _get_mp7dtypes(self):
         dtyper = np.dtype([("node", np.int32), ("x", np.float32),
                            ("y", np.float32), ("z", np.float32),
                            ("time", np.float32), ("xloc", np.float32),
@@ -170,55 +458,62 @@ class PathlineFile():
                           ("xloc", np.float32), ("yloc", np.float32),
                           ("zloc", np.float32),
                           ("stressperiod", np.int32), ("timestep", np.int32)])
-        idx = 0
-        part_dict = collections.OrderedDict()
-        ndata = 0
+        return dtyper, dtype
+
+    def _read_chunks(self):
+        if self.version == 7:
+            chunks = self._read_mp7_chunks()
+        else:
+            chunks = self._read_text_chunks(self.dtype)
+        for chunk in chunks:
+            yield self._to_zero_based(chunk)
+
+    def _read_mp7_chunks(self):
+        """
+        Read chunks of MODPATH 7 pathline data, which are written as a
+        header line followed by the points of each pathline.
+
+        """
+        for n in range(self.skiprows):
+            self.file.readline()
+        headers = []
+        lines = []
         while True:
-            if idx == 0:
-                for n in range(self.skiprows):
-                    line = self.file.readline()
             # read header line
-            try:
-                line = self.file.readline().strip()
-                if self.verbose:
-                    print(line)
-                if len(line) < 1:
-                    break
-            except:
+            line = self.file.readline().strip()
+            if self.verbose:
+                print(line)
+            if len(line) > 0:
+                t = [int(s) for j, s in enumerate(line.split()) if j < 4]
+                headers.append(t[0:4])
+                # read the particle data lines
+                lines += itertools.islice(self.file, 0, t[3])
+            if len(lines) >= self.chunksize or \
+                    (len(line) < 1 and len(lines) > 0):
+                yield self._get_mp7chunk(headers, lines)
+                headers = []
+                lines = []
+            if len(line) < 1:
                 break
-            t = [int(s) for j, s in enumerate(line.split()) if j < 4]
-            sequencenumber, group, particleid, pathlinecount = t[0:4]
-            ndata += pathlinecount
-            # read in the particle data
-            d = np.loadtxt(itertools.islice(self.file, 0, pathlinecount),
-                           dtype=dtyper)
-            key = (idx, sequencenumber, group, particleid, pathlinecount)
-            part_dict[key] = d.copy()
-            idx += 1
-
-        # create data array
-        data = np.zeros(ndata, dtype=dtype)
-
-        # fill data
-        ipos0 = 0
-        for key, value in part_dict.items():
-            idx, sequencenumber, group, particleid, pathlinecount = key[0:5]
-            ipos1 = ipos0 + pathlinecount
-            # fill constant items for particle
-            # particleid is not necessarily unique for all pathlines - use
-            # sequencenumber which is unique
-            data['particleid'][ipos0:ipos1] = sequencenumber
-            # set particlegroup and sequence number
-            data['particlegroup'][ipos0:ipos1] = group
-            data['sequencenumber'][ipos0:ipos1] = sequencenumber
-            # save particleidloc to particleid
-            data['particleidloc'][ipos0:ipos1] = particleid
-            # fill particle data
-            for name in value.dtype.names:
-                data[name][ipos0:ipos1] = value[name]
-            ipos0 = ipos1
-
-        return dtype, data
+
+    def _get_mp7chunk(self, headers, lines):
+        d = np.loadtxt(lines, dtype=self.dtyper, ndmin=1)
+        headers = np.array(headers, dtype=np.int32)
+        sequencenumber, group, particleid, pathlinecount = headers.T
+        data = np.zeros(d.shape[0], dtype=self.dtype)
+        # fill constant items for particle
+        # particleid is not necessarily unique for all pathlines - use
+        # sequencenumber which is unique
+        data['particleid'] = np.repeat(sequencenumber, pathlinecount)
+        # set particlegroup and sequence number
+        data['particlegroup'] = np.repeat(group, pathlinecount)
+        data['sequencenumber'] = np.repeat(sequencenumber, pathlinecount)
+        # save particleidloc to particleid
+        data['particleidloc'] = np.repeat(particleid, pathlinecount)
+        # fill particle data
+        for name in d.dtype.names:
+            data[name] = d[name]
+        return data
 
     def get_maxid(self):
         """
@@ -230,7 +525,7 @@ class PathlineFile():
             Maximum pathline number.
 
         """
-        return self._data['particleid'].max()
+        return self._partids.max()
 
     def get_maxtime(self):
         """
@@ -282,17 +577,13 @@ class PathlineFile():
         >>> p1 = pthobj.get_data(partid=1)
 
         """
-        # idx = self._data['particleid'] == partid
+        ta = self._data[self._get_rows(partid)]
         if totim is not None:
             if ge:
-                idx = (self._data['time'] >= totim) & \
-                      (self._data['particleid'] == partid)
+                ta = ta[ta['time'] >= totim]
             else:
-                idx = (self._data['time'] <= totim) & \
-                      (self._data['particleid'] == partid)
-        else:
-            idx = self._data['particleid'] == partid
-        self._ta = self._data[idx]
+                ta = ta[ta['time'] <= totim]
+        self._ta = ta
         names = ['x', 'y', 'z', 'time', 'k', 'particleid']
         return np.rec.fromarrays((self._ta[name] for name in names),
                                  dtype=self.outdtype)
@@ -370,48 +661,46 @@ class PathlineFile():
 
         """
 
-        # create local copy of _data
-        ra = np.array(self._data)
-
-        # find the intersection of pathlines and dest_cells
-        # convert dest_cells to same dtype for comparison
-        if self.version < 7:
-            try:
-                raslice = ra[['k', 'i', 'j']]
-            except:
-                msg = "could not extract 'k', 'i', and 'j' keys " + \
-                      "from pathline data"
-                raise KeyError(msg)
-        else:
-            try:
-                raslice = ra[['node']]
-            except:
-                msg = "could not extract 'node' key from pathline data"
-                raise KeyError(msg)
-            if isinstance(dest_cells, (list, tuple)):
-                allint = all(isinstance(el, int) for el in dest_cells)
-                # convert to a list of tuples
-                if allint:
-                    t = []
-                    for el in dest_cells:
-                        t.append((el,))
-                        dest_cells = t
-
-        dest_cells = np.array(dest_cells, dtype=raslice.dtype)
-        inds = np.in1d(raslice, dest_cells)
-        epdest = ra[inds].copy().view(np.recarray)
+        # find the particles whose pathlines intersect dest_cells, reading
+        # the pathline data in chunks
+        partids = []
+        for ra in self._iter_data():
+            # convert dest_cells to same dtype for comparison
+            if self.version < 7:
+                try:
+                    raslice = ra[['k', 'i', 'j']]
+                except:
+                    msg = "could not extract 'k', 'i', and 'j' keys " + \
+                          "from pathline data"
+                    raise KeyError(msg)
+            else:
+                try:
+                    raslice = ra[['node']]
+                except:
+                    msg = "could not extract 'node' key from pathline data"
+                    raise KeyError(msg)
+                if isinstance(dest_cells, (list, tuple)):
+                    allint = all(isinstance(el, int) for el in dest_cells)
+                    # convert to a list of tuples
+                    if allint:
+                        t = []
+                        for el in dest_cells:
+                            t.append((el,))
+                            dest_cells = t
+
+            dest = np.array(dest_cells, dtype=raslice.dtype)
+            inds = np.in1d(raslice, dest)
+            partids.append(np.unique(ra['particleid'][inds]))
+
+        # get list of unique particleids in selection
+        partids = np.unique(np.concatenate(partids))
 
         if to_recarray:
             # use particle ids to get the rest of the paths
-            inds = np.in1d(ra['particleid'], epdest.particleid)
-            pthldes = ra[inds].copy()
+            pthldes = self._get_partids_data(partids)
             pthldes.sort(order=['particleid', 'time'])
             pthldes = pthldes.view(np.recarray)
         else:
-
-            # get list of unique particleids in selection
-            partids = np.unique(epdest['particleid'])
-
             # build list of unique particleids in selection
             pthldes = [self.get_data(partid) for partid in partids]
 
@@ -564,7 +853,7 @@ class PathlineFile():
         recarray2shp(pthdata, geoms, shpname=shpname, epsg=epsg, **kwargs)
 
 
-class EndpointFile():
+class EndpointFile(_ModpathFile):
     """
     EndpointFile Class.
 
@@ -574,6 +863,14 @@ class EndpointFile():
         Name of the endpoint file
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_data : bool
+        If True, the endpoint data are written to a binary cache file
+        (filename + '.npy') that is memory mapped instead of being held in
+        memory, and that is reused as long as the endpoint file is
+        unchanged.  Default is False.
+    chunksize : int
+        Number of rows of the endpoint file that are read at a time.
+        Default is 100000.
 
     Examples
     --------
@@ -587,8 +884,11 @@ class EndpointFile():
     kijnames = ['k0', 'i0', 'j0', 'node0', 'k', 'i', 'j', 'node',
                 'particleid', 'particlegroup', 'particleidloc',
                 'zone0', 'zone']
+    # endpoints are kept in file order
+    sort_data = False
 
-    def __init__(self, filename, verbose=False):
+    def __init__(self, filename, verbose=False, cache_data=False,
+                 chunksize=100000):
         """
         Class constructor.
 
@@ -597,21 +897,10 @@ class EndpointFile():
         self.verbose = verbose
         self._build_index()
         self.dtype = self._get_dtypes()
-        self._data = loadtxt(self.file, dtype=self.dtype,
-                             skiprows=self.skiprows)
-        # add particleid if required
-        self._add_particleid()
-
-        # convert layer, row, and column indices; particle id and group; and
-        #  line segment indices to zero-based
-        for n in self.kijnames:
-            try:
-                self._data[n] -= 1
-            except:
-                pass
+        self._load_data(cache_data=cache_data, chunksize=chunksize)
 
         # set number of particle ids
-        self.nid = np.unique(self._data['particleid']).shape[0]
+        self.nid = self._partids.shape[0]
 
         # close the input file
         self.file.close()
@@ -731,61 +1020,31 @@ class EndpointFile():
                  ('zone', np.int32), ('cellface', np.int32)]
         return np.dtype(dtype)
 
-    def _add_particleid(self):
-
+    def _read_chunks(self):
         # add particle ids for earlier version of MODPATH
-        if self.version < 6:
-            # create particle ids
-            shaped = self._data.shape[0]
-            pids = np.arange(1, shaped + 1, 1, dtype=np.int32)
-
-            # determine numpy version
-            npv = np.__version__
-            v = [int(s) for s in npv.split('.')]
-            if self.verbose:
-                print('numpy version {}'.format(npv))
+        nrows = 0
+        for chunk in self._read_text_chunks(self.dtype):
+            if self.version < 6:
+                pids = np.arange(nrows + 1, nrows + chunk.shape[0] + 1,
+                                 dtype=np.int32)
+                chunk = self._add_particleid(chunk, pids)
+            nrows += chunk.shape[0]
+            yield self._to_zero_based(chunk)
+
+    def _add_particleid(self, data, pids):
+        """
+        Add the particleid field to the end of the endpoint data of
+        earlier versions of MODPATH.
 
-            # for numpy version 1.14 and higher
-            if v[0] > 1 or (v[0] == 1 and v[1] > 13):
-                self._data = append_fields(self._data, 'particleid', pids)
-            # numpy versions prior to 1.14
-            else:
-                if self.verbose:
-                    print(self._data.dtype)
-
-                # convert pids to structured array
-                pids = np.array(pids,
-                                dtype=np.dtype([('particleid', np.int32)]))
-
-                # create new dtype
-                dtype = self._get_mp35_dtype(add_id=True)
-                if self.verbose:
-                    print(dtype)
-
-                # create new array with new dtype and fill with available data
-                data = np.zeros(shaped, dtype=dtype)
-                if self.verbose:
-                    print('new data shape {}'.format(data.shape))
-                    print('\nFilling new structured data array')
-
-                # add particle id to new array
-                if self.verbose:
-                    msg = 'writing particleid (pids) to new ' + \
-                          'structured data array'
-                    print(msg)
-                data['particleid'] = pids['particleid']
-
-                # add remaining data to the new array
-                if self.verbose:
-                    msg = 'writing remaining data to new ' + \
-                          'structured data array'
-                    print(msg)
-                for name in self._data.dtype.names:
-                    data[name] = self._data[name]
-                if self.verbose:
-                    print('replacing data with copy of new data array')
-                self._data = data.copy()
-        return
+        """
+        dtype = np.dtype(data.dtype.descr + [('particleid', np.int32)])
+        if self.verbose:
+            print(dtype)
+        newdata = np.zeros(data.shape[0], dtype=dtype)
+        for name in data.dtype.names:
+            newdata[name] = data[name]
+        newdata['particleid'] = pids
+        return newdata
 
     def get_maxid(self):
         """
@@ -797,7 +1056,7 @@ class EndpointFile():
             Maximum endpoint particle id.
 
         """
-        return np.unique(self._data['particleid']).max()
+        return self._partids.max()
 
     def get_maxtime(self):
         """
@@ -854,8 +1113,7 @@ class EndpointFile():
         >>> e1 = endobj.get_data(partid=1)
 
         """
-        idx = self._data['particleid'] == partid
-        ra = self._data[idx]
+        ra = self._data[self._get_rows(partid)].copy()
         return ra
 
     def get_alldata(self):
@@ -915,49 +1173,51 @@ class EndpointFile():
 
         """
 
-        # create local copy of _data
-        ra = self.get_alldata()
-
-        # find the intersection of endpoints and dest_cells
-        # convert dest_cells to same dtype for comparison
-        if self.version < 7:
-            if source:
-                keys = ['k0', 'i0', 'j0']
-            else:
-                keys = ['k', 'i', 'j']
-            try:
-                raslice = ra_slice(ra, keys)
-            except:
-                msg = "could not extract" + "'" + "', '".join(keys) + "'" + \
-                      "from endpoint data."
-                raise KeyError(msg)
-        else:
-            if source:
-                keys = ['node0']
+        # find the intersection of endpoints and dest_cells, reading the
+        # endpoint data in chunks
+        epdest = []
+        for ra in self._iter_data():
+            ra = ra.view(np.recarray)
+            # convert dest_cells to same dtype for comparison
+            if self.version < 7:
+                if source:
+                    keys = ['k0', 'i0', 'j0']
+                else:
+                    keys = ['k', 'i', 'j']
+                try:
+                    raslice = ra_slice(ra, keys)
+                except:
+                    msg = "could not extract" + "'" + "', '".join(keys) + \
+                          "'" + "from endpoint data."
+                    raise KeyError(msg)
             else:
-                keys = ['node']
-            try:
-                raslice = ra_slice(ra, keys)
-            except:
-                msg = "could not extract '{}' ".format(keys[0]) + \
-                      "key from endpoint data"
-                raise KeyError(msg)
-            if isinstance(dest_cells, (list, tuple)):
-                allint = all(isinstance(el, int) for el in dest_cells)
-                # convert to a list of tuples
-                if allint:
-                    t = []
-                    for el in dest_cells:
-                        t.append((el,))
-                        dest_cells = t
-        dtype = []
-        for key in keys:
-            dtype.append((key, np.int32))
-        dtype = np.dtype(dtype)
-        dest_cells = np.array(dest_cells, dtype=dtype)
-
-        inds = np.in1d(raslice, dest_cells)
-        epdest = ra[inds].copy().view(np.recarray)
+                if source:
+                    keys = ['node0']
+                else:
+                    keys = ['node']
+                try:
+                    raslice = ra_slice(ra, keys)
+                except:
+                    msg = "could not extract '{}' ".format(keys[0]) + \
+                          "key from endpoint data"
+                    raise KeyError(msg)
+                if isinstance(dest_cells, (list, tuple)):
+                    allint = all(isinstance(el, int) for el in dest_cells)
+                    # convert to a list of tuples
+                    if allint:
+                        t = []
+                        for el in dest_cells:
+                            t.append((el,))
+                            dest_cells = t
+            dtype = []
+            for key in keys:
+                dtype.append((key, np.int32))
+            dtype = np.dtype(dtype)
+            dest = np.array(dest_cells, dtype=dtype)
+
+            inds = np.in1d(raslice, dest)
+            epdest.append(ra[inds])
+        epdest = np.concatenate(epdest).view(np.recarray)
         return epdest
 
     def write_shapefile(self, endpoint_data=None,
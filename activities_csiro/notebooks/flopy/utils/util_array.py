@@ -11,6 +11,7 @@ from __future__ import division, print_function
 import os
 import shutil
 import copy
+import warnings
 import numpy as np
 from warnings import warn
 from ..utils.binaryfile import BinaryHeader
@@ -507,6 +508,10 @@ class Util3d(DataInterface):
             self._model = model
             self.array_free_format = array_free_format
             for i, u2d in enumerate(self.util_2ds):
+                if u2d._value_relpath is not None:
+                    # an open/close file that a lazy load has not read yet
+                    u2d.model = model
+                    continue
                 self.util_2ds[i] = Util2d(model, u2d.shape, u2d.dtype,
                                           u2d._array, name=u2d.name,
                                           fmtin=u2d.format.fortran,
@@ -1737,6 +1742,9 @@ class Util2d(DataInterface):
         self._format._isbinary = bool(bin)
         self.ext_filename = ext_filename
         self._ext_filename = self._name.replace(' ', '_') + ".ref"
+        # path of a file value relative to the model workspace, which is
+        # kept when the array is written
+        self._value_relpath = None
 
         self._acceptable_hows = ["constant", "internal", "external",
                                  "openclose"]
@@ -2033,6 +2041,8 @@ class Util2d(DataInterface):
                 filename = os.path.split(self.ext_filename)[-1]
             else:
                 filename = os.path.split(self._ext_filename)[-1]
+        elif self._value_relpath is not None:
+            filename = self._value_relpath
         else:
             filename = os.path.split(self.__value)[-1]
         return filename
@@ -2183,7 +2193,8 @@ class Util2d(DataInterface):
                                    self._array,
                                    fortran_format=self.format.fortran)
 
-            elif self.__value != self.python_file_path:
+            elif os.path.abspath(self.__value) != \
+                    os.path.abspath(self.python_file_path):
                 if os.path.exists(self.python_file_path):
                     # if the file already exists, remove it
                     if self._model.verbose:
@@ -2196,6 +2207,9 @@ class Util2d(DataInterface):
                             "Util2d: error removing existing file " + \
                             self.python_file_path)
                 # copy the file to the new model location
+                pth = os.path.dirname(self.python_file_path)
+                if pth and not os.path.exists(pth):
+                    os.makedirs(pth)
                 try:
                     shutil.copy2(self.__value, self.python_file_path)
                 except Exception as e:
@@ -2379,6 +2393,22 @@ class Util2d(DataInterface):
         if not hasattr(file_in, 'read'):
             file_in = open(file_in, 'r')
         npl, fmt, width, decimal = ArrayFormat.decode_fortran_descriptor(fmtin)
+        data = Util2d._load_txt_bulk(shape, file_in, dtype, npl, width)
+        if data is None:
+            data = Util2d._load_txt_items(num_items, file_in, dtype, npl,
+                                          width)
+        if data.size != num_items:
+            raise ValueError('Util2d.load_txt(): expected array size {0},'
+                             ' but found size {1}'.format(num_items,
+                                                          data.size))
+        return data.reshape(shape)
+
+    @staticmethod
+    def _load_txt_items(num_items, file_in, dtype, npl, width):
+        """Load a formatted array item by item, line by line.  Used for
+        arrays with repeat counts (e.g. 10*1.0) and for arrays that are not
+        laid out the way _load_txt_bulk() expects.
+        """
         items = []
         while len(items) < num_items:
             line = file_in.readline()
@@ -2407,12 +2437,101 @@ class Util2d(DataInterface):
                             items.append(item)
                     except IndexError:
                         break
-        data = np.fromiter(items, dtype=dtype, count=num_items)
-        if data.size != num_items:
-            raise ValueError('Util2d.load_txt(): expected array size {0},'
-                             ' but found size {1}'.format(num_items,
-                                                          data.size))
-        return data.reshape(shape)
+        return np.fromiter(items, dtype=dtype, count=num_items)
+
+    @staticmethod
+    def _load_txt_bulk(shape, file_in, dtype, npl, width):
+        """Load a formatted array by reading all of its lines at once and
+        parsing them with numpy.
+
+        The number of lines is taken from the number of items on the first
+        line (free format) or per line (fixed format), assuming that every
+        row of a 2-D array starts on a new line.  The lines are parsed if
+        exactly the last line completes the array and there are no repeat
+        counts.  Otherwise, the file is rewound and None is returned, so
+        that the array is loaded by _load_txt_items().
+
+        Returns
+        -------
+        1-D array or None
+        """
+        try:
+            ipos = file_in.tell()
+        except (AttributeError, IOError, OSError, ValueError):
+            return None
+        data = None
+        try:
+            if npl == 'free':
+                data = Util2d._parse_txt_free(shape, file_in, dtype)
+            else:
+                data = Util2d._parse_txt_fixed(shape, file_in, dtype, npl,
+                                               width)
+        except (ValueError, UnicodeError):
+            data = None
+        if data is None:
+            file_in.seek(ipos)
+        return data
+
+    @staticmethod
+    def _get_txt_nlines(shape, npl):
+        """Number of lines that hold an array with npl items per line, if
+        every row of a 2-D array starts on a new line."""
+        if len(shape) == 2 and npl < shape[1]:
+            return shape[0] * int(np.ceil(shape[1] / float(npl)))
+        return int(np.ceil(np.prod(shape) / float(npl)))
+
+    @staticmethod
+    def _parse_txt_free(shape, file_in, dtype):
+        num_items = int(np.prod(shape))
+        line = file_in.readline()
+        nitems = len(line.replace(',', ' ').split())
+        if nitems == 0 or '*' in line:
+            return None
+        nlines = Util2d._get_txt_nlines(shape, nitems)
+        lines = [line] + [file_in.readline() for i in range(nlines - 1)]
+        text = ''.join(lines)
+        if '*' in text:
+            return None
+        if ',' in text:
+            text = text.replace(',', ' ')
+
+        # np.fromstring stops with a warning at the first item that can not
+        # be parsed, so all of the items were parsed if there is no warning
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            data = np.fromstring(text, dtype=dtype, sep=' ')
+        if len(w) > 0:
+            return None
+        # exactly the last line must complete the array
+        nlast = len(lines[-1].replace(',', ' ').split())
+        if data.shape[0] < num_items or \
+                data.shape[0] - nlast >= num_items:
+            return None
+        return data[:num_items]
+
+    @staticmethod
+    def _parse_txt_fixed(shape, file_in, dtype, npl, width):
+        num_items = int(np.prod(shape))
+        nlines = Util2d._get_txt_nlines(shape, npl)
+        nchar = npl * width
+        lines = [file_in.readline() for i in range(nlines)]
+        if len(lines[-1]) == 0:
+            return None
+        text = ''.join([line.rstrip('\r\n')[:nchar].ljust(nchar)
+                        for line in lines])
+
+        # fields that are blank are skipped
+        b = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        b = b.reshape(nlines * npl, width)
+        inonblank = (b > 32).any(axis=1)
+        counts = np.cumsum(inonblank.reshape(nlines, npl).sum(axis=1))
+
+        # exactly the last line must complete the array
+        if counts[-1] < num_items or \
+                (nlines > 1 and counts[-2] >= num_items):
+            return None
+        data = b[inonblank].view('S{}'.format(width)).ravel().astype(dtype)
+        return data[:num_items]
 
     @staticmethod
     def write_txt(shape, file_out, data, fortran_format="(FREE)",
@@ -2667,24 +2786,37 @@ class Util2d(DataInterface):
             fname = fname.replace('\'', '')
             fname = fname.replace('\"', '')
             fname = fname.replace('\\', os.path.sep)
+            relpath = fname
             fname = os.path.join(model.model_ws, fname)
             # load_txt(shape, file_in, dtype, fmtin):
             assert os.path.exists(fname), "Util2d.load() error: open/close " + \
                                           "file " + str(fname) + " not found"
-            if str('binary') not in str(cr_dict['fmtin'].lower()):
-                f = open(fname, 'r')
-                data = Util2d.load_txt(shape=shape,
-                                       file_in=f,
-                                       dtype=dtype, fmtin=cr_dict['fmtin'])
+            if getattr(model, 'lazy_load', False) and \
+                    str('binary') not in str(cr_dict['fmtin'].lower()):
+                # the file is read with its own format when the array is
+                # first used and is copied as it is when the model is written
+                u2d = Util2d(model, shape, dtype, fname, name=name,
+                             iprn=cr_dict['iprn'], cnstnt=cr_dict['cnstnt'],
+                             array_free_format=array_free_format)
+                u2d._format = ArrayFormat(u2d, fortran=cr_dict['fmtin'],
+                                          array_free_format=array_free_format)
+                u2d._value_relpath = relpath
             else:
-                f = open(fname, 'rb')
-                header_data, data = Util2d.load_bin(shape, f, dtype,
-                                                    bintype='Head')
-            f.close()
-            u2d = Util2d(model, shape, dtype, data, name=name,
-                         iprn=cr_dict['iprn'], fmtin="(FREE)",
-                         cnstnt=cr_dict['cnstnt'],
-                         array_free_format=array_free_format)
+                if str('binary') not in str(cr_dict['fmtin'].lower()):
+                    f = open(fname, 'r')
+                    data = Util2d.load_txt(shape=shape,
+                                           file_in=f,
+                                           dtype=dtype,
+                                           fmtin=cr_dict['fmtin'])
+                else:
+                    f = open(fname, 'rb')
+                    header_data, data = Util2d.load_bin(shape, f, dtype,
+                                                        bintype='Head')
+                f.close()
+                u2d = Util2d(model, shape, dtype, data, name=name,
+                             iprn=cr_dict['iprn'], fmtin="(FREE)",
+                             cnstnt=cr_dict['cnstnt'],
+                             array_free_format=array_free_format)
 
 
         elif cr_dict['type'] == 'internal':
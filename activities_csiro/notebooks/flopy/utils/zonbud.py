@@ -46,7 +46,19 @@ class ZoneBudget(object):
 
     def __init__(self, cbc_file, z, kstpkper=None, totim=None, aliases=None,
                  verbose=False, **kwargs):
+        self._setup(cbc_file, z, kstpkper, totim, aliases, kwargs)
 
+        # Compute the budget for all time steps and build the budget
+        # record array from the accumulated flows
+        self._budget = self._compute_budget(verbose=verbose)
+
+        return
+
+    def _setup(self, cbc_file, z, kstpkper, totim, aliases, kwargs):
+        """
+        Check the input and set up the zones and budget record names.
+
+        """
         if isinstance(cbc_file, CellBudgetFile):
             self.cbc = cbc_file
         elif isinstance(cbc_file, str) and os.path.isfile(cbc_file):
@@ -184,38 +196,75 @@ class ZoneBudget(object):
         self.ssst_record_names = [n for n in self.record_names
                                   if n not in internal_flow_terms]
 
-        # Initialize budget recordarray
-        array_list = []
-        if self.kstpkper is not None:
-            for kk in self.kstpkper:
-                recordarray = self._initialize_budget_recordarray(kstpkper=kk,
-                                                                  totim=None)
-                array_list.append(recordarray)
-        elif self.totim is not None:
-            for t in self.totim:
-                recordarray = self._initialize_budget_recordarray(
-                    kstpkper=None, totim=t)
-                array_list.append(recordarray)
-        self._budget = np.concatenate(array_list, axis=0)
-
-        # Update budget record array
-        if self.kstpkper is not None:
-            for kk in self.kstpkper:
-                if verbose:
-                    s = 'Computing the budget for' \
-                        ' time step {} in stress period {}'.format(kk[0] + 1,
-                                                                   kk[1] + 1)
-                    print(s)
-                self._compute_budget(kstpkper=kk)
-        elif self.totim is not None:
-            for t in self.totim:
-                if verbose:
-                    s = 'Computing the budget for time {}'.format(t)
-                    print(s)
-                self._compute_budget(totim=t)
+        # Zone index of every cell and the faces between cells in
+        # different zones, which are the same for every time step
+        self._zone_index = np.searchsorted(self.allzones, self.izone)
+        self._zone_faces = self._get_zone_faces()
 
         return
 
+    @classmethod
+    def from_zonations(cls, cbc_file, zonations, kstpkper=None, totim=None,
+                       aliases=None, verbose=False, **kwargs):
+        """
+        Create ZoneBudget objects for several zone arrays and the same
+        cell budget file.  Each budget term is read once per time step and
+        used for all of the zone arrays.
+
+        Parameters
+        ----------
+        cbc_file : str or CellBudgetFile object
+            The file name or CellBudgetFile object for which budgets will be
+            computed.
+        zonations : dict or list
+            A dictionary of zonation name and zone array, or a list of zone
+            arrays, which are named by their position in the list.
+        kstpkper : tuple of ints
+            A tuple containing the time step and stress period (kstp, kper).
+            The kstp and kper values are zero based.
+        totim : float
+            The simulation time.
+        aliases : dict
+            A dictionary of zonation name and the aliases dictionary for
+            the zone array (see ZoneBudget).
+        verbose : bool
+            Write information to the screen.  Default is False.
+
+        Returns
+        -------
+        zbs : OrderedDict
+            Dictionary of zonation name and ZoneBudget object.
+
+        Examples
+        --------
+
+        >>> from flopy.utils.zonbud import ZoneBudget
+        >>> zbs = ZoneBudget.from_zonations('zonebudtest.cbc',
+        ...                                 {'aquifer': zon1, 'county': zon2})
+        >>> df = zbs['county'].get_dataframes()
+
+        """
+        if isinstance(zonations, list):
+            zonations = OrderedDict(enumerate(zonations))
+        if aliases is None:
+            aliases = {}
+        if not isinstance(cbc_file, CellBudgetFile):
+            if isinstance(cbc_file, str) and os.path.isfile(cbc_file):
+                cbc_file = CellBudgetFile(cbc_file)
+            else:
+                raise Exception(
+                    'Cannot load cell budget file: {}.'.format(cbc_file))
+        zbs = OrderedDict()
+        for name, z in zonations.items():
+            zb = cls.__new__(cls)
+            zb._setup(cbc_file, z, kstpkper, totim, aliases.get(name),
+                      dict(kwargs))
+            zbs[name] = zb
+        budgets = _compute_budgets(list(zbs.values()), verbose=verbose)
+        for zb, budget in zip(zbs.values(), budgets):
+            zb._budget = budget
+        return zbs
+
     def get_model_shape(self):
         """
 
@@ -461,933 +510,396 @@ class ZoneBudget(object):
         result.cbc = self.cbc
         return result
 
-    def _compute_budget(self, kstpkper=None, totim=None):
+    def _get_steps(self):
         """
-        Creates a budget for the specified zone array. This function only supports the
-        use of a single time step/stress period or time.
-
-        Parameters
-        ----------
-        kstpkper : tuple
-            Tuple of kstp and kper to compute budget for (default is None).
-        totim : float
-            Totim to compute budget for (default is None).
+        Get the time steps to compute the budget for.
 
         Returns
         -------
-        None
-
-        """
-        # Initialize an array to track where the constant head cells
-        # are located.
-        ich = np.zeros(self.cbc_shape, self.int_type)
-        swiich = np.zeros(self.cbc_shape, self.int_type)
-
-        if 'CONSTANT HEAD' in self.record_names:
-            """
-            C-----CONSTANT-HEAD FLOW -- DON'T ACCUMULATE THE CELL-BY-CELL VALUES FOR
-            C-----CONSTANT-HEAD FLOW BECAUSE THEY MAY INCLUDE PARTIALLY CANCELING
-            C-----INS AND OUTS.  USE CONSTANT-HEAD TERM TO IDENTIFY WHERE CONSTANT-
-            C-----HEAD CELLS ARE AND THEN USE FACE FLOWS TO DETERMINE THE AMOUNT OF
-            C-----FLOW.  STORE CONSTANT-HEAD LOCATIONS IN ICH ARRAY.
-            """
-            chd = self.cbc.get_data(text='CONSTANT HEAD', full3D=True,
-                                    kstpkper=kstpkper, totim=totim)[0]
-            ich[np.ma.where(chd != 0.)] = 1
-        if 'FLOW RIGHT FACE' in self.record_names:
-            self._accumulate_flow_frf('FLOW RIGHT FACE', ich, kstpkper, totim)
-        if 'FLOW FRONT FACE' in self.record_names:
-            self._accumulate_flow_fff('FLOW FRONT FACE', ich, kstpkper, totim)
-        if 'FLOW LOWER FACE' in self.record_names:
-            self._accumulate_flow_flf('FLOW LOWER FACE', ich, kstpkper, totim)
-        if 'SWIADDTOCH' in self.record_names:
-            swichd = self.cbc.get_data(text='SWIADDTOCH', full3D=True,
-                                       kstpkper=kstpkper, totim=totim)[0]
-            swiich[swichd != 0] = 1
-        if 'SWIADDTOFRF' in self.record_names:
-            self._accumulate_flow_frf('SWIADDTOFRF', swiich, kstpkper, totim)
-        if 'SWIADDTOFFF' in self.record_names:
-            self._accumulate_flow_fff('SWIADDTOFFF', swiich, kstpkper, totim)
-        if 'SWIADDTOFLF' in self.record_names:
-            self._accumulate_flow_flf('SWIADDTOFLF', swiich, kstpkper, totim)
-
-        # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
-        # ACCUMULATE THE FLOW BY ZONE
-        # iterate over remaining items in the list
-        for recname in self.ssst_record_names:
-            self._accumulate_flow_ssst(recname, kstpkper, totim)
-
-        # Compute mass balance terms
-        self._compute_mass_balance(kstpkper, totim)
-
-        return
-
-    def _get_internal_flow_record_names(self):
-        """
-        Get internal flow record names
-
-        Returns
-        -------
-        iflow_recnames : np.recarray
-            recarray of internal flow terms
+        steps : list of tuples
+            List of (kstpkper, totim) tuples, where kstpkper is zero-based
+            and totim is 0. if the budget file does not have times.
 
         """
-        iflow_recnames = OrderedDict([(0, 'ZONE_0')])
-        for z, a in iter(self._zonenamedict.items()):
-            iflow_recnames[z] = '{}'.format(a)
-        dtype = np.dtype([('zone', '<i4'), ('name', (str, 50))])
-        iflow_recnames = np.array(list(iflow_recnames.items()), dtype=dtype)
-        return iflow_recnames
+        steps = []
+        if self.kstpkper is not None:
+            for kk in self.kstpkper:
+                if len(self.cbc_times) > 0:
+                    totim = self.cbc_times[self.cbc_kstpkper.index(kk)]
+                else:
+                    totim = 0.
+                steps.append((kk, totim))
+        elif self.totim is not None:
+            for t in self.totim:
+                if len(self.cbc_times) > 0:
+                    kk = self.cbc_kstpkper[self.cbc_times.index(t)]
+                else:
+                    kk = (0, 0)
+                steps.append((kk, t))
+        return steps
 
-    def _add_empty_record(self, recordarray, recname, kstpkper=None,
-                          totim=None):
+    def _compute_budget(self, verbose=False):
         """
-        Build an empty records based on the specified flow direction and
-        record name for the given list of zones.
+        Creates a budget for the specified zone array for all of the time
+        steps.
 
         Parameters
         ----------
-        recordarray :
-        recname :
-        kstpkper : tuple
-            Tuple of kstp and kper to compute budget for (default is None).
-        totim : float
-            Totim to compute budget for (default is None).
+        verbose : bool
+            Write information to the screen.  Default is False.
 
         Returns
         -------
-        recordarray : np.recarray
+        budget : np.recarray
+            The budget record array.
 
         """
-        if kstpkper is not None:
-            if len(self.cbc_times) > 0:
-                totim = self.cbc_times[self.cbc_kstpkper.index(kstpkper)]
-            else:
-                totim = 0.
-        elif totim is not None:
-            if len(self.cbc_times) > 0:
-                kstpkper = self.cbc_kstpkper[self.cbc_times.index(totim)]
-            else:
-                kstpkper = (0, 0)
+        return _compute_budgets([self], verbose=verbose)[0]
 
-        row = [totim, kstpkper[0], kstpkper[1], recname]
-        row += [0. for _ in self._zonenamedict.values()]
-        recs = np.array(tuple(row), dtype=recordarray.dtype)
-        recordarray = np.append(recordarray, recs)
-        return recordarray
-
-    def _initialize_budget_recordarray(self, kstpkper=None, totim=None):
+    def _init_flows(self, ntimes):
         """
-        Initialize the budget record array which will store all of the
-        fluxes in the cell-budget file.
+        Initialize the arrays that the zone flows are accumulated in.
 
         Parameters
         ----------
-        kstpkper : tuple
-            Tuple of kstp and kper to compute budget for (default is None).
-        totim : float
-            Totim to compute budget for (default is None).
+        ntimes : int
+            Number of time steps.
 
         Returns
         -------
+        flows : dict
+            'zone' holds the (ntimes, nzones, nzones) flows from zone to
+            zone, 'from_ch' and 'to_ch' the (ntimes, nzones) flows from and
+            to constant-head cells and 'in' and 'out' dictionaries of the
+            (ntimes, nzones) inflows and outflows of each source/sink/storage
+            record.
 
         """
-
-        # Create empty array for the budget terms.
-        dtype_list = [('totim', '<f4'), ('time_step', '<i4'),
-                      ('stress_period', '<i4'), ('name', (str, 50))]
-        dtype_list += [(n, self.float_type) for n in
-                       self._zonenamedict.values()]
-        dtype = np.dtype(dtype_list)
-        recordarray = np.array([], dtype=dtype)
-
-        # Add "from" records
-        if 'STORAGE' in self.record_names:
-            recordarray = self._add_empty_record(recordarray, 'FROM_STORAGE',
-                                                 kstpkper, totim)
-        if 'CONSTANT HEAD' in self.record_names:
-            recordarray = self._add_empty_record(recordarray,
-                                                 'FROM_CONSTANT_HEAD',
-                                                 kstpkper, totim)
+        nz = len(self.allzones)
+        flows = {'zone': np.zeros((ntimes, nz, nz)),
+                 'from_ch': np.zeros((ntimes, nz)),
+                 'to_ch': np.zeros((ntimes, nz)),
+                 'in': OrderedDict(), 'out': OrderedDict()}
         for recname in self.ssst_record_names:
-            if recname != 'STORAGE':
-                recordarray = self._add_empty_record(recordarray,
-                                                     'FROM_' + '_'.join(
-                                                         recname.split()),
-                                                     kstpkper, totim)
-
-        for z, n in self._iflow_recnames:
-            if n == 0 and 0 not in self.allzones:
-                continue
-            else:
-                recordarray = self._add_empty_record(recordarray,
-                                                     'FROM_' + '_'.join(
-                                                         n.split()),
-                                                     kstpkper, totim)
-        recordarray = self._add_empty_record(recordarray, 'TOTAL_IN',
-                                             kstpkper, totim)
-
-        # Add "out" records
-        if 'STORAGE' in self.record_names:
-            recordarray = self._add_empty_record(recordarray, 'TO_STORAGE',
-                                                 kstpkper, totim)
-        if 'CONSTANT HEAD' in self.record_names:
-            recordarray = self._add_empty_record(recordarray,
-                                                 'TO_CONSTANT_HEAD',
-                                                 kstpkper, totim)
-        for recname in self.ssst_record_names:
-            if recname != 'STORAGE':
-                recordarray = self._add_empty_record(recordarray,
-                                                     'TO_' + '_'.join(
-                                                         recname.split()),
-                                                     kstpkper, totim)
-
-        for n in self._iflow_recnames['name']:
-            if n == 0 and 0 not in self.allzones:
-                continue
-            else:
-                recordarray = self._add_empty_record(recordarray,
-                                                     'TO_' + '_'.join(
-                                                         n.split()), kstpkper,
-                                                     totim)
-        recordarray = self._add_empty_record(recordarray, 'TOTAL_OUT',
-                                             kstpkper, totim)
-
-        recordarray = self._add_empty_record(recordarray, 'IN-OUT', kstpkper,
-                                             totim)
-        recordarray = self._add_empty_record(recordarray,
-                                             'PERCENT_DISCREPANCY', kstpkper,
-                                             totim)
-        return recordarray
+            flows['in'][recname] = np.zeros((ntimes, nz))
+            flows['out'][recname] = np.zeros((ntimes, nz))
+        return flows
 
-    @staticmethod
-    def _filter_circular_flow(fz, tz, f):
+    def _get_step_data(self, kstpkper):
         """
+        Read the budget terms for a time step.
 
         Parameters
         ----------
-        fz
-        tz
-        f
+        kstpkper : tuple
+            Tuple of kstp and kper to read the budget terms for.
 
         Returns
         -------
+        data : dict
+            Dictionary of record name and (nlay, nrow, ncol) array of the
+            record, or the (node, q) record array of list-style records.
+            Records that are not in the budget file for the time step are
+            not included.
 
         """
-        e = np.equal(fz, tz)
-        fz = fz[np.logical_not(e)]
-        tz = tz[np.logical_not(e)]
-        f = f[np.logical_not(e)]
-        return fz, tz, f
-
-    def _update_budget_fromfaceflow(self, fz, tz, f,
-                                    kstpkper=None, totim=None):
+        data = {}
+        for recname in self.record_names:
+            # LIST
+            islist = self.imeth[recname] == 2 or self.imeth[recname] == 5
+            rec = self.cbc.get_data(text=recname, kstpkper=kstpkper,
+                                    full3D=not islist)
+            if len(rec) == 0:
+                # Empty data, can occur during the first time step of a
+                # transient model when storage terms are zero and not in
+                # the cell-budget file.
+                continue
+            rec = rec[0]
+            if not islist:
+                rec = np.ma.filled(rec, 0.)
+            if rec.ndim == 2:
+                # 1-LAYER ARRAY THAT DEFINES LAYER 1
+                rec3d = np.zeros(self.cbc_shape, rec.dtype)
+                rec3d[0] = rec
+                rec = rec3d
+            data[recname] = rec
+        return data
+
+    def _get_zone_faces(self):
         """
-
-        Parameters
-        ----------
-        fz
-        tz
-        f
-        kstpkper
-        totim
+        Find the cell faces between cells in different zones.
 
         Returns
         -------
+        faces : list of tuples
+            A (node, node2, zone, zone2) tuple for the faces across columns,
+            rows and layers, where node2 is the cell after node along the
+            axis and zone and zone2 are the zone indices of the cells.  The
+            flow across the face is the budget value of node.
 
         """
-
-        # No circular flow within zones
-        fz, tz, f = self._filter_circular_flow(fz, tz, f)
-
-        if len(f) == 0:
-            return
-
-        # Inflows
-        idx = np.logical_not(np.array([item in tz for item in [0] * len(tz)]))
-        fzi = fz[idx]
-        tzi = tz[idx]
-        rownames = np.array(list(['FROM_' +
-                                  self._iflow_recnames[
-                                      self._iflow_recnames['zone'] == z][
-                                      'name'][0]
-                                  for z in fzi]))
-        colnames = np.array(list(
-            [self._iflow_recnames[self._iflow_recnames['zone'] == z]['name'][0]
-             for z in tzi]))
-        fluxes = f[idx]
-        self._update_budget_recordarray(rownames, colnames, fluxes, kstpkper,
-                                        totim)
-
-        # Outflows
-        idx = np.logical_not(np.array([item in fz for item in [0] * len(fz)]))
-        fzi = fz[idx]
-        tzi = tz[idx]
-        rownames = np.array(list(['TO_' +
-                                  self._iflow_recnames[
-                                      self._iflow_recnames['zone'] == z][
-                                      'name'][0]
-                                  for z in tzi]))
-        colnames = np.array(list(
-            [self._iflow_recnames[self._iflow_recnames['zone'] == z]['name'][0]
-             for z in fzi]))
-        fluxes = f[idx]
-        self._update_budget_recordarray(rownames, colnames, fluxes, kstpkper,
-                                        totim)
-        return
-
-    def _update_budget_fromssst(self, fz, tz, f, kstpkper=None, totim=None):
+        nodes = np.arange(self.izone.size).reshape(self.cbc_shape)
+        zone_index = self._zone_index.ravel()
+        faces = []
+        for axis in [2, 1, 0]:
+            n = self.cbc_shape[axis]
+            node = np.take(nodes, np.arange(n - 1), axis=axis).ravel()
+            node2 = np.take(nodes, np.arange(1, n), axis=axis).ravel()
+            idx = zone_index[node] != zone_index[node2]
+            node, node2 = node[idx], node2[idx]
+            faces.append((node, node2, zone_index[node], zone_index[node2]))
+        return faces
+
+    def _accumulate_flows(self, flows, itim, data):
         """
+        Accumulate the zone flows of a time step.
 
         Parameters
         ----------
-        fz
-        tz
-        f
-        kstpkper
-        totim
+        flows : dict
+            The arrays that the zone flows are accumulated in, from
+            _init_flows().
+        itim : int
+            Index of the time step in flows.
+        data : dict
+            The budget terms of the time step, from _get_step_data().
 
         Returns
         -------
+        None
 
         """
-        if len(f) == 0:
-            return
-        self._update_budget_recordarray(fz, tz, f, kstpkper, totim)
+        # INTERNAL FLOW TERMS ARE USED TO CALCULATE FLOW BETWEEN ZONES.
+        # CONSTANT-HEAD TERMS ARE USED TO IDENTIFY WHERE CONSTANT-HEAD CELLS
+        # ARE AND THEN USE FACE FLOWS TO DETERMINE THE AMOUNT OF FLOW.
+        # SWIADDTO--- terms are used by the SWI2 groundwater flow process.
+        for chname, facenames in [('CONSTANT HEAD', ['FLOW RIGHT FACE',
+                                                     'FLOW FRONT FACE',
+                                                     'FLOW LOWER FACE']),
+                                  ('SWIADDTOCH', ['SWIADDTOFRF',
+                                                  'SWIADDTOFFF',
+                                                  'SWIADDTOFLF'])]:
+            # C-----CONSTANT-HEAD FLOW -- DON'T ACCUMULATE THE CELL-BY-CELL
+            # C-----VALUES FOR CONSTANT-HEAD FLOW BECAUSE THEY MAY INCLUDE
+            # C-----PARTIALLY CANCELING INS AND OUTS.  USE CONSTANT-HEAD TERM
+            # C-----TO IDENTIFY WHERE CONSTANT-HEAD CELLS ARE AND THEN USE
+            # C-----FACE FLOWS TO DETERMINE THE AMOUNT OF FLOW.
+            if chname in data:
+                ich = self._get_cell_values(data[chname]) != 0.
+            else:
+                ich = np.zeros(self.izone.size, dtype=bool)
+            for axis, recname in enumerate(facenames):
+                if recname in data:
+                    q = self._get_cell_values(data[recname])
+                    self._accumulate_face_flow(flows, itim, q, ich, axis)
+
+        # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
+        # ACCUMULATE THE FLOW BY ZONE
+        nz = len(self.allzones)
+        zone_index = self._zone_index.ravel()
+        for recname in self.ssst_record_names:
+            if recname not in data:
+                continue
+            rec = data[recname]
+            if rec.dtype.names is not None:
+                # the inflows and outflows of list entries are accumulated
+                # separately, even if a cell is listed more than once
+                zone, q = zone_index[rec['node'] - 1], rec['q']
+            else:
+                zone, q = zone_index, rec.ravel()
+            flows['in'][recname][itim] += np.bincount(
+                zone, weights=np.where(q > 0, q, 0.), minlength=nz)
+            flows['out'][recname][itim] += np.bincount(
+                zone, weights=np.where(q < 0, -q, 0.), minlength=nz)
         return
 
-    def _update_budget_recordarray(self, rownames, colnames, fluxes,
-                                   kstpkper=None, totim=None):
+    def _get_cell_values(self, rec):
         """
-        Update the budget record array with the flux for the specified
-        flow direction (in/out), record name, and column.
+        Get the values of a budget term for all of the cells.
 
         Parameters
         ----------
-        rownames
-        colnames
-        fluxes
-        kstpkper
-        totim
+        rec : np.ndarray
+            A budget term from _get_step_data().
 
         Returns
         -------
-        None
+        q : np.ndarray
+            The values of the term for the cells, with the flows of
+            list-style records summed by cell.
 
         """
-        try:
+        if rec.dtype.names is not None:
+            return np.bincount(rec['node'] - 1, weights=rec['q'],
+                               minlength=self.izone.size)
+        return rec.ravel()
 
-            if kstpkper is not None:
-                for rn, cn, flux in list(zip(rownames, colnames, fluxes)):
-                    rowidx = np.where(
-                        (self._budget['time_step'] == kstpkper[0]) &
-                        (self._budget['stress_period'] == kstpkper[1]) &
-                        (self._budget['name'] == rn))
-                    self._budget[cn][rowidx] += flux
-            elif totim is not None:
-                for rn, cn, flux in list(zip(rownames, colnames, fluxes)):
-                    rowidx = np.where((self._budget['totim'] == totim) &
-                                      (self._budget['name'] == rn))
-                    self._budget[cn][rowidx] += flux
-
-        except Exception as e:
-            print(e)
-            raise
-        return
-
-    def _accumulate_flow_frf(self, recname, ich, kstpkper, totim):
+    def _accumulate_face_flow(self, flows, itim, q, ich, iface):
         """
+        Accumulate the flows across the faces in one direction between
+        zones and to and from constant-head cells.
 
         Parameters
         ----------
-        recname
-        ich
-        kstpkper
-        totim
+        flows : dict
+            The arrays that the zone flows are accumulated in, from
+            _init_flows().
+        itim : int
+            Index of the time step in flows.
+        q : np.ndarray
+            The face flows of the time step for all of the cells.
+        ich : np.ndarray
+            Boolean array that is True for the constant-head cells.
+        iface : int
+            The direction of the face flows; 0 is across columns, 1 across
+            rows and 2 across layers.
 
         Returns
         -------
+        None
 
         """
-        try:
-            if self.ncol >= 2:
-                data = \
-                    self.cbc.get_data(text=recname, kstpkper=kstpkper,
-                                      totim=totim)[0]
-
-                # "FLOW RIGHT FACE"  COMPUTE FLOW BETWEEN ZONES ACROSS COLUMNS.
-                # COMPUTE FLOW ONLY BETWEEN A ZONE AND A HIGHER ZONE -- FLOW FROM
-                # ZONE 4 TO 3 IS THE NEGATIVE OF FLOW FROM 3 TO 4.
-                # 1ST, CALCULATE FLOW BETWEEN NODE J,I,K AND J-1,I,K
-
-                k, i, j = np.where(
-                    self.izone[:, :, 1:] > self.izone[:, :, :-1])
-
-                # Adjust column values to account for the starting position of "nz"
-                j += 1
-
-                # Define the zone to which flow is going
-                nz = self.izone[k, i, j]
-
-                # Define the zone from which flow is coming
-                jl = j - 1
-                nzl = self.izone[k, i, jl]
-
-                # Get the face flow
-                q = data[k, i, jl]
-
-                # Get indices where flow face values are positive (flow out of higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an iterable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzl[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # Get indices where flow face values are negative (flow into higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an iterable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nzl[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # FLOW BETWEEN NODE J,I,K AND J+1,I,K
-                k, i, j = np.where(
-                    self.izone[:, :, :-1] > self.izone[:, :, 1:])
-
-                # Define the zone from which flow is coming
-                nz = self.izone[k, i, j]
-
-                # Define the zone to which flow is going
-                jr = j + 1
-                nzr = self.izone[k, i, jr]
-
-                # Get the face flow
-                q = data[k, i, j]
-
-                # Get indices where flow face values are positive (flow out of higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an iterable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nzr[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # Get indices where flow face values are negative (flow into higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an iterable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzr[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[j > 0], i[j > 0], j[j > 0]
-                jl = j - 1
-                nzl = self.izone[k, i, jl]
-                nz = self.izone[k, i, j]
-                q = data[k, i, jl]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzl[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzl[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[j < self.ncol - 1], i[j < self.ncol - 1], j[
-                    j < self.ncol - 1]
-                nz = self.izone[k, i, j]
-                jr = j + 1
-                nzr = self.izone[k, i, jr]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzr[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzr[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-        except Exception as e:
-            print(e)
-            raise
+        nz = len(self.allzones)
+        zone_index = self._zone_index.ravel()
+        axis = 2 - iface
+        n = self.cbc_shape[axis]
+        if n < 2:
+            return
+        stride = int(np.prod(self.cbc_shape[axis + 1:]))
+
+        # COMPUTE FLOW BETWEEN ZONES.  A POSITIVE FACE FLOW GOES FROM THE
+        # CELL TO THE NEXT CELL ALONG THE AXIS.  Don't include CH to CH flow
+        # (can occur if CHTOCH option is used)
+        node, node2, nzf, nzt = self._zone_faces[iface]
+        f = np.where(ich[node] & ich[node2], 0., q[node])
+        zflow = np.bincount(nzf * nz + nzt, weights=np.where(f > 0, f, 0.),
+                            minlength=nz * nz)
+        zflow += np.bincount(nzt * nz + nzf, weights=np.where(f < 0, -f, 0.),
+                             minlength=nz * nz)
+        flows['zone'][itim] += zflow.reshape(nz, nz)
+
+        # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION, BY THE
+        # ZONE OF THE CONSTANT-HEAD CELL
+        chnode = np.flatnonzero(ich)
+        pos = (chnode // stride) % n
+        # faces with the constant-head cell after its neighbor
+        node2 = chnode[pos > 0]
+        node = node2 - stride
+        node, node2 = node[~ich[node]], node2[~ich[node]]
+        f = q[node]
+        nzch = zone_index[node2]
+        flows['to_ch'][itim] += np.bincount(
+            nzch, weights=np.where(f > 0, f, 0.), minlength=nz)
+        flows['from_ch'][itim] += np.bincount(
+            nzch, weights=np.where(f < 0, -f, 0.), minlength=nz)
+        # faces with the constant-head cell before its neighbor
+        node = chnode[pos < n - 1]
+        node2 = node + stride
+        node, node2 = node[~ich[node2]], node2[~ich[node2]]
+        f = q[node]
+        nzch = zone_index[node]
+        flows['from_ch'][itim] += np.bincount(
+            nzch, weights=np.where(f > 0, f, 0.), minlength=nz)
+        flows['to_ch'][itim] += np.bincount(
+            nzch, weights=np.where(f < 0, -f, 0.), minlength=nz)
         return
 
-    def _accumulate_flow_fff(self, recname, ich, kstpkper, totim):
+    def _get_internal_flow_record_names(self):
         """
-
-        Parameters
-        ----------
-        recname
-        ich
-        kstpkper
-        totim
+        Get internal flow record names
 
         Returns
         -------
+        iflow_recnames : np.recarray
+            recarray of internal flow terms
 
         """
-        try:
-            if self.nrow >= 2:
-                data = \
-                    self.cbc.get_data(text=recname, kstpkper=kstpkper,
-                                      totim=totim)[0]
-
-                # "FLOW FRONT FACE"
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I-1,K
-                k, i, j = np.where(
-                    self.izone[:, 1:, :] < self.izone[:, :-1, :])
-                i += 1
-                ia = i - 1
-                nza = self.izone[k, ia, j]
-                nz = self.izone[k, i, j]
-                q = data[k, ia, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nza[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I+1,K.
-                k, i, j = np.where(
-                    self.izone[:, :-1, :] < self.izone[:, 1:, :])
-                nz = self.izone[k, i, j]
-                ib = i + 1
-                nzb = self.izone[k, ib, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nzb[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[i > 0], i[i > 0], j[i > 0]
-                ia = i - 1
-                nza = self.izone[k, ia, j]
-                nz = self.izone[k, i, j]
-                q = data[k, ia, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[i < self.nrow - 1], i[i < self.nrow - 1], j[
-                    i < self.nrow - 1]
-                nz = self.izone[k, i, j]
-                ib = i + 1
-                nzb = self.izone[k, ib, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-        except Exception as e:
-            print(e)
-            raise
-        return
+        iflow_recnames = OrderedDict([(0, 'ZONE_0')])
+        for z, a in iter(self._zonenamedict.items()):
+            iflow_recnames[z] = '{}'.format(a)
+        dtype = np.dtype([('zone', '<i4'), ('name', (str, 50))])
+        iflow_recnames = np.array(list(iflow_recnames.items()), dtype=dtype)
+        return iflow_recnames
 
-    def _accumulate_flow_flf(self, recname, ich, kstpkper, totim):
+    def _build_budget_recordarray(self, steps, flows):
         """
+        Build the budget record array from the accumulated zone flows.
 
         Parameters
         ----------
-        recname
-        ich
-        kstpkper
-        totim
+        steps : list of tuples
+            List of (kstpkper, totim) tuples, from _get_steps().
+        flows : dict
+            The accumulated zone flows, from _init_flows().
 
         Returns
         -------
+        recordarray : np.recarray
+            Budget record array with the records of each time step in turn.
 
         """
-        try:
-            if self.nlay >= 2:
-                data = \
-                    self.cbc.get_data(text=recname, kstpkper=kstpkper,
-                                      totim=totim)[0]
-
-                # "FLOW LOWER FACE"
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I,K-1
-                k, i, j = np.where(
-                    self.izone[1:, :, :] < self.izone[:-1, :, :])
-                k += 1
-                ka = k - 1
-                nza = self.izone[ka, i, j]
-                nz = self.izone[k, i, j]
-                q = data[ka, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nza[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I,K+1
-                k, i, j = np.where(
-                    self.izone[:-1, :, :] < self.izone[1:, :, :])
-                nz = self.izone[k, i, j]
-                kb = k + 1
-                nzb = self.izone[kb, i, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nzb[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[k > 0], i[k > 0], j[k > 0]
-                ka = k - 1
-                nza = self.izone[ka, i, j]
-                nz = self.izone[k, i, j]
-                q = data[ka, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[k < self.nlay - 1], i[k < self.nlay - 1], j[
-                    k < self.nlay - 1]
-                nz = self.izone[k, i, j]
-                kb = k + 1
-                nzb = self.izone[kb, i, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-        except Exception as e:
-            print(e)
-            raise
-        return
-
-    def _accumulate_flow_ssst(self, recname, kstpkper, totim):
-
-        # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
-        # ACCUMULATE THE FLOW BY ZONE
-
-        imeth = self.imeth[recname]
-
-        data = self.cbc.get_data(text=recname, kstpkper=kstpkper,
-                                 totim=totim)
-        if len(data) == 0:
-            # Empty data, can occur during the first time step of a transient model when
-            # storage terms are zero and not in the cell-budget file.
-            return
-        else:
-            data = data[0]
-
-        if imeth == 2 or imeth == 5:
-            # LIST
-            qin = np.ma.zeros((self.nlay * self.nrow * self.ncol),
-                              self.float_type)
-            qout = np.ma.zeros((self.nlay * self.nrow * self.ncol),
-                               self.float_type)
-            for [node, q] in zip(data['node'], data['q']):
-                idx = node - 1
-                if q > 0:
-                    qin.data[idx] += q
-                elif q < 0:
-                    qout.data[idx] += q
-            qin = np.ma.reshape(qin, (self.nlay, self.nrow, self.ncol))
-            qout = np.ma.reshape(qout, (self.nlay, self.nrow, self.ncol))
-        elif imeth == 0 or imeth == 1:
-            # FULL 3-D ARRAY
-            qin = np.ma.zeros(self.cbc_shape, self.float_type)
-            qout = np.ma.zeros(self.cbc_shape, self.float_type)
-            qin[data > 0] = data[data > 0]
-            qout[data < 0] = data[data < 0]
-        elif imeth == 3:
-            # 1-LAYER ARRAY WITH LAYER INDICATOR ARRAY
-            rlay, rdata = data[0], data[1]
-            data = np.ma.zeros(self.cbc_shape, self.float_type)
-            for (r, c), l in np.ndenumerate(rlay):
-                data[l - 1, r, c] = rdata[r, c]
-            qin = np.ma.zeros(self.cbc_shape, self.float_type)
-            qout = np.ma.zeros(self.cbc_shape, self.float_type)
-            qin[data > 0] = data[data > 0]
-            qout[data < 0] = data[data < 0]
-        elif imeth == 4:
-            # 1-LAYER ARRAY THAT DEFINES LAYER 1
-            qin = np.ma.zeros(self.cbc_shape, self.float_type)
-            qout = np.ma.zeros(self.cbc_shape, self.float_type)
-            r, c = np.where(data > 0)
-            qin[0, r, c] = data[r, c]
-            r, c = np.where(data < 0)
-            qout[0, r, c] = data[r, c]
-        else:
-            # Should not happen
-            raise Exception(
-                'Unrecognized "imeth" for {} record: {}'.format(recname,
-                                                                imeth))
-
-        # Inflows
-        fz = []
-        tz = []
-        f = []
-        for z in self.allzones:
-            if z != 0:
-                flux = qin[(self.izone == z)].sum()
-                if type(flux) == np.ma.core.MaskedConstant:
-                    flux = 0.
-                fz.append('FROM_' + '_'.join(recname.split()))
-                tz.append(self._zonenamedict[z])
-                f.append(flux)
-        fz = np.array(fz)
-        tz = np.array(tz)
-        f = np.array(f)
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
-
-        # Outflows
-        fz = []
-        tz = []
-        f = []
-        for z in self.allzones:
-            if z != 0:
-                flux = qout[(self.izone == z)].sum()
-                if type(flux) == np.ma.core.MaskedConstant:
-                    flux = 0.
-                fz.append('TO_' + '_'.join(recname.split()))
-                tz.append(self._zonenamedict[z])
-                f.append(flux)
-        fz = np.array(fz)
-        tz = np.array(tz)
-        f = np.array(f)
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
-
-        return
-
-    def _compute_mass_balance(self, kstpkper, totim):
-        # Returns a record array with total inflow, total outflow,
-        # and percent error summed by column.
-        skipcols = ['time_step', 'stress_period', 'totim', 'name']
-
-        # Compute inflows
-        recnames = self.get_record_names()
-        innames = [n for n in recnames if n.startswith('FROM_')]
-        outnames = [n for n in recnames if n.startswith('TO_')]
-        if kstpkper is not None:
-            rowidx = np.where((self._budget['time_step'] == kstpkper[0]) &
-                              (self._budget['stress_period'] == kstpkper[1]) &
-                              np.in1d(self._budget['name'], innames))
-        elif totim is not None:
-            rowidx = np.where((self._budget['totim'] == totim) &
-                              np.in1d(self._budget['name'], innames))
-        a = _numpyvoid2numeric(
-            self._budget[list(self._zonenamedict.values())][rowidx])
-        intot = np.array(a.sum(axis=0))
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols]))
-        fz = np.array(['TOTAL_IN'] * len(tz))
-        self._update_budget_fromssst(fz, tz, intot, kstpkper, totim)
-
-        # Compute outflows
-        if kstpkper is not None:
-            rowidx = np.where((self._budget['time_step'] == kstpkper[0]) &
-                              (self._budget['stress_period'] == kstpkper[1]) &
-                              np.in1d(self._budget['name'], outnames))
-        elif totim is not None:
-            rowidx = np.where((self._budget['totim'] == totim) &
-                              np.in1d(self._budget['name'], outnames))
-        a = _numpyvoid2numeric(
-            self._budget[list(self._zonenamedict.values())][rowidx])
-        outot = np.array(a.sum(axis=0))
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols]))
-        fz = np.array(['TOTAL_OUT'] * len(tz))
-        self._update_budget_fromssst(fz, tz, outot, kstpkper, totim)
-
-        # Compute IN-OUT
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols]))
-        f = intot - outot
-        fz = np.array(['IN-OUT'] * len(tz))
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
-
-        # Compute percent discrepancy
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols]))
-        fz = np.array(['PERCENT_DISCREPANCY'] * len(tz))
-        in_minus_out = intot - outot
-        in_plus_out = intot + outot
-        f = 100 * in_minus_out / (in_plus_out / 2.)
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
-
-        return
+        ntimes = len(steps)
+        # column (zone) indices of the budget
+        icol = np.searchsorted(self.allzones, list(self._zonenamedict.keys()))
+
+        def zone_rows(zflows, z, direction):
+            if z not in self.allzones:
+                return np.zeros((ntimes, len(icol)))
+            iz = self.allzones.index(z)
+            if direction == 'FROM_':
+                return zflows[:, iz, icol]
+            return zflows[:, icol, iz]
+
+        rows = []
+        totals = []
+        for direction, ssst, ch in [('FROM_', flows['in'], flows['from_ch']),
+                                    ('TO_', flows['out'], flows['to_ch'])]:
+            drows = []
+            if 'STORAGE' in self.record_names:
+                drows.append((direction + 'STORAGE',
+                              ssst['STORAGE'][:, icol]))
+            if 'CONSTANT HEAD' in self.record_names:
+                drows.append((direction + 'CONSTANT_HEAD', ch[:, icol]))
+            for recname in self.ssst_record_names:
+                if recname != 'STORAGE':
+                    drows.append((direction + '_'.join(recname.split()),
+                                  ssst[recname][:, icol]))
+            for z, n in self._iflow_recnames:
+                drows.append((direction + '_'.join(n.split()),
+                              zone_rows(flows['zone'], z, direction)))
+            # values are stored as float_type before the totals are summed
+            drows = [(n, v.astype(self.float_type)) for n, v in drows]
+            total = np.sum([v for n, v in drows], axis=0, dtype=np.float64)
+            drows.append(('TOTAL_IN' if direction == 'FROM_' else 'TOTAL_OUT',
+                          total))
+            rows.extend(drows)
+            totals.append(total)
+        intot, outot = totals
+        rows.append(('IN-OUT', np.abs(intot - outot)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rows.append(('PERCENT_DISCREPANCY',
+                         np.abs(100 * (intot - outot) /
+                                ((intot + outot) / 2.))))
+
+        # Create the array for the budget terms.
+        dtype_list = [('totim', '<f4'), ('time_step', '<i4'),
+                      ('stress_period', '<i4'), ('name', (str, 50))]
+        dtype_list += [(n, self.float_type) for n in
+                       self._zonenamedict.values()]
+        dtype = np.dtype(dtype_list)
+        nrows = len(rows)
+        recordarray = np.zeros(ntimes * nrows, dtype=dtype)
+        recordarray['totim'] = np.repeat([totim for kk, totim in steps],
+                                         nrows)
+        recordarray['time_step'] = np.repeat([kk[0] for kk, totim in steps],
+                                             nrows)
+        recordarray['stress_period'] = np.repeat(
+            [kk[1] for kk, totim in steps], nrows)
+        recordarray['name'] = np.tile([n for n, v in rows], ntimes)
+        values = np.stack([v for n, v in rows], axis=1)
+        for i, n in enumerate(self._zonenamedict.values()):
+            recordarray[n] = values[:, :, i].ravel()
+        return recordarray
 
     def _clean_budget_names(self, names):
         newnames = []
@@ -1478,12 +990,150 @@ class ZoneBudget(object):
         return newobj
 
 
-def _numpyvoid2numeric(a):
-    # The budget record array has multiple dtypes and a slice returns
-    # the flexible-type numpy.void which must be converted to a numeric
-    # type prior to performing reducing functions such as sum() or
-    # mean()
-    return np.array([list(r) for r in a])
+def _compute_budgets(zbs, verbose=False):
+    """
+    Compute the budgets of ZoneBudget objects that share the same cell
+    budget file and time steps for all of the time steps.  Each budget term
+    is read once per time step and reduced to zone totals for every zone
+    array, which are stored in (ntimes, nzones, nzones) and (ntimes, nzones)
+    arrays until the budget record arrays are built.
+
+    Parameters
+    ----------
+    zbs : list of ZoneBudget objects
+        The ZoneBudget objects, which have not been computed yet.
+    verbose : bool
+        Write information to the screen.  Default is False.
+
+    Returns
+    -------
+    budgets : list of np.recarray
+        The budget record array of each ZoneBudget object.
+
+    """
+    zb0 = zbs[0]
+    steps = zb0._get_steps()
+    flows = [zb._init_flows(len(steps)) for zb in zbs]
+    for itim, (kk, totim) in enumerate(steps):
+        if verbose:
+            if zb0.kstpkper is not None:
+                s = 'Computing the budget for' \
+                    ' time step {} in stress period {}'.format(kk[0] + 1,
+                                                               kk[1] + 1)
+            else:
+                s = 'Computing the budget for time {}'.format(totim)
+            print(s)
+        data = zb0._get_step_data(kk)
+        for zb, zbflows in zip(zbs, flows):
+            zb._accumulate_flows(zbflows, itim, data)
+    return [zb._build_budget_recordarray(steps, zbflows)
+            for zb, zbflows in zip(zbs, flows)]
+
+
+def get_zone_budgets(cbc_files, zonations, kstpkper=None, totim=None,
+                     aliases=None, nproc=1, verbose=False, **kwargs):
+    """
+    Compute the zone budgets of several zone arrays for one or more cell
+    budget files, such as the budget files of the realizations of an
+    ensemble, and return them as a single pandas DataFrame.  Each budget
+    term of a file is read once per time step for all of the zone arrays.
+
+    Parameters
+    ----------
+    cbc_files : str, CellBudgetFile object, list or dict
+        A cell budget file name or CellBudgetFile object, a list of them,
+        which are named by their position in the list, or a dictionary of
+        realization name and cell budget file.
+    zonations : dict or list
+        A dictionary of zonation name and zone array, or a list of zone
+        arrays, which are named by their position in the list.
+    kstpkper : tuple of ints
+        A tuple containing the time step and stress period (kstp, kper).
+        The kstp and kper values are zero based.
+    totim : float
+        The simulation time.
+    aliases : dict
+        A dictionary of zonation name and the aliases dictionary for
+        the zone array (see ZoneBudget).
+    nproc : int
+        The number of processes used to compute the budgets of different
+        cell budget files at the same time.  The cell budget files must be
+        passed as file names if nproc is greater than 1.  Default is 1.
+    verbose : bool
+        Write information to the screen.  Default is False.
+
+    Returns
+    -------
+    df : Pandas DataFrame
+        DataFrame with realization, zonation, totim, time_step,
+        stress_period, name, zone and flux columns and a row for each
+        budget record and zone.
+
+    Examples
+    --------
+
+    >>> from flopy.utils.zonbud import get_zone_budgets
+    >>> cbcs = {i: 'real_{}/model.cbc'.format(i) for i in range(100)}
+    >>> df = get_zone_budgets(cbcs, {'aquifer': zon1, 'county': zon2},
+    ...                       nproc=8)
+
+    """
+    if isinstance(cbc_files, dict):
+        cbc_files = OrderedDict(cbc_files)
+    elif isinstance(cbc_files, list):
+        cbc_files = OrderedDict(enumerate(cbc_files))
+    else:
+        cbc_files = OrderedDict([(0, cbc_files)])
+    if isinstance(zonations, list):
+        zonations = OrderedDict(enumerate(zonations))
+
+    args = [(realization, cbc_file, zonations, kstpkper, totim, aliases,
+             verbose, kwargs) for realization, cbc_file in cbc_files.items()]
+    if nproc > 1 and len(args) > 1:
+        for cbc_file in cbc_files.values():
+            if not isinstance(cbc_file, str):
+                raise Exception('cell budget files must be passed as file ' +
+                                'names if nproc > 1: {}'.format(cbc_file))
+        import multiprocessing as mp
+        pool = mp.Pool(processes=min(nproc, len(args)))
+        dfs = pool.map(_zone_budgets_worker, args)
+        pool.close()
+        pool.join()
+    else:
+        dfs = [_zone_budgets_worker(arg) for arg in args]
+
+    import pandas as pd
+    return pd.concat(dfs, ignore_index=True)
+
+
+def _zone_budgets_worker(args):
+    """
+    Compute the zone budgets of all of the zone arrays for one cell budget
+    file and return them as a DataFrame with a row for each budget record
+    and zone.  Used by get_zone_budgets().
+
+    """
+    try:
+        import pandas as pd
+    except Exception as e:
+        msg = "get_zone_budgets() error import pandas: " + str(e)
+        raise ImportError(msg)
+
+    realization, cbc_file, zonations, kstpkper, totim, aliases, verbose, \
+        kwargs = args
+    zbs = ZoneBudget.from_zonations(cbc_file, zonations, kstpkper=kstpkper,
+                                    totim=totim, aliases=aliases,
+                                    verbose=verbose, **kwargs)
+    dfs = []
+    for name, zb in zbs.items():
+        df = pd.DataFrame.from_records(zb.get_budget())
+        df = pd.melt(df, id_vars=['totim', 'time_step', 'stress_period',
+                                  'name'], var_name='zone', value_name='flux')
+        df.insert(0, 'zonation', name)
+        dfs.append(df)
+    df = pd.concat(dfs, ignore_index=True)
+    df.insert(0, 'realization', realization)
+    return df
 
 
 def write_zbarray(fname, X, fmtin=None, iprn=None):
@@ -5,7 +5,9 @@ Also support for reading GSLIB and SGEMS files
 """
 from __future__ import print_function
 import os
+import sys
 import copy
+import zipfile
 from datetime import datetime
 import multiprocessing as mp
 import warnings
@@ -13,7 +15,7 @@ import numpy as np
 import scipy.sparse
 import pandas as pd
 from pyemu.mat.mat_handler import Cov,SparseMatrix
-from pyemu.utils.pp_utils import pp_file_to_dataframe
+from pyemu.utils.pp_utils import pp_file_to_dataframe, pp_tpl_to_dataframe
 from ..pyemu_warnings import PyemuWarning
 
 EPSILON = 1.0e-7
@@ -211,16 +213,15 @@ class GeoStruct(object):
         elif cov is not None:
             assert cov.shape[0] == x.shape[0]
             names = cov.row_names
-            c = np.zeros((len(names),1))
-            c += self.nugget
-            cont = Cov(x=c,names=names,isdiagonal=True)
-            cov += cont
+            # add the nugget to cov in place: Matrix.__add__ returns a copy
+            d = np.arange(cov.shape[0])
+            cov.x[d,d] += self.nugget
 
         else:
             raise Exception("GeoStruct.covariance_matrix() requires either " +
                             "names or cov arg")
         for v in self.variograms:
-            v.covariance_matrix(x,y,cov=cov)
+            cov = v.covariance_matrix(x,y,cov=cov)
         return cov
 
     def covariance(self,pt0,pt1):
@@ -655,7 +656,8 @@ class OrdinaryKrige(object):
 
     def calc_factors_grid(self,spatial_reference,zone_array=None,minpts_interp=1,
                           maxpts_interp=20,search_radius=1.0e+10,verbose=False,
-                          var_filename=None, forgive=False):
+                          var_filename=None, forgive=False, vectorized=False,
+                          num_workers=1, chunk_size=10000, factors_file=None):
         """ calculate kriging factors (weights) for a structured grid.
 
         Parameters
@@ -694,16 +696,33 @@ class OrdinaryKrige(object):
             resulting from point_data entries closer than EPSILON distance.  If True,
             warnings are issued for each failed inversion.  If False, an exception
             is raised for failed matrix inversion.
+        vectorized : (boolean)
+            flag to use OrdinaryKrige.calc_factors_vectorized() instead of the
+            point-by-point OrdinaryKrige.calc_factors().  Default is False
+        num_workers : (int)
+            number of processes to use.  If greater than 1, the grid nodes (and
+            zones) are split into chunks of chunk_size nodes that are processed
+            by a multiprocessing.Pool.  Default is 1
+        chunk_size : (int)
+            number of grid nodes per chunk if num_workers > 1.  Default is 10000
+        factors_file : (str)
+            a factors file to write the kriging factors to.  If num_workers > 1,
+            the factors are written as each chunk is completed.  If passed, the
+            factors are not kept in OrdinaryKrige.interp_data, which keeps memory
+            use bounded, and OrdinaryKrige.to_grid_factors_file() should not be
+            called.  Default is None
 
         Returns
         -------
         df : pandas.DataFrame
             a dataframe with information summarizing the ordinary kriging
-            process for each grid node
+            process for each grid node.  If factors_file is passed, only the
+            "x", "y" and "err_var" columns are included
 
         Note
         ----
-        this method calls OrdinaryKrige.calc_factors()
+        this method calls OrdinaryKrige.calc_factors() or
+        OrdinaryKrige.calc_factors_vectorized()
 
 
         Example
@@ -744,9 +763,32 @@ class OrdinaryKrige(object):
                 arr = np.zeros((self.spatial_reference.nrow,
                                 self.spatial_reference.ncol)) - 1.0e+30
 
+        calc_factors = self.calc_factors
+        if vectorized:
+            calc_factors = self.calc_factors_vectorized
+
+        if num_workers > 1:
+            df = self._calc_factors_grid_mp(x,y,zone_array=zone_array,
+                                            minpts_interp=minpts_interp,
+                                            maxpts_interp=maxpts_interp,
+                                            search_radius=search_radius,
+                                            forgive=forgive,vectorized=vectorized,
+                                            num_workers=num_workers,
+                                            chunk_size=chunk_size,
+                                            factors_file=factors_file,
+                                            verbose=verbose)
+            if var_filename is not None:
+                if zone_array is None:
+                    arr = df.err_var.values.reshape(x.shape)
+                else:
+                    arr = df.groupby(level=0).err_var.max().values.reshape(x.shape)
+                    arr[np.isnan(arr)] = -1.0e+30
+                np.savetxt(var_filename,arr,fmt="%15.6E")
+            return df
+
         # the simple case of no zone array: ignore point_data zones
         if zone_array is None:
-            df = self.calc_factors(x.ravel(),y.ravel(),
+            df = calc_factors(x.ravel(),y.ravel(),
                                minpts_interp=minpts_interp,
                                maxpts_interp=maxpts_interp,
                                search_radius=search_radius,
@@ -770,7 +812,7 @@ class OrdinaryKrige(object):
                 xzone,yzone = x.copy(),y.copy()
                 xzone[zone_array!=pt_data_zone] = np.NaN
                 yzone[zone_array!=pt_data_zone] = np.NaN
-                df = self.calc_factors(xzone.ravel(),yzone.ravel(),
+                df = calc_factors(xzone.ravel(),yzone.ravel(),
                                        minpts_interp=minpts_interp,
                                        maxpts_interp=maxpts_interp,
                                        search_radius=search_radius,
@@ -786,6 +828,10 @@ class OrdinaryKrige(object):
             df = pd.concat(dfs)
         if var_filename is not None:
             np.savetxt(var_filename,arr,fmt="%15.6E")
+        if factors_file is not None:
+            self.to_grid_factors_file(factors_file)
+            self.interp_data = None
+            df = df.loc[:,["x","y","err_var"]]
         return df
 
     def calc_factors(self,x,y,minpts_interp=1,maxpts_interp=20,
@@ -967,6 +1013,284 @@ class OrdinaryKrige(object):
         print("took {0} seconds".format(td))
         return df
 
+    def calc_factors_vectorized(self,x,y,minpts_interp=1,maxpts_interp=20,
+                                search_radius=1.0e+10,verbose=False,
+                                pt_zone=None,forgive=False,chunk_size=10000):
+        """ calculate ordinary kriging factors (weights) for the points
+        represented by arguments x and y.  Same as OrdinaryKrige.calc_factors()
+        but the point_data neighbors of all interpolation points are found
+        with a single scipy.spatial.cKDTree query and the kriging systems are
+        solved in stacks, grouped by the number of neighbors found.
+
+        Parameters
+        ----------
+        x : (iterable of floats)
+            x-coordinates to calculate kriging factors for
+        y : (iterable of floats)
+            y-coordinates to calculate kriging factors for
+        minpts_interp : (int)
+            minimum number of point_data entires to use for interpolation at
+            a given x,y interplation point.  interpolation points with less
+            than minpts_interp point_data found will be skipped
+            (assigned np.NaN).  Defaut is 1
+        maxpts_interp : (int)
+            maximum number of point_data entries to use for interpolation at
+            a given x,y interpolation point. Default is 20.
+        search_radius : (float)
+            the size of the region around a given x,y interpolation point to search for
+            point_data entries. Default is 1.0e+10
+        verbose : (boolean)
+            a flag to  echo process to stdout during the interpolatino process.
+            Default is False
+        forgive : (boolean)
+            flag to continue if inversion of the kriging matrix failes at one or more
+            interpolation points.  If True, warnings are issued for each failed
+            inversion.  If False, an exception is raised for failed matrix inversion.
+        chunk_size : (int)
+            maximum number of kriging systems to solve in a single stacked
+            numpy.linalg.solve() call.  Limits memory use.  Default is 10000
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            a dataframe with information summarizing the ordinary kriging
+            process for each interpolation points
+
+        Note
+        ----
+        interpolation points with several point_data entries at exactly the same
+        distance may select a different (but equally distant) subset of
+        point_data than OrdinaryKrige.calc_factors() when maxpts_interp is reached
+
+        """
+        from scipy.spatial import cKDTree
+
+        assert len(x) == len(y)
+        df = pd.DataFrame(data={'x':x,'y':y})
+        x = df.x.values.astype(np.float64)
+        y = df.y.values.astype(np.float64)
+        npts = x.shape[0]
+        sill = self.geostruct.sill
+
+        # global positions of the point_data entries to use, so that
+        # rows/cols of self.point_cov_df can be pulled out positionally
+        if pt_zone is None:
+            pt_idx = np.arange(self.point_data.shape[0])
+        else:
+            pt_idx = np.where(self.point_data.zone.values==pt_zone)[0]
+        all_ptnames = self.point_data.name.values
+        all_ptx = self.point_data.x.values.astype(np.float64)
+        all_pty = self.point_data.y.values.astype(np.float64)
+        point_cov = self.point_cov_df.loc[all_ptnames,all_ptnames].values
+
+        inames = [[] for _ in range(npts)]
+        idist = [[] for _ in range(npts)]
+        ifacts = [[] for _ in range(npts)]
+        err_var = np.zeros(npts) + np.NaN
+
+        print("starting vectorized interp for {0} points".format(npts))
+        start_loop = datetime.now()
+
+        valid = np.where(np.isfinite(x) & np.isfinite(y))[0]
+        if valid.shape[0] == 0 or pt_idx.shape[0] == 0:
+            err_var[valid] = sill
+            return self._set_interp_data(df,idist,inames,ifacts,err_var,
+                                         pt_zone,start_loop)
+
+        # one bulk neighbor query for all interpolation points
+        k = min(maxpts_interp,pt_idx.shape[0])
+        tree = cKDTree(np.array([all_ptx[pt_idx],all_pty[pt_idx]]).transpose())
+        dist,nidx = tree.query(np.array([x[valid],y[valid]]).transpose(),k=k,
+                               distance_upper_bound=np.nextafter(search_radius,np.inf))
+        dist = dist.reshape(valid.shape[0],k)
+        nidx = nidx.reshape(valid.shape[0],k)
+        found = dist ** 2 <= search_radius ** 2
+        nfound = found.sum(axis=1)
+        if verbose:
+            td = (datetime.now() - start_loop).total_seconds()
+            print("neighbor search took {0} seconds".format(td))
+
+        # too few points found
+        too_few = nfound < minpts_interp
+        err_var[valid[too_few]] = sill
+
+        # one of the points is super close, just use it
+        close = np.logical_and(~too_few,dist[:,0] <= EPSILON)
+        for i in np.where(close)[0]:
+            ipt = valid[i]
+            ifacts[ipt] = [1.0]
+            idist[ipt] = [EPSILON]
+            inames[ipt] = [all_ptnames[pt_idx[nidx[i,0]]]]
+        err_var[valid[close]] = self.geostruct.nugget
+
+        # group the remaining points by number of neighbors and solve in stacks
+        solve = np.logical_and(~too_few,~close)
+        for nn in np.unique(nfound[solve]):
+            group = np.where(np.logical_and(solve,nfound==nn))[0]
+            if verbose:
+                print("solving {0} systems with {1} neighbors".format(group.shape[0],nn))
+            for istart in range(0,group.shape[0],chunk_size):
+                igroup = group[istart:istart+chunk_size]
+                gidx = pt_idx[nidx[igroup,:nn]]
+                gx = x[valid[igroup]][:,None]
+                gy = y[valid[igroup]][:,None]
+                interp_cov = np.zeros((igroup.shape[0],nn)) + self.geostruct.nugget
+                for v in self.geostruct.variograms:
+                    interp_cov += v.covariance_points(gx,gy,all_ptx[gidx],all_pty[gidx])
+
+                d = nn + 1 # +1 for lagrange mult
+                A = np.ones((igroup.shape[0],d,d))
+                A[:,:-1,:-1] = point_cov[gidx[:,:,None],gidx[:,None,:]]
+                A[:,-1,-1] = 0.0 #unbiaised constraint
+                rhs = np.ones((igroup.shape[0],d,1))
+                rhs[:,:-1,0] = interp_cov
+                try:
+                    facs = np.linalg.solve(A,rhs)[:,:,0]
+                    ok = np.ones(igroup.shape[0],dtype=bool)
+                except np.linalg.LinAlgError:
+                    # at least one singular system in the stack: solve one at a time
+                    facs = np.zeros((igroup.shape[0],d))
+                    ok = np.zeros(igroup.shape[0],dtype=bool)
+                    for i in range(igroup.shape[0]):
+                        try:
+                            facs[i,:] = np.linalg.solve(A[i],rhs[i])[:,0]
+                            ok[i] = True
+                        except Exception as e:
+                            print("error solving for factors: {0}".format(str(e)))
+                            print("point:",gx[i,0],gy[i,0])
+                            if not forgive:
+                                raise Exception("error solving for factors:{0}".format(str(e)))
+                ev = sill + facs[:,-1] - (facs[:,:-1] * interp_cov).sum(axis=1)
+                for i in np.where(ok)[0]:
+                    ipt = valid[igroup[i]]
+                    inames[ipt] = all_ptnames[gidx[i]]
+                    idist[ipt] = dist[igroup[i],:nn]
+                    ifacts[ipt] = facs[i,:-1]
+                    err_var[ipt] = ev[i]
+
+        return self._set_interp_data(df,idist,inames,ifacts,err_var,
+                                     pt_zone,start_loop)
+
+    def _set_interp_data(self,df,idist,inames,ifacts,err_var,pt_zone,start_loop):
+        """ private method to store the results of calc_factors_vectorized()
+        in the same form as calc_factors()
+
+        """
+        df["idist"] = idist
+        df["inames"] = inames
+        df["ifacts"] = ifacts
+        df["err_var"] = err_var
+        if pt_zone is None:
+            self.interp_data = df
+        else:
+            if self.interp_data is None:
+                self.interp_data = df
+            else:
+                self.interp_data = self.interp_data.append(df)
+        td = (datetime.now() - start_loop).total_seconds()
+        print("took {0} seconds".format(td))
+        return df
+
+    def _calc_factors_grid_mp(self,x,y,zone_array=None,minpts_interp=1,
+                              maxpts_interp=20,search_radius=1.0e+10,
+                              forgive=False,vectorized=False,num_workers=2,
+                              chunk_size=10000,factors_file=None,verbose=False):
+        """ private method to calculate the grid-based kriging factors with a
+        multiprocessing.Pool.  Chunks are returned (and optionally written to
+        factors_file) in the same order as the serial calc_factors_grid().
+        The workers are silent; progress is reported here if verbose is True
+
+        """
+        x,y = x.ravel(),y.ravel()
+        if zone_array is None:
+            jobs = [(None,x,y)]
+        else:
+            assert zone_array.shape[0] * zone_array.shape[1] == x.shape[0]
+            if "zone" not in self.point_data.columns:
+                warnings.warn("'zone' columns not in point_data, assigning generic zone",PyemuWarning)
+                self.point_data.loc[:,"zone"] = 1
+            jobs = []
+            for pt_data_zone in self.point_data.zone.unique():
+                if pt_data_zone not in zone_array:
+                    warnings.warn("pt zone {0} not in zone array {1}, skipping".\
+                                  format(pt_data_zone,np.unique(zone_array)),PyemuWarning)
+                    continue
+                xzone,yzone = x.copy(),y.copy()
+                xzone[zone_array.ravel()!=pt_data_zone] = np.NaN
+                yzone[zone_array.ravel()!=pt_data_zone] = np.NaN
+                jobs.append((pt_data_zone,xzone,yzone))
+
+        kwargs = {"minpts_interp":minpts_interp,"maxpts_interp":maxpts_interp,
+                  "search_radius":search_radius,"forgive":forgive}
+        tasks = []
+        for pt_zone,xjob,yjob in jobs:
+            for istart in range(0,xjob.shape[0],chunk_size):
+                istop = min(istart+chunk_size,xjob.shape[0])
+                tasks.append((pt_zone,istart,xjob[istart:istop],yjob[istart:istop],
+                              vectorized,kwargs))
+
+        print("starting {0} factor chunks on {1} workers".format(len(tasks),num_workers))
+        start = datetime.now()
+        f = None
+        if factors_file is not None:
+            f = open(factors_file,'w')
+            self._write_factors_header(f)
+        dfs = []
+        pool = mp.Pool(processes=num_workers,initializer=_init_factors_worker,
+                       initargs=(self,))
+        try:
+            # imap returns the chunks in task order
+            for itask,df in enumerate(pool.imap(_calc_factors_worker,tasks)):
+                if verbose:
+                    print("finished factor chunk {0} of {1}".format(itask+1,len(tasks)))
+                if f is not None:
+                    self._write_factors_lines(f,df)
+                    df = df.loc[:,["x","y","err_var"]]
+                dfs.append(df)
+        finally:
+            pool.close()
+            pool.join()
+            if f is not None:
+                f.close()
+        df = pd.concat(dfs)
+        if f is None:
+            self.interp_data = df
+        else:
+            self.interp_data = None
+        if self.interp_data is not None and self.interp_data.dropna().shape[0] == 0:
+            raise Exception("no interpolation took place...something is wrong")
+        td = (datetime.now() - start).total_seconds()
+        print("took {0} seconds".format(td))
+        return df
+
+    def _write_factors_header(self,f,points_file="points.junk",
+                              zone_file="zone.junk"):
+        """ private method to write the header of a grid-based factors file
+
+        """
+        f.write(points_file + '\n')
+        f.write(zone_file + '\n')
+        f.write("{0} {1}\n".format(self.spatial_reference.ncol, self.spatial_reference.nrow))
+        f.write("{0}\n".format(self.point_data.shape[0]))
+        [f.write("{0}\n".format(name)) for name in self.point_data.name]
+
+    def _write_factors_lines(self,f,df):
+        """ private method to write the factor lines for the nodes in df
+        to a grid-based factors file
+
+        """
+        t = 0
+        if self.geostruct.transform == "log":
+            t = 1
+        pt_idxs = {name:i for i,name in enumerate(self.point_data.name)}
+        for idx,names,facts in zip(df.index,df.inames,df.ifacts):
+            if len(facts) == 0:
+                continue
+            n_idxs = [pt_idxs[name] for name in names]
+            f.write("{0} {1} {2} {3:8.5e} ".format(idx+1, t, len(names), 0.0))
+            [f.write("{0} {1:12.8g} ".format(i+1, w)) for i, w in zip(n_idxs, facts)]
+            f.write("\n")
+
     def to_grid_factors_file(self, filename,points_file="points.junk",
                              zone_file="zone.junk"):
         """ write a grid-based PEST-style factors file.  This file can be used with
@@ -993,22 +1317,46 @@ class OrdinaryKrige(object):
         if self.spatial_reference is None:
             raise Exception("ok.spatial_reference is None, must call calc_factors_grid() first")
         with open(filename, 'w') as f:
-            f.write(points_file + '\n')
-            f.write(zone_file + '\n')
-            f.write("{0} {1}\n".format(self.spatial_reference.ncol, self.spatial_reference.nrow))
-            f.write("{0}\n".format(self.point_data.shape[0]))
-            [f.write("{0}\n".format(name)) for name in self.point_data.name]
-            t = 0
-            if self.geostruct.transform == "log":
-                t = 1
-            pt_names = list(self.point_data.name)
-            for idx,names,facts in zip(self.interp_data.index,self.interp_data.inames,self.interp_data.ifacts):
-                if len(facts) == 0:
-                    continue
-                n_idxs = [pt_names.index(name) for name in names]
-                f.write("{0} {1} {2} {3:8.5e} ".format(idx+1, t, len(names), 0.0))
-                [f.write("{0} {1:12.8g} ".format(i+1, w)) for i, w in zip(n_idxs, facts)]
-                f.write("\n")
+            self._write_factors_header(f,points_file=points_file,zone_file=zone_file)
+            self._write_factors_lines(f,self.interp_data)
+
+
+_factors_worker_ok = None
+
+
+def _init_factors_worker(ok):
+    """ private multiprocessing.Pool initializer that stores the OrdinaryKrige
+    instance in each worker process so that it is only pickled once per worker
+
+    """
+    global _factors_worker_ok
+    _factors_worker_ok = ok
+
+
+def _calc_factors_worker(task):
+    """ private multiprocessing.Pool worker to calculate the kriging factors
+    for one chunk of interpolation points
+
+    """
+    pt_zone,istart,x,y,vectorized,kwargs = task
+    ok = _factors_worker_ok
+    # dont let interp_data grow across the chunks handled by this worker
+    ok.interp_data = None
+    calc_factors = ok.calc_factors
+    if vectorized:
+        calc_factors = ok.calc_factors_vectorized
+    # progress is reported by the parent process, so keep the worker quiet
+    # rather than interleaving output from several processes
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull,'w')
+    try:
+        df = calc_factors(x,y,pt_zone=pt_zone,**kwargs)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    ok.interp_data = None
+    df.index = np.arange(istart,istart+df.shape[0])
+    return df
 
 
 class Vario2d(object):
@@ -1256,9 +1604,9 @@ class Vario2d(object):
         elif cov is not None:
             assert cov.shape[0] == x.shape[0]
             names = cov.row_names
-            c = np.zeros((len(names),1)) + self.contribution
-            cont = Cov(x=c,names=names,isdiagonal=True)
-            cov += cont
+            # add the contribution to cov in place: Matrix.__add__ returns a copy
+            d = np.arange(cov.shape[0])
+            cov.x[d,d] += self.contribution
 
         else:
             raise Exception("Vario2d.covariance_matrix() requires either" +
@@ -1922,7 +2270,8 @@ def fac2real(pp_file=None,factors_file="factors.dat",out_file="test.ref",
     pp_file : (str)
         PEST-type pilot points file
     factors_file : (str)
-        PEST-style factors file
+        PEST-style factors file or a binary factors file written by
+        write_binary_factors_file()
     out_file : (str)
         filename of array to write.  If None, array is returned, else
         value of out_file is returned.  Default is "test.ref".
@@ -1943,6 +2292,11 @@ def fac2real(pp_file=None,factors_file="factors.dat",out_file="test.ref",
     out_file : str
         if out_file it not None
 
+    Note
+    ----
+    the factors file is parsed (and cached) by read_factors_file() and the
+    array is formed with a sparse matrix-vector product
+
     Example
     -------
     ``>>>import pyemu``
@@ -1965,16 +2319,7 @@ def fac2real(pp_file=None,factors_file="factors.dat",out_file="test.ref",
         raise Exception("unrecognized pp_file arg: must be str or pandas.DataFrame, not {0}"\
                         .format(type(pp_file)))
     assert os.path.exists(factors_file)
-    f_fac = open(factors_file,'r')
-    fpp_file = f_fac.readline()
-    if pp_file is None and pp_data is None:
-        pp_data = pp_file_to_dataframe(fpp_file)
-        pp_data.loc[:, "name"] = pp_data.name.apply(lambda x: x.lower())
-
-    fzone_file = f_fac.readline()
-    ncol,nrow = [int(i) for i in f_fac.readline().strip().split()]
-    npp = int(f_fac.readline().strip())
-    pp_names = [f_fac.readline().strip().lower() for _ in range(npp)]
+    nrow,ncol,pp_names,fac_mat,itrans,interp = read_factors_file(factors_file)
 
     # check that pp_names is sync'd with pp_data
     diff = set(list(pp_data.name)).symmetric_difference(set(pp_names))
@@ -1983,36 +2328,19 @@ def fac2real(pp_file=None,factors_file="factors.dat",out_file="test.ref",
                         "between the factors file and the pilot points file " +\
                         ','.join(list(diff)))
 
-    arr = np.zeros((nrow,ncol),dtype=np.float) + fill_value
-    pp_dict = {int(name):val for name,val in zip(pp_data.index,pp_data.parval1)}
-    try:
-        pp_dict_log = {name:np.log10(val) for name,val in zip(pp_data.index,pp_data.parval1)}
-    except:
-        pp_dict_log = {}
-    #for i in range(nrow):
-    #    for j in range(ncol):
-    while True:
-        line = f_fac.readline()
-        if len(line) == 0:
-            #raise Exception("unexpected EOF in factors file")
-            break
-        try:
-            inode,itrans,fac_data = parse_factor_line(line)
-        except Exception as e:
-            raise Exception("error parsing factor line {0}:{1}".format(line,str(e)))
-        #fac_prods = [pp_data.loc[pp,"value"]*fac_data[pp] for pp in fac_data]
-        if itrans == 0:
-            fac_sum = sum([pp_dict[pp] * fac_data[pp] for pp in fac_data])
-        else:
-            fac_sum = sum([pp_dict_log[pp] * fac_data[pp] for pp in fac_data])
-        if itrans != 0:
-            fac_sum = 10**fac_sum
-        #col = ((inode - 1) // nrow) + 1
-        #row = inode - ((col - 1) * nrow)
-        row = ((inode-1) // ncol) + 1
-        col = inode - ((row - 1) * ncol)
-        #arr[row-1,col-1] = np.sum(np.array(fac_prods))
-        arr[row - 1, col - 1] = fac_sum
+    # pilot point values in factors file order
+    pp_vals = np.zeros(len(pp_names))
+    pp_vals[pp_data.index.values.astype(int)] = pp_data.parval1.values
+
+    arr = np.zeros((nrow * ncol),dtype=np.float) + fill_value
+    log_nodes = np.logical_and(interp,itrans != 0)
+    lin_nodes = np.logical_and(interp,itrans == 0)
+    if np.any(lin_nodes):
+        arr[lin_nodes] = fac_mat.dot(pp_vals)[lin_nodes]
+    if np.any(log_nodes):
+        with np.errstate(divide="ignore",invalid="ignore"):
+            arr[log_nodes] = 10**(fac_mat.dot(np.log10(pp_vals))[log_nodes])
+    arr = arr.reshape(nrow,ncol)
     arr[arr<lower_lim] = lower_lim
     arr[arr>upper_lim] = upper_lim
 
@@ -2023,6 +2351,131 @@ def fac2real(pp_file=None,factors_file="factors.dat",out_file="test.ref",
         return out_file
     return arr
 
+def fac2real_ensemble(ensemble,factors_file="factors.dat",pp_file=None,
+                      out_file=None,out_prefix=None,upper_lim=1.0e+30,
+                      lower_lim=-1.0e+30,fill_value=1.0e+30,chunk_size=100):
+    """ fac2real() for a whole ensemble of pilot point values.  The arrays
+    for all realizations are formed with sparse matrix-matrix products
+    against the (cached) factors from read_factors_file().
+
+    Parameters
+    ----------
+    ensemble : (pyemu.ParameterEnsemble, pandas.DataFrame or numpy.ndarray)
+        realizations (rows) of pilot point values (columns).  If a numpy.ndarray,
+        the columns must be in the same order as the pilot points in the
+        factors file.  If a ParameterEnsemble in log10 space, it is back-transformed.
+    factors_file : (str)
+        PEST-style factors file or a binary factors file written by
+        write_binary_factors_file()
+    pp_file : (str or pandas.DataFrame)
+        pilot points template file (or a dataframe with "name" and "parnme"
+        columns, such as from pp_utils.pp_tpl_to_dataframe()) used to map
+        the ensemble column names to the pilot point names in the factors file.
+        If None, the ensemble column names must be the pilot point names.
+        Default is None
+    out_file : (str)
+        a numpy binary (.npy) file to write the stacked (nreals,nrow,ncol) arrays
+        to.  The file is filled through a memory map, one chunk of realizations
+        at a time.  Default is None
+    out_prefix : (str)
+        prefix for per-realization array files.  If not None, the array for
+        each realization is written to out_prefix + str(real_name) + ".ref".
+        Default is None
+    upper_lim : (float)
+        maximum interpolated value in the arrays.
+    lower_lim : (float)
+        minimum interpolated value in the arrays.
+    fill_value : (float)
+        the value to assign array nodes that are not interpolated
+    chunk_size : (int)
+        number of realizations to form at once.  Default is 100
+
+    Returns
+    -------
+    arr : numpy.ndarray
+        the (nreals,nrow,ncol) array of realized arrays.  If out_file is not None,
+        this is the read-only memory map of out_file.  If out_prefix is not None
+        and out_file is None, the list of per-realization file names is returned
+        instead
+
+    Example
+    -------
+    ``>>>import pyemu``
+
+    ``>>>pe = pyemu.ParameterEnsemble.from_gaussian_draw(pst,cov,num_reals=500)``
+
+    ``>>>arrs = pyemu.utils.geostats.fac2real_ensemble(pe,"hkpp.dat.fac",pp_file="hkpp.dat.tpl")``
+
+    """
+    nrow,ncol,pp_names,fac_mat,itrans,interp = read_factors_file(factors_file)
+
+    if isinstance(ensemble,np.ndarray):
+        real_names = list(range(ensemble.shape[0]))
+        vals = ensemble
+    elif isinstance(ensemble,pd.DataFrame):
+        if getattr(ensemble,"istransformed",False):
+            ensemble = ensemble._back_transform(inplace=False)
+        real_names = list(ensemble.index)
+        if pp_file is None:
+            pp_map = {name.lower():name for name in ensemble.columns}
+        else:
+            if isinstance(pp_file,str):
+                pp_file = pp_tpl_to_dataframe(pp_file)
+            pp_map = {name.lower():parnme for name,parnme in zip(pp_file.name,pp_file.parnme)}
+        missing = [name for name in pp_names if name not in pp_map or
+                   pp_map[name] not in ensemble.columns]
+        if len(missing) > 0:
+            raise Exception("the following pilot points from the factors file were " +\
+                            "not found in the ensemble: " + ','.join(missing))
+        vals = ensemble.loc[:,[pp_map[name] for name in pp_names]].values
+    else:
+        raise Exception("unrecognized ensemble arg: must be ParameterEnsemble, " +\
+                        "pandas.DataFrame or numpy.ndarray, not {0}".format(type(ensemble)))
+    vals = np.atleast_2d(vals).astype(np.float64)
+    if vals.shape[1] != len(pp_names):
+        raise Exception("ensemble has {0} pilot point columns, factors file has {1}".\
+                        format(vals.shape[1],len(pp_names)))
+    nreals = vals.shape[0]
+
+    if out_file is not None:
+        arrs = np.lib.format.open_memmap(out_file,mode='w+',dtype=np.float64,
+                                         shape=(nreals,nrow,ncol))
+    elif out_prefix is None:
+        arrs = np.zeros((nreals,nrow,ncol),dtype=np.float64)
+    else:
+        arrs = None
+    out_files = []
+
+    log_nodes = np.logical_and(interp,itrans != 0)
+    lin_nodes = np.logical_and(interp,itrans == 0)
+    for istart in range(0,nreals,chunk_size):
+        cvals = vals[istart:istart+chunk_size,:].transpose()
+        carr = np.zeros((nrow * ncol,cvals.shape[1])) + fill_value
+        if np.any(lin_nodes):
+            carr[lin_nodes,:] = fac_mat.dot(cvals)[lin_nodes,:]
+        if np.any(log_nodes):
+            with np.errstate(divide="ignore",invalid="ignore"):
+                carr[log_nodes,:] = 10**(fac_mat.dot(np.log10(cvals))[log_nodes,:])
+        carr[carr<lower_lim] = lower_lim
+        carr[carr>upper_lim] = upper_lim
+        carr = carr.transpose().reshape(cvals.shape[1],nrow,ncol)
+        if arrs is not None:
+            arrs[istart:istart+cvals.shape[1]] = carr
+        if out_prefix is not None:
+            for real_name,arr in zip(real_names[istart:istart+cvals.shape[1]],carr):
+                filename = out_prefix + str(real_name) + ".ref"
+                np.savetxt(filename,arr,fmt="%15.6E",delimiter='')
+                out_files.append(filename)
+
+    if out_file is not None:
+        arrs.flush()
+        del arrs
+        return np.load(out_file,mmap_mode='r')
+    if arrs is None:
+        return out_files
+    return arrs
+
+
 def parse_factor_line(line):
     """ function to parse a factor file line.  Used by fac2real()
 
@@ -2050,4 +2503,127 @@ def parse_factor_line(line):
     #     pnum = int(raw[ifac]) - 1 #zero based to sync with pandas
     #     fac = float(raw[ifac+1])
     #     fac_data[pnum] = fac
-    return inode,itrans,fac_data
\ No newline at end of file
+    return inode,itrans,fac_data
+
+
+_factors_cache = {}
+
+
+def read_factors_file(factors_file):
+    """ read a PEST-style factors file (or a binary factors file written
+    by write_binary_factors_file()) into a sparse matrix form.  Results are
+    cached on the file name, modification time and size, so repeated calls
+    (e.g. fac2real() with several pilot point files) only parse once.
+
+    Parameters
+    ----------
+    factors_file : (str)
+        PEST-style (text) or binary factors file
+
+    Returns
+    -------
+    nrow : int
+        number of rows in the grid
+    ncol : int
+        number of columns in the grid
+    pp_names : list
+        pilot point names in factors file order
+    fac_mat : scipy.sparse.csr_matrix
+        a (nrow*ncol, len(pp_names)) matrix of kriging factors
+    itrans : numpy.ndarray
+        the transformation flag of each grid node (0 for none, 1 for log)
+    interp : numpy.ndarray
+        boolean flag for grid nodes that have factors
+
+    """
+    fstat = os.stat(factors_file)
+    key = os.path.abspath(factors_file)
+    sig = (fstat.st_mtime,fstat.st_size)
+    if key in _factors_cache and _factors_cache[key][0] == sig:
+        return _factors_cache[key][1]
+
+    if zipfile.is_zipfile(factors_file):
+        with np.load(factors_file) as npz:
+            nrow,ncol = [int(i) for i in npz["shape"]]
+            pp_names = list(npz["pp_names"])
+            fac_mat = scipy.sparse.csr_matrix((npz["data"],npz["indices"],npz["indptr"]),
+                                              shape=(nrow*ncol,len(pp_names)))
+            itrans = npz["itrans"]
+            interp = npz["interp"]
+    else:
+        with open(factors_file,'r') as f_fac:
+            f_fac.readline()
+            f_fac.readline()
+            ncol,nrow = [int(i) for i in f_fac.readline().strip().split()]
+            npp = int(f_fac.readline().strip())
+            pp_names = [f_fac.readline().strip().lower() for _ in range(npp)]
+            raw = np.array(f_fac.read().split(),dtype=np.float64)
+
+        # walk the node records to find where each one starts,
+        # then pull out all the factors at once
+        starts,nfacs = [],[]
+        i = 0
+        while i < raw.shape[0]:
+            nfac = int(raw[i+2])
+            starts.append(i)
+            nfacs.append(nfac)
+            i += 4 + (2 * nfac)
+        starts = np.array(starts,dtype=np.int64)
+        nfacs = np.array(nfacs,dtype=np.int64)
+        inodes = raw[starts].astype(np.int64) - 1
+        # the last entry for a node wins, as in the original line-by-line parse
+        rev_nodes,rev_idx = np.unique(inodes[::-1],return_index=True)
+        keep = np.sort(inodes.shape[0] - 1 - rev_idx)
+        starts,nfacs,inodes = starts[keep],nfacs[keep],inodes[keep]
+
+        rows = np.repeat(inodes,nfacs)
+        offsets = np.arange(rows.shape[0]) - np.repeat(np.cumsum(nfacs) - nfacs,nfacs)
+        pos = np.repeat(starts,nfacs) + 4 + (2 * offsets)
+        cols = raw[pos].astype(np.int64) - 1
+        data = raw[pos + 1]
+        fac_mat = scipy.sparse.csr_matrix((data,(rows,cols)),shape=(nrow*ncol,npp))
+        itrans = np.zeros(nrow*ncol,dtype=np.int64)
+        itrans[inodes] = raw[starts + 1].astype(np.int64)
+        interp = np.zeros(nrow*ncol,dtype=bool)
+        interp[inodes] = True
+
+    result = (nrow,ncol,pp_names,fac_mat,itrans,interp)
+    _factors_cache[key] = (sig,result)
+    return result
+
+
+def write_binary_factors_file(factors_file,bin_file=None):
+    """ convert a PEST-style factors file into a binary factors file that
+    stores the kriging factors as a compressed sparse row matrix of grid
+    nodes by pilot points and the transformation flag of each node.  The
+    binary file can be used in place of the text factors file in fac2real()
+    and avoids parsing the text file on every forward run.
+
+    Parameters
+    ----------
+    factors_file : (str)
+        PEST-style factors file
+    bin_file : (str)
+        the binary factors file to write.  If None, factors_file + ".npz"
+        is used.  Default is None
+
+    Returns
+    -------
+    bin_file : str
+        the binary factors file name
+
+    Note
+    ----
+    the text factors file is left in place so that it can still be used
+    by the PEST fac2real utility
+
+    """
+    if bin_file is None:
+        bin_file = factors_file + ".npz"
+    nrow,ncol,pp_names,fac_mat,itrans,interp = read_factors_file(factors_file)
+    # pass a file handle so numpy doesnt append a ".npz" extension
+    with open(bin_file,'wb') as f:
+        np.savez(f,shape=np.array([nrow,ncol]),pp_names=np.array(pp_names),
+                 data=fac_mat.data,indices=fac_mat.indices,indptr=fac_mat.indptr,
+                 itrans=itrans,interp=interp)
+    return bin_file
\ No newline at end of file
@@ -776,15 +776,15 @@ def apply_hds_timeseries(config_file=None, postprocess_inact=None):
 
     nlay, nrow, ncol = hds.nlay, hds.nrow, hds.ncol
 
-    dfs = []
+    kijs = []
     for site,k,i,j in zip(site_df.site,site_df.k,site_df.i,site_df.j):
         assert k >= 0 and k < nlay
         assert i >= 0 and i < nrow
         assert j >= 0 and j < ncol
-        df = pd.DataFrame(data=hds.get_ts((k,i,j)),columns=["totim",site])
-        df.index = df.pop("totim")
-        dfs.append(df)
-    df = pd.concat(dfs,axis=1)
+        kijs.append((int(k),int(i),int(j)))
+    # pull all the sites in one pass through the file
+    df = pd.DataFrame(data=hds.get_ts(kijs),columns=["totim"]+list(site_df.site))
+    df.index = df.pop("totim")
     #print(df)
     df.to_csv(hds_file+"_timeseries.processed",sep=' ')
     if postprocess_inact is not None:
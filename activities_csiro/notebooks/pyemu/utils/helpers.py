@@ -1099,6 +1099,192 @@ def start_slaves(slave_dir,exe_rel_path,pst_rel_path,num_slaves=None,slave_root=
                       silent_master=silent_master)
 
 
+class PestppRunStorage(object):
+    """ a memory-mapped reader for pest++ serialized run storage files
+    (e.g. .rns, .rnj).  The run records are mapped with a structured numpy
+    dtype, so the par and obs values of all runs are available as zero-copy
+    (n_runs,npar) and (n_runs,nobs) array views.
+
+    Parameters
+    ----------
+    filename : str
+        the name of the run storage file
+
+    Attributes
+    ----------
+    par_names : list
+        parameter names (lower case) in run storage order
+    obs_names : list
+        observation names (lower case) in run storage order
+    n_runs : int
+        number of runs in the file
+    records : numpy.memmap
+        the (read-only) structured array of run records with fields
+        "r_status", "info_txt", "info_value", "par" and "obs"
+
+    Example
+    -------
+    ``>>>import pyemu``
+
+    ``>>>rs = pyemu.helpers.PestppRunStorage("pest.rns")``
+
+    ``>>>par_df,obs_df = rs.get(status=1)``
+
+    """
+
+    header_dtype = np.dtype([("n_runs",np.int64),("run_size",np.int64),("p_name_size",np.int64),
+                             ("o_name_size",np.int64)])
+
+    def __init__(self,filename):
+        assert os.path.exists(filename)
+        self.filename = filename
+        with open(filename,"rb") as f:
+            header = np.fromfile(f,dtype=self.header_dtype,count=1)
+            p_name_size,o_name_size = header["p_name_size"][0],header["o_name_size"][0]
+            self.par_names = struct.unpack('{0}s'.format(p_name_size),
+                                    f.read(p_name_size))[0].strip().lower().decode().split('\0')[:-1]
+            self.obs_names = struct.unpack('{0}s'.format(o_name_size),
+                                    f.read(o_name_size))[0].strip().lower().decode().split('\0')[:-1]
+            run_start = f.tell()
+        self.n_runs,run_size = int(header["n_runs"][0]),int(header["run_size"][0])
+        npar,nobs = len(self.par_names),len(self.obs_names)
+        # status, info txt, info value, par and obs blocks, padded to run_size
+        rec_dtype = np.dtype({"names":["r_status","info_txt","info_value","par","obs"],
+                              "formats":[np.int8,"S41",np.float64,(np.float64,npar),
+                                         (np.float64,nobs)],
+                              "offsets":[0,1,42,50,50 + (8 * npar)],
+                              "itemsize":run_size})
+        self.records = np.memmap(filename,dtype=rec_dtype,mode='r',offset=run_start,
+                                 shape=(self.n_runs,))
+
+    @property
+    def par_values(self):
+        """ zero-copy view of the parameter values of all runs
+
+        Returns
+        -------
+        par_values : numpy.ndarray
+            (n_runs,npar) array
+        """
+        return self.records["par"]
+
+    @property
+    def obs_values(self):
+        """ zero-copy view of the observation values of all runs
+
+        Returns
+        -------
+        obs_values : numpy.ndarray
+            (n_runs,nobs) array
+        """
+        return self.records["obs"]
+
+    @property
+    def r_status(self):
+        """ the run status flag of all runs
+
+        Returns
+        -------
+        r_status : numpy.ndarray
+            run status flags (0 not completed, 1 completed, -100 canceled,
+            anything else failed)
+        """
+        return self.records["r_status"]
+
+    def run_ids(self,irun=None,status=None):
+        """ get the run ids selected by a run id slice/list and/or run status
+
+        Parameters
+        ----------
+        irun : int, slice or iterable of int
+            the run ids to select.  If None, all runs. Default is None
+        status : int or iterable of int
+            only select runs with these r_status values.  If None, runs
+            are not filtered on status.  Default is None
+
+        Returns
+        -------
+        run_ids : numpy.ndarray
+            selected run ids
+        """
+        run_ids = np.arange(self.n_runs)
+        if irun is not None:
+            run_ids = np.atleast_1d(run_ids[irun])
+        if status is not None:
+            status = np.atleast_1d(status)
+            run_ids = run_ids[np.in1d(self.r_status[run_ids],status)]
+        return run_ids
+
+    def get(self,irun=None,status=None):
+        """ get par and obs values for selected runs as dataframes
+
+        Parameters
+        ----------
+        irun : int, slice or iterable of int
+            the run ids to select.  If None, all runs. Default is None
+        status : int or iterable of int
+            only select runs with these r_status values.  If None, runs
+            are not filtered on status.  Default is None
+
+        Returns
+        -------
+        par_df : pandas.DataFrame
+            par values, indexed by run id
+        obs_df : pandas.DataFrame
+            obs values, indexed by run id
+        """
+        run_ids = self.run_ids(irun=irun,status=status)
+        par_df = pd.DataFrame(self.par_values[run_ids],index=run_ids,columns=self.par_names)
+        obs_df = pd.DataFrame(self.obs_values[run_ids],index=run_ids,columns=self.obs_names)
+        return par_df,obs_df
+
+    def get_metadata(self,irun=None,status=None):
+        """ get run status and info txt for selected runs
+
+        Parameters
+        ----------
+        irun : int, slice or iterable of int
+            the run ids to select.  If None, all runs. Default is None
+        status : int or iterable of int
+            only select runs with these r_status values.  If None, runs
+            are not filtered on status.  Default is None
+
+        Returns
+        -------
+        meta_data : pandas.DataFrame
+            "r_status", "info_txt" and "status" for each run id
+        """
+        run_ids = self.run_ids(irun=irun,status=status)
+        txts = [t.strip().lower().decode() for t in self.records["info_txt"][run_ids]]
+        meta_data = pd.DataFrame({"r_status":self.r_status[run_ids],"info_txt":txts},
+                                 index=run_ids)
+        meta_data.loc[:,"status"] = meta_data.r_status.apply(self.status_str)
+        return meta_data
+
+    @staticmethod
+    def status_str(r_status):
+        """ get a description of a run status flag
+
+        Parameters
+        ----------
+        r_status : int
+            run status flag
+
+        Returns
+        -------
+        status : str
+
+        """
+        if r_status == 0:
+            return "not completed"
+        if r_status == 1:
+            return "completed"
+        if r_status == -100:
+            return "canceled"
+        else:
+            return "failed"
+
+
 def read_pestpp_runstorage(filename,irun=0,with_metadata=False):
     """read pars and obs from a specific run in a pest++ serialized run storage file into
     pandas.DataFrame(s)
@@ -1121,10 +1307,11 @@ def read_pestpp_runstorage(filename,irun=0,with_metadata=False):
     metadata : pandas.DataFrame
         run status and info txt.
 
-    """
+    Note
+    ----
+    uses PestppRunStorage to map the file
 
-    header_dtype = np.dtype([("n_runs",np.int64),("run_size",np.int64),("p_name_size",np.int64),
-                      ("o_name_size",np.int64)])
+    """
 
     try:
         irun = int(irun)
@@ -1134,62 +1321,19 @@ def read_pestpp_runstorage(filename,irun=0,with_metadata=False):
         else:
             raise Exception("unrecognized 'irun': should be int or 'all', not '{0}'".
                             format(irun))
-    def status_str(r_status):
-        if r_status == 0:
-            return "not completed"
-        if r_status == 1:
-            return "completed"
-        if r_status == -100:
-            return "canceled"
-        else:
-            return "failed"
-    assert os.path.exists(filename)
-    f = open(filename,"rb")
-    header = np.fromfile(f,dtype=header_dtype,count=1)
-    p_name_size,o_name_size = header["p_name_size"][0],header["o_name_size"][0]
-    par_names = struct.unpack('{0}s'.format(p_name_size),
-                            f.read(p_name_size))[0].strip().lower().decode().split('\0')[:-1]
-    obs_names = struct.unpack('{0}s'.format(o_name_size),
-                            f.read(o_name_size))[0].strip().lower().decode().split('\0')[:-1]
-    n_runs,run_size = header["n_runs"][0],header["run_size"][0]
-    run_start = f.tell()
-
-    def _read_run(irun):
-        f.seek(run_start + (irun * run_size))
-        r_status = np.fromfile(f, dtype=np.int8, count=1)
-        info_txt = struct.unpack("41s", f.read(41))[0].strip().lower().decode()
-        par_vals = np.fromfile(f, dtype=np.float64, count=len(par_names) + 1)[1:]
-        obs_vals = np.fromfile(f, dtype=np.float64, count=len(obs_names) + 1)[:-1]
-        par_df = pd.DataFrame({"parnme": par_names, "parval1": par_vals})
-
-        par_df.index = par_df.pop("parnme")
-        obs_df = pd.DataFrame({"obsnme": obs_names, "obsval": obs_vals})
-        obs_df.index = obs_df.pop("obsnme")
-        return r_status,info_txt,par_df,obs_df
-
+    rs = PestppRunStorage(filename)
     if irun == "all":
-        par_dfs,obs_dfs = [],[]
-        r_stats, txts = [],[]
-        for irun in range(n_runs):
-            #print(irun)
-            r_status, info_txt, par_df, obs_df = _read_run(irun)
-            par_dfs.append(par_df)
-            obs_dfs.append(obs_df)
-            r_stats.append(r_status)
-            txts.append(info_txt)
-        par_df = pd.concat(par_dfs,axis=1).T
-        par_df.index = np.arange(n_runs)
-        obs_df = pd.concat(obs_dfs, axis=1).T
-        obs_df.index = np.arange(n_runs)
-        meta_data = pd.DataFrame({"r_status":r_stats,"info_txt":txts})
-        meta_data.loc[:,"status"] = meta_data.r_status.apply(status_str)
-
+        par_df,obs_df = rs.get()
+        meta_data = rs.get_metadata()
+        meta_data.index = np.arange(meta_data.shape[0])
     else:
-        assert irun <= n_runs
-        r_status,info_txt,par_df,obs_df = _read_run(irun)
-        meta_data = pd.DataFrame({"r_status": [r_status], "info_txt": [info_txt]})
-        meta_data.loc[:, "status"] = meta_data.r_status.apply(status_str)
-    f.close()
+        assert irun <= rs.n_runs
+        par_df = pd.DataFrame({"parnme":rs.par_names,"parval1":rs.par_values[irun]})
+        par_df.index = par_df.pop("parnme")
+        obs_df = pd.DataFrame({"obsnme":rs.obs_names,"obsval":rs.obs_values[irun]})
+        obs_df.index = obs_df.pop("obsnme")
+        meta_data = rs.get_metadata(irun=[irun])
+        meta_data.index = [0]
     if with_metadata:
         return par_df,obs_df,meta_data
     else:
@@ -1225,45 +1369,35 @@ def jco_from_pestpp_runstorage(rnj_filename,pst_filename):
 
     """
 
-    header_dtype = np.dtype([("n_runs",np.int64),("run_size",np.int64),("p_name_size",np.int64),
-                      ("o_name_size",np.int64)])
-
     pst = pyemu.Pst(pst_filename)
     par = pst.parameter_data
-    log_pars = set(par.loc[par.partrans=="log","parnme"].values)
-    with open(rnj_filename,'rb') as f:
-        header = np.fromfile(f,dtype=header_dtype,count=1)
-        
-    try:
-        base_par,base_obs =  read_pestpp_runstorage(rnj_filename,irun=0)
-    except:
+    rs = PestppRunStorage(rnj_filename)
+    if rs.n_runs < 1:
         raise Exception("couldn't get base run...")
-    par = par.loc[base_par.index,:]
-    li = base_par.index.map(lambda x: par.loc[x,"partrans"]=="log")
-    base_par.loc[li] = base_par.loc[li].apply(np.log10)
-    jco_cols = {}
-    for irun in range(1,int(header["n_runs"])):
-        par_df,obs_df = read_pestpp_runstorage(rnj_filename,irun=irun)
-        par_df.loc[li] = par_df.loc[li].apply(np.log10)
-        obs_diff = base_obs - obs_df
-        par_diff = base_par - par_df
-        # check only one non-zero element per col(par)
-        if len(par_diff[par_diff.parval1 != 0]) > 1:
-            raise Exception("more than one par diff - looks like the file wasn't created during jco filling...")
-        parnme = par_diff[par_diff.parval1 != 0].index[0]
-        parval = par_diff.parval1.loc[parnme]
-
-        # derivatives
-        jco_col = obs_diff / parval
-        # some tracking, checks
-        print("processing par {0}: {1}...".format(irun, parnme))
-        print("%nzsens: {0}%...".format((jco_col[abs(jco_col.obsval)>1e-8].shape[0] / jco_col.shape[0])*100.))
-
-        jco_cols[parnme] = jco_col.obsval
-
-    jco_cols = pd.DataFrame.from_records(data=jco_cols, index=list(obs_diff.index.values))
-
-    jco_cols = pyemu.Jco.from_dataframe(jco_cols)
+    li = par.loc[rs.par_names,"partrans"].values == "log"
+
+    par_vals = rs.par_values.copy()
+    par_vals[:,li] = np.log10(par_vals[:,li])
+    par_diff = par_vals[0,:] - par_vals[1:,:]
+    obs_diff = rs.obs_values[0,:] - rs.obs_values[1:,:]
+
+    # check only one non-zero element per col(par)
+    nz = par_diff != 0
+    if np.any(nz.sum(axis=1) > 1):
+        raise Exception("more than one par diff - looks like the file wasn't created during jco filling...")
+    if np.any(nz.sum(axis=1) == 0):
+        raise Exception("run(s) {0} have no par diff from the base run".\
+                        format(','.join([str(i+1) for i in np.where(nz.sum(axis=1)==0)[0]])))
+    ipar = np.argmax(nz,axis=1)
+    parval = par_diff[np.arange(par_diff.shape[0]),ipar]
+
+    # derivatives
+    jco_cols = (obs_diff / parval[:,None]).transpose()
+    parnmes = [rs.par_names[i] for i in ipar]
+    print("processed {0} pars, %nzsens: {1}%...".\
+          format(len(parnmes),(np.abs(jco_cols) > 1e-8).sum() / float(jco_cols.size) * 100.))
+
+    jco_cols = pyemu.Jco(x=jco_cols,row_names=list(rs.obs_names),col_names=parnmes)
     
     # write # memory considerations important here for very large matrices - break into chunks...
     #jco_fnam = "{0}".format(filename[:-4]+".jco")
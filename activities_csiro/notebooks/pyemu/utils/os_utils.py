@@ -6,7 +6,10 @@ import subprocess as sp
 import warnings
 import socket
 import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from ..pyemu_warnings import PyemuWarning
 
@@ -114,7 +117,7 @@ def run_sweep(pe,slave_dir,pst_name=None,num_slaves=10,exe_name="pestpp-swp",loc
 
 
 
-def run(cmd_str,cwd='.',verbose=False):
+def run(cmd_str,cwd='.',verbose=False,timeout=None):
     """ an OS agnostic function to execute a command line
 
     Parameters
@@ -128,6 +131,11 @@ def run(cmd_str,cwd='.',verbose=False):
     verbose : bool
         flag to echo to stdout complete cmd str
 
+    timeout : float
+        number of seconds to let the command run before it is killed
+        and an exception is raised.  If None, the command is run with
+        os.system() and is not timed.  Default is None
+
     Note
     ----
     uses platform to detect OS and adds .exe suffix or ./ prefix as appropriate
@@ -167,7 +175,10 @@ def run(cmd_str,cwd='.',verbose=False):
         print("run():{0}".format(cmd_str))
 
     try:
-        ret_val = os.system(cmd_str)
+        if timeout is None:
+            ret_val = os.system(cmd_str)
+        else:
+            ret_val = _run_timeout(cmd_str,timeout)
     except Exception as e:
         os.chdir(bwd)
         raise Exception("run() raised :{0}".format(str(e)))
@@ -177,6 +188,210 @@ def run(cmd_str,cwd='.',verbose=False):
             raise Exception("run() returned non-zero")
 
 
+def _run_timeout(cmd_str,timeout):
+    """ private method to run cmd_str in a shell and kill it
+    (and its children) if it takes longer than timeout seconds
+
+    """
+    if "window" in platform.platform().lower():
+        p = sp.Popen(cmd_str,shell=True)
+    else:
+        p = sp.Popen(cmd_str,shell=True,start_new_session=True)
+    try:
+        return p.wait(timeout=timeout)
+    except sp.TimeoutExpired:
+        if "window" in platform.platform().lower():
+            p.kill()
+        else:
+            os.killpg(p.pid,9)
+        p.wait()
+        raise Exception("command '{0}' timed out after {1} seconds".format(cmd_str,timeout))
+
+
+def run_sweep_local(pe,slave_dir,num_workers=None,worker_root=".",max_retries=0,
+                    timeout=None,callback=None,cleanup=True,verbose=False):
+    """ run a parameter ensemble locally with a pool of python processes.
+    This is a pure python alternative to run_sweep() that doesn't need
+    pestpp-swp.  Each worker process gets its own persistent copy of slave_dir
+    and, for each realization, writes the model input files from the template
+    files, runs the model command(s) with run() and reads the model output files
+    with the compiled instruction files (see pst_utils.read_output_files()).
+
+    Parameters
+    ----------
+    pe : pyemu.ParameterEnsemble
+        the parameter ensemble to run.  pe.pst supplies the template,
+        instruction and model command information
+    slave_dir : str
+        the path to a complete set of model and pest interface files.  Template,
+        input, instruction and output file names in pe.pst are relative to slave_dir
+    num_workers : int
+        number of worker processes.  Defaults to number of cores
+    worker_root : str
+        the root to make the worker directories in.  Default is "."
+    max_retries : int
+        number of times to rerun a failed realization.  Default is 0
+    timeout : float
+        number of seconds a single model run may take before it is killed
+        and counted as failed.  Default is None (no limit)
+    callback : callable
+        a function called after each realization is finished as
+        callback(real_name,success,num_finished,num_total).  Default is None
+    cleanup : bool
+        flag to remove the worker directories once all runs are finished.
+        Default is True
+    verbose : bool
+        flag to echo useful information to stdout.  Default is False
+
+    Returns
+    -------
+    oe : pyemu.ObservationEnsemble
+        simulated outputs for each realization (row) in pe.  Failed
+        realizations are assigned np.NaN
+    run_info : pandas.DataFrame
+        a dataframe summarizing each realization: "success", "attempts",
+        "run_time" (seconds), "worker_dir" and "error"
+
+    Example
+    -------
+    ``>>>import pyemu``
+
+    ``>>>pe = pyemu.ParameterEnsemble.from_gaussian_draw(pst,cov,num_reals=100)``
+
+    ``>>>oe,info = pyemu.os_utils.run_sweep_local(pe,"template",num_workers=10)``
+
+    """
+    from ..en import ObservationEnsemble
+
+    assert os.path.isdir(slave_dir)
+    assert os.path.isdir(worker_root)
+    pst = pe.pst
+    if num_workers is None:
+        num_workers = mp.cpu_count()
+    num_workers = int(min(num_workers,pe.shape[0]))
+
+    if pe.istransformed:
+        pe = pe._back_transform(inplace=False)
+    par = pst.parameter_data
+    parvals = (pe.loc[:,par.parnme] * par.scale.values) + par.offset.values
+
+    worker_dirs = []
+    manager = mp.Manager()
+    dir_queue = manager.Queue()
+    for i in range(num_workers):
+        worker_dir = os.path.join(worker_root,"sweep_worker_{0}".format(i))
+        if os.path.exists(worker_dir):
+            try:
+                shutil.rmtree(worker_dir,onerror=remove_readonly)
+            except Exception as e:
+                raise Exception("unable to remove existing worker dir:" + \
+                                "{0}\n{1}".format(worker_dir,str(e)))
+        try:
+            shutil.copytree(slave_dir,worker_dir)
+        except Exception as e:
+            raise Exception("unable to copy files from slave dir: " + \
+                            "{0} to worker dir: {1}\n{2}".format(slave_dir,worker_dir,str(e)))
+        worker_dirs.append(worker_dir)
+        dir_queue.put(os.path.abspath(worker_dir))
+
+    real_names = list(parvals.index)
+    obs_vals = np.zeros((len(real_names),pst.nobs)) + np.NaN
+    run_info = pd.DataFrame({"success":False,"attempts":0,"run_time":np.NaN,
+                             "worker_dir":'',"error":''},index=real_names,
+                            columns=["success","attempts","run_time","worker_dir","error"])
+    start = datetime.now()
+    num_finished = 0
+    with ProcessPoolExecutor(max_workers=num_workers,initializer=_init_sweep_worker,
+                             initargs=(dir_queue,pst,timeout)) as pool:
+        futures = {}
+        for ireal,real_name in enumerate(real_names):
+            futures[pool.submit(_sweep_worker,parvals.iloc[ireal,:].to_dict())] = ireal
+        while len(futures) > 0:
+            done,_ = wait(futures,return_when=FIRST_COMPLETED)
+            for future in done:
+                ireal = futures.pop(future)
+                real_name = real_names[ireal]
+                run_info.iloc[ireal,1] += 1
+                try:
+                    vals,run_time,worker_dir = future.result()
+                except Exception as e:
+                    if verbose:
+                        print("realization {0} failed: {1}".format(real_name,str(e)))
+                    run_info.iloc[ireal,4] = str(e)
+                    if run_info.iloc[ireal,1] <= max_retries:
+                        futures[pool.submit(_sweep_worker,parvals.iloc[ireal,:].to_dict())] = ireal
+                        continue
+                    success = False
+                else:
+                    obs_vals[ireal,:] = vals
+                    run_info.iloc[ireal,0] = True
+                    run_info.iloc[ireal,2] = run_time
+                    run_info.iloc[ireal,3] = worker_dir
+                    run_info.iloc[ireal,4] = ''
+                    success = True
+                num_finished += 1
+                if verbose:
+                    print("{0} of {1} realizations finished".format(num_finished,len(real_names)))
+                if callback is not None:
+                    callback(real_name,success,num_finished,len(real_names))
+    manager.shutdown()
+
+    num_failed = (~run_info.success).sum()
+    if num_failed > 0:
+        warnings.warn("{0} of {1} realizations failed".format(num_failed,len(real_names)),
+                      PyemuWarning)
+    if verbose:
+        td = (datetime.now() - start).total_seconds()
+        print("run_sweep_local() took {0} seconds".format(td))
+
+    if cleanup:
+        for worker_dir in worker_dirs:
+            try:
+                shutil.rmtree(worker_dir,onerror=remove_readonly)
+            except Exception as e:
+                warnings.warn("unable to remove worker dir{0}:{1}".format(worker_dir,str(e)),
+                              PyemuWarning)
+
+    oe = ObservationEnsemble(pst=pst,data=obs_vals,index=real_names)
+    return oe,run_info
+
+
+_sweep_worker_info = {}
+
+
+def _init_sweep_worker(dir_queue,pst,timeout):
+    """ private concurrent.futures initializer that claims a worker directory
+    and stores the Pst for the realizations run in this process
+
+    """
+    _sweep_worker_info["worker_dir"] = dir_queue.get()
+    _sweep_worker_info["pst"] = pst
+    _sweep_worker_info["timeout"] = timeout
+
+
+def _sweep_worker(parvals):
+    """ private concurrent.futures worker to run a single realization
+
+    """
+    from ..pst import pst_utils
+
+    worker_dir = _sweep_worker_info["worker_dir"]
+    pst = _sweep_worker_info["pst"]
+    start = datetime.now()
+    for tpl_file,in_file in zip(pst.template_files,pst.input_files):
+        pst_utils.write_to_template(parvals,os.path.join(worker_dir,tpl_file),
+                                    os.path.join(worker_dir,in_file))
+    # remove old outputs so a failed model run cant be mistaken for a good one
+    for out_file in pst.output_files:
+        out_file = os.path.join(worker_dir,out_file)
+        if os.path.exists(out_file):
+            os.remove(out_file)
+    for cmd_str in pst.model_command:
+        run(cmd_str,cwd=worker_dir,timeout=_sweep_worker_info["timeout"])
+    vals = pst_utils.read_output_files(pst,cwd=worker_dir)
+    return vals,(datetime.now() - start).total_seconds(),worker_dir
+
+
 def start_slaves(slave_dir,exe_rel_path,pst_rel_path,num_slaves=None,slave_root="..",
                  port=4004,rel_path=None,local=True,cleanup=True,master_dir=None,
                  verbose=False,silent_master=False):
@@ -139,37 +139,25 @@ def setup_pilotpoints_grid(ml=None,sr=None,ibound=None,prefix_dict=None,
             ib = ibound[par][k]
             assert ib.shape == xcentergrid.shape,"ib.shape != xcentergrid.shape for k {0}".\
                 format(k)
-            pp_count = 0
             #skip this layer if not in prefix_dict
             if k not in prefix_dict.keys():
                 continue
-            #cycle through rows and cols
-            for i in range(start,ib.shape[0]-start,every_n_cell):
-                for j in range(start,ib.shape[1]-start,every_n_cell):
-                    # skip if this is an inactive cell
-                    if ib[i,j] == 0:
-                        continue
-
-                    # get the attributes we need
-                    x = xcentergrid[i,j]
-                    y = ycentergrid[i,j]
-                    name = "pp_{0:04d}".format(pp_count)
-                    parval1 = 1.0
-
-                    #decide what to use as the zone
-                    zone = 1
-                    if use_ibound_zones:
-                        zone = ib[i,j]
-                    #stick this pilot point into a dataframe container
-
-                    if pp_df is None:
-                        data = {"name": name, "x": x, "y": y, "zone": zone,
-                                "parval1": parval1, "k":k, "i":i, "j":j}
-                        pp_df = pd.DataFrame(data=data,index=[0],columns=pp_names)
-                    else:
-                        data = [name, x, y, zone, parval1, k, i, j]
-                        pp_df.loc[pp_count,:] = data
-                    pp_count += 1
+            #get the rows and cols of the active cells at the pilot point spacing
+            i, j = np.meshgrid(np.arange(start,ib.shape[0]-start,every_n_cell),
+                               np.arange(start,ib.shape[1]-start,every_n_cell),
+                               indexing="ij")
+            i, j = i.ravel(), j.ravel()
+            active = ib[i,j] != 0
+            i, j = i[active], j[active]
+            if len(i) > 0:
+                #decide what to use as the zone
+                zone = 1
+                if use_ibound_zones:
+                    zone = ib[i,j]
+                data = {"name": ["pp_{0:04d}".format(n) for n in range(len(i))],
+                        "x": xcentergrid[i,j], "y": ycentergrid[i,j],
+                        "zone": zone, "parval1": 1.0, "k": k, "i": i, "j": j}
+                pp_df = pd.DataFrame(data=data,columns=pp_names)
             #if we found some acceptable locs...
             if pp_df is not None:
                 for prefix in prefix_dict[k]: